@@ -0,0 +1,359 @@
+"""Chunked CSV/JSONL reading and writing for the bulk (non-interactive) mode.
+
+Records are read a fixed number of lines at a time, scored with
+wage_engine.calculate_batch() and written straight back out, so memory use
+depends on the chunk size and not on the size of the input.
+"""
+import csv
+import io
+import json
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+
+import numpy as np
+
+import columnar
+import records
+import vehicles
+import wage_engine
+
+# numeric input columns and the value used when a column or cell is missing
+NUMERIC_COLUMNS = {
+    'paycheck': 0.0,
+    'daily_hours': 0.0,
+    'work_days': 0.0,
+    'wfh_days': 0.0,
+    'commute_minutes': 0.0,
+    'daily_miles': 0.0,
+    'gas_price': 0.0,
+    'mpg': 0.0,
+    'ev_efficiency': 0.0,
+    'electricity_price': 0.0,
+    'public_daily_cost': 0.0,
+    'public_monthly_cost': 0.0,
+    'public_walking_minutes': 0.0,
+    'daily_costs': 0.0,
+}
+ID_COLUMN = 'id'
+# optional, for joining prices.PriceTables as of each record's date and region
+DATE_COLUMN = 'date'
+REGION_COLUMN = 'region'
+DEFAULT_CHUNK_SIZE = 50000
+
+TRUE_STRINGS = {'1', 'true', 'yes', 'y'}
+
+
+def detect_format(path, default='csv'):
+    """Guess csv/jsonl from a file name"""
+    if not path or path == '-':
+        return default
+    lowered = path.lower()
+    if lowered.endswith(('.jsonl', '.ndjson', '.json')):
+        return 'jsonl'
+    if lowered.endswith(('.csv', '.txt')):
+        return 'csv'
+    return default
+
+
+def open_input(path):
+    if not path or path == '-':
+        return sys.stdin
+    return open(path, 'r', newline='', encoding='utf-8')
+
+
+def open_output(path):
+    if not path or path == '-':
+        return sys.stdout
+    return open(path, 'w', newline='', encoding='utf-8')
+
+
+def iter_line_chunks(stream, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Yield lists of at most chunk_size non-blank lines"""
+    lines = (line for line in stream if line.strip())
+    while True:
+        chunk = list(islice(lines, chunk_size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def _float_column(values, default, name='', first_row=0):
+    try:
+        return np.array(values, dtype=np.float64)
+    except (ValueError, TypeError):
+        pass
+    # blank cells -> default; anything else that is not a number names its column and record
+    column = np.empty(len(values))
+    for row, value in enumerate(values):
+        try:
+            if isinstance(value, str):
+                column[row] = float(value) if value.strip() else default
+            else:
+                column[row] = float(value)
+        except (ValueError, TypeError):
+            raise ValueError(f"record {first_row + row + 1}: {name} is not a number: {value!r}") from None
+    return column
+
+
+def _bool_column(values):
+    return np.array([v is True or str(v).strip().lower() in TRUE_STRINGS for v in values], dtype=bool)
+
+
+def _columns_from_lists(raw, count, prices=None, first_row=0):
+    """Turn {name: [raw values]} into engine keyword arguments
+
+    first_row is the number of records before this chunk, for error messages.
+
+    prices is an optional prices.PriceTables; records with a date get the
+    gas and electricity prices in effect on that date in their region. A
+    'vehicle' column of ids from vehicles.csv fills in mpg and ev_efficiency
+    wherever a record leaves them blank.
+    """
+    columns = {}
+    for name, default in NUMERIC_COLUMNS.items():
+        if name in raw:
+            columns[name] = _float_column(raw[name], default, name, first_row)
+        else:
+            columns[name] = np.full(count, default)
+    columns['transport'] = wage_engine.encode_transport(raw.get('transport', ['car'] * count))
+    columns['pay_frequency'] = wage_engine.encode_pay_frequency(raw.get('pay_frequency', ['biweekly'] * count))
+    columns['use_monthly_pass'] = _bool_column(raw.get('use_monthly_pass', [False] * count))
+    if vehicles.VEHICLE_COLUMN in raw:
+        columns = vehicles.load_index().apply(columns, raw[vehicles.VEHICLE_COLUMN])
+    if prices is not None and DATE_COLUMN in raw:
+        columns = prices.apply(columns, raw[DATE_COLUMN], raw.get(REGION_COLUMN))
+    return columns
+
+
+def parse_csv_chunk(header, lines, prices=None, first_row=0):
+    """Parse CSV data lines (without the header) into (ids, engine columns)"""
+    rows = list(csv.reader(lines))
+    if not rows:
+        return None, _columns_from_lists({}, 0)
+    width = len(header)
+    rows = [row + [''] * (width - len(row)) if len(row) < width else row for row in rows]
+    raw = {name: list(values) for name, values in zip(header, zip(*rows))}
+    ids = raw.pop(ID_COLUMN, None)
+    return ids, _columns_from_lists(raw, len(rows), prices, first_row)
+
+
+def parse_jsonl_chunk(lines, prices=None, first_row=0):
+    """Parse JSON-lines records into (ids, engine columns); null counts as a blank"""
+    records = [json.loads(line) for line in lines]
+    names = set()
+    for record in records:
+        names.update(record)
+    raw = {name: [_blank_if_null(record.get(name)) for record in records] for name in names}
+    ids = raw.pop(ID_COLUMN, None)
+    return ids, _columns_from_lists(raw, len(records), prices, first_row)
+
+
+def _blank_if_null(value):
+    return '' if value is None else value
+
+
+def read_header(stream):
+    """First non-blank line of a CSV stream, as a list of column names"""
+    for line in stream:
+        if line.strip():
+            return [name.strip() for name in next(csv.reader([line]))]
+    return []
+
+
+def iter_record_chunks(stream, input_format='csv', chunk_size=DEFAULT_CHUNK_SIZE, prices=None):
+    """Yield (ids, engine columns) for each chunk of the input"""
+    header = read_header(stream) if input_format == 'csv' else None
+    first_row = 0
+    for lines in iter_line_chunks(stream, chunk_size):
+        if input_format == 'csv':
+            yield parse_csv_chunk(header, lines, prices, first_row)
+        else:
+            yield parse_jsonl_chunk(lines, prices, first_row)
+        first_row += len(lines)
+
+
+def output_header(with_ids, output_format='csv'):
+    if output_format != 'csv':
+        return ''
+    names = ([ID_COLUMN] if with_ids else []) + list(wage_engine.RESULT_COLUMNS)
+    return ','.join(names) + '\n'
+
+
+def format_chunk(ids, results, output_format='csv'):
+    """Render one chunk of results as CSV rows or JSON lines"""
+    names = list(wage_engine.RESULT_COLUMNS)
+    columns = [np.round(results[name], 4).tolist() for name in names]
+    buffer = io.StringIO()
+
+    if output_format == 'csv':
+        writer = csv.writer(buffer, lineterminator='\n')
+        rows = zip(*columns)
+        if ids is not None:
+            rows = ([row_id, *row] for row_id, row in zip(ids, rows))
+        writer.writerows(rows)
+    else:
+        if ids is not None:
+            names = [ID_COLUMN] + names
+            columns = [list(ids)] + columns
+        for row in zip(*columns):
+            buffer.write(json.dumps(dict(zip(names, row))))
+            buffer.write('\n')
+    return buffer.getvalue()
+
+
+def score_chunk(columns, calendar=None):
+    """Engine results for one chunk; calendar is an optional workcalendar.WorkCalendar"""
+    if calendar is not None:
+        columns = calendar.apply(columns)
+    return wage_engine.calculate_batch(**columns)
+
+
+def finish_chunk(ids, results, output_format):
+    """Result arrays for columnar output, formatted text otherwise"""
+    if output_format in columnar.FORMATS:
+        arrays = {name: np.ascontiguousarray(results[name]) for name in columnar.COLUMNS}
+        return arrays, len(results['true_wage']), ids is not None
+    return format_chunk(ids, results, output_format), len(results['true_wage']), ids is not None
+
+
+def process_lines(header, lines, input_format='csv', output_format='csv', calendar=None, prices=None,
+                  first_row=0):
+    """Parse, score and format one chunk of raw lines
+
+    Runs inside worker processes, so it only takes and returns plain
+    picklable values: (output, row count, whether the chunk had ids). The
+    output is text for csv/jsonl and a dict of result arrays for the
+    columnar formats.
+    """
+    if input_format == 'csv':
+        ids, columns = parse_csv_chunk(header, lines, prices, first_row)
+    else:
+        ids, columns = parse_jsonl_chunk(lines, prices, first_row)
+    return finish_chunk(ids, score_chunk(columns, calendar), output_format)
+
+
+def process_record_range(path, start, stop, output_format='csv', calendar=None):
+    """process_lines() for a slice of a binary record file
+
+    Workers map the file themselves, so only the path and bounds are sent.
+    """
+    chunk = records.open_records(path)[start:stop]
+    return finish_chunk(chunk['id'].tolist(), score_chunk(records.engine_columns(chunk), calendar),
+                        output_format)
+
+
+def iter_processed_chunks(stream, input_format='csv', output_format='csv',
+                          chunk_size=DEFAULT_CHUNK_SIZE, workers=1, calendar=None, prices=None):
+    """Yield process_lines() output for each chunk, in input order
+
+    With workers > 1 the chunks are spread over a process pool; at most two
+    chunks per worker are in flight so memory stays bounded.
+    """
+    header = read_header(stream) if input_format == 'csv' else None
+    chunks = iter_line_chunks(stream, chunk_size)
+
+    if workers <= 1:
+        first_row = 0
+        for lines in chunks:
+            yield process_lines(header, lines, input_format, output_format, calendar, prices, first_row)
+            first_row += len(lines)
+        return
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        pending = deque()
+        first_row = 0
+        for lines in chunks:
+            pending.append(executor.submit(process_lines, header, lines, input_format, output_format,
+                                           calendar, prices, first_row))
+            first_row += len(lines)
+            if len(pending) >= workers * 2:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+
+def iter_processed_records(path, output_format='csv', chunk_size=DEFAULT_CHUNK_SIZE, workers=1,
+                           calendar=None):
+    """iter_processed_chunks() for a memory-mapped binary record file"""
+    total = records.record_count(path)
+    ranges = ((start, min(start + chunk_size, total)) for start in range(0, total, chunk_size))
+
+    if workers <= 1:
+        for start, stop in ranges:
+            yield process_record_range(path, start, stop, output_format, calendar)
+        return
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        pending = deque()
+        for start, stop in ranges:
+            pending.append(executor.submit(process_record_range, path, start, stop, output_format,
+                                           calendar))
+            if len(pending) >= workers * 2:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+
+def iter_input_chunks(input_path, stream=None, input_format='csv', chunk_size=DEFAULT_CHUNK_SIZE,
+                      prices=None):
+    """(ids, engine columns) chunks from a text stream or a binary record file
+
+    Binary records have no dates, so prices only applies to text input.
+    """
+    if input_format == 'records':
+        for chunk in records.iter_record_slices(input_path, chunk_size):
+            yield chunk['id'], records.engine_columns(chunk)
+    else:
+        yield from iter_record_chunks(stream, input_format, chunk_size, prices)
+
+
+def convert_to_records(stream, path, input_format='csv', chunk_size=DEFAULT_CHUNK_SIZE, prices=None):
+    """Write CSV/JSONL input out as a binary record file; returns the row count
+
+    Numeric ids are kept, anything else is replaced by the row number. With
+    prices, the records keep the prices in effect on each row's date.
+    """
+    written = 0
+    open(path, 'wb').close()
+    for ids, columns in iter_record_chunks(stream, input_format, chunk_size, prices):
+        count = len(columns['paycheck'])
+        row_numbers = np.arange(written, written + count)
+        try:
+            numeric_ids = np.array(ids, dtype=np.uint64) if ids is not None else row_numbers
+        except (ValueError, OverflowError):
+            numeric_ids = row_numbers
+        records.append_records(path, records.records_from_columns(columns, numeric_ids))
+        written += count
+    return written
+
+
+class ThroughputCounter:
+    """Counts processed rows and reports rows/sec to stderr"""
+
+    def __init__(self, stream=None, interval=2.0):
+        self.stream = stream if stream is not None else sys.stderr
+        self.interval = interval
+        self.rows = 0
+        self.started = time.perf_counter()
+        self.last_report = self.started
+
+    @property
+    def rate(self):
+        elapsed = time.perf_counter() - self.started
+        return self.rows / elapsed if elapsed > 0 else 0.0
+
+    def add(self, rows):
+        self.rows += rows
+        now = time.perf_counter()
+        if now - self.last_report >= self.interval:
+            self.last_report = now
+            self.report()
+
+    def report(self, final=False):
+        prefix = "Done:" if final else "Progress:"
+        elapsed = time.perf_counter() - self.started
+        print(f"{prefix} {self.rows:,} rows in {elapsed:.1f}s ({self.rate:,.0f} rows/sec)",
+              file=self.stream, flush=True)
@@ -0,0 +1,203 @@
+"""Benchmarks for the wage and commute-metrics hot paths.
+
+    python benchmark.py --save bench.json                 # record a run
+    python benchmark.py --compare bench.json              # flag regressions
+    python benchmark.py --quick --filter batch_10k        # subset, fewer repeats
+
+Cases cover scalar calls (engine and the GUI's compute_results), 10k and
+1M row batches, every transport type and the monthly-pass branch. Inputs are generated from a fixed seed so runs are
+comparable.
+"""
+import argparse
+import json
+import platform
+import statistics
+import sys
+import time
+
+import numpy as np
+
+import wage_engine
+from model import Scenario
+
+DEFAULT_THRESHOLD = 0.10
+TARGET_SECONDS = 0.2
+
+
+def make_columns(rows, transport=None, use_monthly_pass=None, seed=0):
+    """Random but reproducible engine inputs"""
+    rng = np.random.default_rng(seed)
+    columns = {
+        'paycheck': rng.uniform(500, 5000, rows),
+        'pay_frequency': rng.integers(0, 5, rows).astype(np.int8),
+        'daily_hours': rng.uniform(4, 10, rows),
+        'work_days': rng.integers(3, 6, rows).astype(np.float64),
+        'wfh_days': rng.integers(0, 3, rows).astype(np.float64),
+        'transport': rng.integers(0, 5, rows).astype(np.int8),
+        'commute_minutes': rng.uniform(5, 90, rows),
+        'daily_miles': rng.uniform(1, 40, rows),
+        'gas_price': rng.uniform(2.5, 6, rows),
+        'mpg': rng.uniform(15, 50, rows),
+        'ev_efficiency': rng.uniform(2.5, 5, rows),
+        'electricity_price': rng.uniform(0.08, 0.4, rows),
+        'public_daily_cost': rng.uniform(2, 12, rows),
+        'public_monthly_cost': rng.uniform(50, 250, rows),
+        'public_walking_minutes': rng.uniform(0, 20, rows),
+        'use_monthly_pass': rng.random(rows) < 0.5,
+        'daily_costs': rng.uniform(0, 15, rows),
+    }
+    if transport is not None:
+        columns['transport'] = np.full(rows, wage_engine.TRANSPORT_CODES[transport], dtype=np.int8)
+    if use_monthly_pass is not None:
+        columns['use_monthly_pass'] = np.full(rows, use_monthly_pass)
+    return columns
+
+
+def _scalar_scenario(transport='car', use_monthly_pass=False):
+    scenario = dict(wage_engine.DEFAULT_SCENARIO)
+    scenario['transport'] = wage_engine.TRANSPORT_CODES[transport]
+    scenario['use_monthly_pass'] = use_monthly_pass
+    return scenario
+
+
+def _gui_calculator():
+    # compute_results needs no Tk root
+    try:
+        from wage_calc_gui import TrueHourlyWageCalculator
+    except ImportError:  # no tkinter/matplotlib on this machine
+        return None
+    return object.__new__(TrueHourlyWageCalculator)
+
+
+def _gui_scenario(transport='car', use_monthly_pass=False):
+    return Scenario(transport=transport, use_monthly_pass=use_monthly_pass)
+
+
+def _batch_case(rows, **options):
+    # inputs are generated only when the case runs, so a filtered run doesn't pay for the 1M-row ones
+    def setup():
+        columns = make_columns(rows, **options)
+        return lambda: wage_engine.calculate_batch(**columns)
+    return setup
+
+
+def build_cases():
+    """name -> (rows per call, setup); setup() builds the inputs and returns the zero-argument callable"""
+    cases = {}
+
+    for transport in wage_engine.TRANSPORT_NAMES:
+        scenario = _scalar_scenario(transport)
+        cases[f"engine_scalar_{transport}"] = (1, lambda s=scenario: lambda: wage_engine.calculate_batch(**s))
+    scenario = _scalar_scenario('public', use_monthly_pass=True)
+    cases["engine_scalar_public_monthly_pass"] = (
+        1, lambda s=scenario: lambda: wage_engine.calculate_batch(**s))
+
+    for label, rows in (('10k', 10_000), ('1m', 1_000_000)):
+        cases[f"batch_{label}_mixed"] = (rows, _batch_case(rows))
+        for transport in wage_engine.TRANSPORT_NAMES:
+            cases[f"batch_{label}_{transport}"] = (rows, _batch_case(rows, transport=transport))
+        cases[f"batch_{label}_public_monthly_pass"] = (
+            rows, _batch_case(rows, transport='public', use_monthly_pass=True))
+
+    calculator = _gui_calculator()
+    if calculator is not None:
+        variants = [(transport, False) for transport in wage_engine.TRANSPORT_NAMES] + [('public', True)]
+        for transport, monthly in variants:
+            suffix = f"{transport}_monthly_pass" if monthly else transport
+            s = _gui_scenario(transport, monthly)
+            cases[f"gui_compute_results_{suffix}"] = (1, lambda sc=s: lambda: calculator.compute_results(sc))
+    return cases
+
+
+def time_case(func, repeat=5):
+    """Seconds per call: (best, median) over `repeat` timed loops"""
+    func()  # warm up
+    number = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(number):
+            func()
+        elapsed = time.perf_counter() - start
+        if elapsed >= TARGET_SECONDS or number >= 1_000_000:
+            break
+        number *= 10 if elapsed < TARGET_SECONDS / 10 else 2
+
+    timings = [elapsed / number]
+    for _ in range(repeat - 1):
+        start = time.perf_counter()
+        for _ in range(number):
+            func()
+        timings.append((time.perf_counter() - start) / number)
+    return min(timings), statistics.median(timings)
+
+
+def run(filter_text=None, repeat=5, stream=sys.stdout):
+    results = {}
+    for name, (rows, setup) in build_cases().items():
+        if filter_text and filter_text not in name:
+            continue
+        func = setup()
+        best, median = time_case(func, repeat)
+        del func  # drop this case's inputs before the next one builds its own
+        results[name] = {
+            'rows': rows,
+            'best_seconds': best,
+            'median_seconds': median,
+            'rows_per_second': rows / best if best > 0 else 0.0,
+        }
+        print(f"{name:<42} {best * 1e6:>12.2f} us  {rows / best:>16,.0f} rows/s", file=stream)
+    return results
+
+
+def compare(current, baseline, threshold=DEFAULT_THRESHOLD, stream=sys.stdout):
+    """Print the change for every case; returns the names that got slower than threshold"""
+    regressions = []
+    for name, result in current.items():
+        if name not in baseline:
+            continue
+        before = baseline[name]['best_seconds']
+        change = (result['best_seconds'] - before) / before if before > 0 else 0.0
+        flag = ''
+        if change > threshold:
+            flag = '  REGRESSION'
+            regressions.append(name)
+        print(f"{name:<42} {change:>+8.1%}{flag}", file=stream)
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the true hourly wage hot paths")
+    parser.add_argument('--save', metavar='PATH', help="write results as JSON")
+    parser.add_argument('--compare', metavar='PATH', help="compare against a saved JSON run")
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                        help="slowdown that counts as a regression (default: 0.10 = 10%%)")
+    parser.add_argument('--filter', help="only run cases whose name contains this text")
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--quick', action='store_true', help="same as --repeat 2")
+    args = parser.parse_args(argv)
+
+    results = run(args.filter, 2 if args.quick else args.repeat)
+    report = {
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'machine': platform.machine(),
+        'results': results,
+    }
+
+    if args.save:
+        with open(args.save, 'w', encoding='utf-8') as handle:
+            json.dump(report, handle, indent=2)
+
+    if args.compare:
+        with open(args.compare, 'r', encoding='utf-8') as handle:
+            baseline = json.load(handle)['results']
+        print()
+        regressions = compare(results, baseline, args.threshold)
+        if regressions:
+            print(f"\n{len(regressions)} regression(s) over {args.threshold:.0%}")
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
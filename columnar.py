@@ -0,0 +1,128 @@
+"""Columnar output for bulk results.
+
+Writes the main result columns as a bundle of .npy files (one per column,
+readable with np.load(..., mmap_mode='r')), or as Arrow IPC / Parquet when
+pyarrow is installed. Data is appended chunk by chunk, so the full result
+never has to sit in memory.
+"""
+import os
+import struct
+
+import numpy as np
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # optional
+    pa = None
+    pq = None
+
+COLUMNS = (
+    'traditional_wage',
+    'true_wage',
+    'yearly_commute_costs',
+    'yearly_commute_hours',
+    'net_yearly_income',
+)
+FORMATS = ('npy', 'arrow', 'parquet')
+
+# .npy v1.0 header, padded to a fixed size so it can be rewritten in place
+# once the final row count is known
+_NPY_MAGIC = b'\x93NUMPY\x01\x00'
+_NPY_HEADER_SIZE = 128
+
+
+def detect_format(path):
+    """npy/arrow/parquet from an output path, or None for text output"""
+    if not path or path == '-':
+        return None
+    lowered = path.lower()
+    if lowered.endswith('.parquet'):
+        return 'parquet'
+    if lowered.endswith(('.arrow', '.feather', '.ipc')):
+        return 'arrow'
+    if lowered.endswith('.npy') or os.path.isdir(path):
+        return 'npy'
+    return None
+
+
+def _npy_header(rows, dtype):
+    header = "{'descr': %r, 'fortran_order': False, 'shape': (%d,), }" % (dtype.str, rows)
+    body_size = _NPY_HEADER_SIZE - len(_NPY_MAGIC) - 2
+    header = header.ljust(body_size - 1) + '\n'
+    return _NPY_MAGIC + struct.pack('<H', body_size) + header.encode('latin1')
+
+
+class NpyBundleWriter:
+    """One float64 .npy file per column inside a directory"""
+
+    def __init__(self, path, columns=COLUMNS):
+        if path.lower().endswith('.npy'):
+            path = path[:-4]
+        os.makedirs(path, exist_ok=True)
+        self.path = path
+        self.columns = columns
+        self.dtype = np.dtype('<f8')
+        self.rows = 0
+        self.files = {}
+        for name in columns:
+            handle = open(os.path.join(path, f"{name}.npy"), 'wb')
+            handle.write(_npy_header(0, self.dtype))
+            self.files[name] = handle
+
+    def write(self, results):
+        for name in self.columns:
+            np.ascontiguousarray(results[name], dtype=self.dtype).tofile(self.files[name])
+        self.rows += len(results[self.columns[0]])
+
+    def close(self):
+        for handle in self.files.values():
+            handle.seek(0)
+            handle.write(_npy_header(self.rows, self.dtype))
+            handle.close()
+        self.files = {}
+
+
+class ArrowWriter:
+    """Arrow IPC file or Parquet file, one record batch / row group per chunk"""
+
+    def __init__(self, path, file_format='arrow', columns=COLUMNS):
+        if pa is None:
+            raise ImportError(f"pyarrow is required for {file_format} output (pip install pyarrow)")
+        self.columns = columns
+        self.schema = pa.schema([(name, pa.float64()) for name in columns])
+        self.rows = 0
+        if file_format == 'parquet':
+            self.writer = pq.ParquetWriter(path, self.schema)
+        else:
+            self.writer = pa.ipc.new_file(path, self.schema)
+
+    def write(self, results):
+        arrays = [pa.array(np.asarray(results[name], dtype=np.float64)) for name in self.columns]
+        batch = pa.record_batch(arrays, schema=self.schema)
+        if isinstance(self.writer, pa.ipc.RecordBatchFileWriter):
+            self.writer.write_batch(batch)
+        else:
+            self.writer.write_table(pa.Table.from_batches([batch]))
+        self.rows += batch.num_rows
+
+    def close(self):
+        self.writer.close()
+
+
+def open_writer(path, file_format=None):
+    """Columnar writer for path; file_format defaults to detect_format(path)"""
+    file_format = file_format or detect_format(path) or 'npy'
+    if file_format == 'npy':
+        return NpyBundleWriter(path)
+    if file_format in ('arrow', 'parquet'):
+        return ArrowWriter(path, file_format)
+    raise ValueError(f"Unknown columnar format: {file_format}")
+
+
+def load_npy_bundle(path, mmap_mode='r'):
+    """Read a bundle written by NpyBundleWriter back as {column: array}"""
+    if path.lower().endswith('.npy'):
+        path = path[:-4]
+    return {name: np.load(os.path.join(path, f"{name}.npy"), mmap_mode=mmap_mode)
+            for name in COLUMNS}
@@ -0,0 +1,210 @@
+"""Incremental re-scoring for nightly batch runs.
+
+Every run saves a state file with each record's id, a 64-bit hash of its
+inputs and its results. The next run hashes the new input the same way
+(vectorized, no per-row Python), carries results forward for records whose
+hash has not changed, and runs the engine only on new or changed rows.
+
+The state is one .npy array of (id, hash, results...) records sorted by id,
+memory-mapped when read. A run writes the next state as it goes: each
+chunk is sorted and saved as a run file, and the runs are merged block by
+block at the end, so neither state has to fit in memory.
+"""
+import os
+import shutil
+import tempfile
+import zipfile
+
+import numpy as np
+
+import wage_engine
+from records import ENGINE_FIELDS
+
+_FNV_OFFSET = np.uint64(0xcbf29ce484222325)
+_FNV_PRIME = np.uint64(0x100000001b3)
+
+# workcalendar inputs, hashed when present so a new year/region/PTO recomputes
+CALENDAR_FIELDS = ('work_weeks', 'weeks_per_month', 'pay_weeks')
+
+# rows held in memory at once while merging runs, over all runs together
+MERGE_ROWS = 262144
+
+
+def row_hashes(columns, count):
+    """64-bit FNV-1a style hash of each row's engine inputs"""
+    hashes = np.full(count, _FNV_OFFSET, dtype=np.uint64)
+    with np.errstate(over='ignore'):
+        for name in ENGINE_FIELDS + tuple(name for name in CALENDAR_FIELDS if name in columns):
+            values = np.broadcast_to(np.asarray(columns[name]), (count,))
+            if values.dtype.kind == 'f':
+                # +0.0 so that -0.0 and 0.0 hash alike
+                words = (values.astype(np.float64) + 0.0).view(np.uint64)
+            else:
+                words = values.astype(np.uint64)
+            hashes ^= words
+            hashes *= _FNV_PRIME
+            hashes ^= hashes >> np.uint64(29)
+    return hashes
+
+
+class RunState:
+    """ids (sorted), input hashes and results of one run"""
+
+    def __init__(self, ids, hashes, results):
+        self.ids = ids
+        self.hashes = hashes
+        self.results = results
+
+    @classmethod
+    def empty(cls):
+        return cls(np.zeros(0, dtype=np.uint64), np.zeros(0, dtype=np.uint64),
+                   {name: np.zeros(0) for name in wage_engine.RESULT_COLUMNS})
+
+    @classmethod
+    def load(cls, path):
+        """State written by StateWriter (memory-mapped), or an older .npz state"""
+        if not path or not os.path.exists(path):
+            return cls.empty()
+        if zipfile.is_zipfile(path):
+            with np.load(path, allow_pickle=False) as data:
+                results = {name: data[name] for name in wage_engine.RESULT_COLUMNS}
+                return cls(data['ids'], data['hashes'], results)
+        records = np.load(path, mmap_mode='r', allow_pickle=False)
+        results = {name: records[name] for name in wage_engine.RESULT_COLUMNS}
+        return cls(records['id'], records['hash'], results)
+
+    def close(self):
+        """Drop the arrays, releasing a memory-mapped state file"""
+        empty = self.empty()
+        self.ids, self.hashes, self.results = empty.ids, empty.hashes, empty.results
+
+    def lookup(self, ids, hashes):
+        """(positions in this state, mask of rows that are unchanged)"""
+        if len(self.ids) == 0:
+            return np.zeros(len(ids), dtype=np.intp), np.zeros(len(ids), dtype=bool)
+        if self.ids.dtype.kind != ids.dtype.kind:
+            # e.g. numeric ids last run, string ids now: nothing can match
+            return np.zeros(len(ids), dtype=np.intp), np.zeros(len(ids), dtype=bool)
+        positions = np.searchsorted(self.ids, ids)
+        positions = np.minimum(positions, len(self.ids) - 1)
+        unchanged = (self.ids[positions] == ids) & (self.hashes[positions] == hashes)
+        return positions, unchanged
+
+
+def rescore_chunk(previous, ids, columns, calendar=None):
+    """Results for one chunk, recomputing only new/changed rows
+
+    calendar is an optional workcalendar.WorkCalendar.
+
+    Returns (results, hashes, number of rows recomputed).
+    """
+    ids = np.asarray(ids)
+    count = len(ids)
+    if calendar is not None:
+        columns = calendar.apply(columns)
+    hashes = row_hashes(columns, count)
+    positions, unchanged = previous.lookup(ids, hashes)
+    changed = ~unchanged
+
+    results = {name: np.empty(count) for name in wage_engine.RESULT_COLUMNS}
+    for name in wage_engine.RESULT_COLUMNS:
+        results[name][unchanged] = previous.results[name][positions[unchanged]]
+
+    recomputed = int(changed.sum())
+    if recomputed:
+        subset = {name: (values[changed] if np.ndim(values) else values)
+                  for name, values in columns.items()}
+        fresh = wage_engine.calculate_batch(**subset)
+        for name in wage_engine.RESULT_COLUMNS:
+            results[name][changed] = fresh[name]
+    return results, hashes, recomputed
+
+
+def iter_rescored(chunks, previous, new_state, calendar=None):
+    """Yield (ids, results, recomputed) for each (ids, columns) input chunk
+
+    Every chunk is also added to new_state, a StateWriter for the next run.
+    """
+    for ids, columns in chunks:
+        if ids is None:
+            raise ValueError("incremental mode needs an 'id' column")
+        ids = np.asarray(ids)
+        results, hashes, recomputed = rescore_chunk(previous, ids, columns, calendar)
+        new_state.add(ids, hashes, results)
+        yield ids, results, recomputed
+
+
+def _state_dtype(id_dtype):
+    return np.dtype([('id', id_dtype), ('hash', '<u8')]
+                    + [(name, '<f8') for name in wage_engine.RESULT_COLUMNS])
+
+
+class StateWriter:
+    """Writes a state file chunk by chunk
+
+    Each add() sorts its chunk by id and saves it as a run in a temporary
+    directory next to path; close() merges the runs into path (replacing it
+    only once the merge is complete) and discard() drops them.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.run_dir = tempfile.mkdtemp(prefix='.state-runs-', dir=os.path.dirname(os.path.abspath(path)))
+        self.runs = []
+        self.rows = 0
+
+    def add(self, ids, hashes, results):
+        ids = np.asarray(ids)
+        order = np.argsort(ids, kind='stable')
+        run = np.empty(len(ids), dtype=_state_dtype(ids.dtype))
+        run['id'] = ids[order]
+        run['hash'] = hashes[order]
+        for name in wage_engine.RESULT_COLUMNS:
+            run[name] = np.broadcast_to(results[name], (len(ids),))[order]
+        path = os.path.join(self.run_dir, f"{len(self.runs)}.npy")
+        np.save(path, run)
+        self.runs.append(path)
+        self.rows += len(ids)
+
+    def close(self):
+        try:
+            runs = [np.load(path, mmap_mode='r') for path in self.runs]
+            # string ids are as wide as the widest run's
+            id_dtype = np.result_type(*(run.dtype['id'] for run in runs)) if runs else np.dtype('<u8')
+            dtype = _state_dtype(id_dtype)
+            tmp_path = os.path.join(self.run_dir, 'merged.npy')
+            with open(tmp_path, 'wb') as handle:
+                np.lib.format.write_array_header_1_0(handle, {
+                    'descr': np.lib.format.dtype_to_descr(dtype), 'fortran_order': False, 'shape': (self.rows,)})
+                for rows in _merge_runs(runs, dtype):
+                    handle.write(rows.tobytes())
+            del runs
+            os.replace(tmp_path, self.path)
+        finally:
+            self.discard()
+
+    def discard(self):
+        shutil.rmtree(self.run_dir, ignore_errors=True)
+
+
+def _merge_runs(runs, dtype):
+    # k-way merge of sorted runs, a block of each at a time: rows up to the smallest last id of a
+    # block that still has rows behind it are final, so they are sorted together and yielded
+    block = max(MERGE_ROWS // max(len(runs), 1), 1024)
+    cursors = [0] * len(runs)
+    while True:
+        active = [position for position, run in enumerate(runs) if cursors[position] < len(run)]
+        if not active:
+            return
+        blocks = [runs[position][cursors[position]:cursors[position] + block] for position in active]
+        bounds = [rows['id'][-1] for position, rows in zip(active, blocks)
+                  if cursors[position] + len(rows) < len(runs[position])]
+        if bounds:
+            bound = min(bounds)
+            takes = [int(np.searchsorted(rows['id'], bound, side='right')) for rows in blocks]
+        else:
+            takes = [len(rows) for rows in blocks]
+        rows = np.concatenate([rows[:take].astype(dtype) for rows, take in zip(blocks, takes)])
+        yield rows[np.argsort(rows['id'], kind='stable')]
+        for position, take in zip(active, takes):
+            cursors[position] += take
@@ -0,0 +1,420 @@
+"""Rolling ledger of actual commute time, cost and true wage from daily logs.
+
+Each log row is one employee's working day; columns other than id and date
+are optional and override the roster for that day (the day's fuel price,
+miles, fare...). 'wfh' as the transport marks a day worked from home:
+
+    id,date,transport,commute_minutes,daily_miles,gas_price
+    E1,2025-03-03,car,35,12,3.49
+    E1,2025-03-04,wfh,,,
+
+With --gas-prices/--electricity-prices (see prices.py), days that leave the
+price out get the one in effect on their date in their 'region'.
+
+The roster is a bulk-mode input file (engine input columns with an id) and
+gives each employee's pay, hours and vehicle. A day's commute time and cost
+come from wage_engine.commute_metrics() for a single commute day, and its
+income is the employee's annual income spread over their scheduled workdays.
+A monthly pass is likewise spread over the roster's commute days (work_days
+- wfh_days a week), whatever fare the log gives.
+
+Totals are kept per employee in fixed-size ring buffers, one per period kind
+(week, month, quarter): a day is added to its period's slot, and a slot is
+cleared when a newer period takes it over. Adding days never re-sums history,
+and memory is employees x slots however long the history gets. Lifetime
+totals are kept too, and the whole ledger is saved to a .npz file between
+runs:
+
+    python ledger.py march.csv --roster roster.csv --state ledger.npz --period month --last 3
+    python ledger.py --state ledger.npz --period week --last 4 --rolling
+"""
+import argparse
+import csv
+import io
+import os
+import sys
+
+import numpy as np
+
+import batch_io
+import wage_engine
+from prices import PriceTables
+
+PERIODS = ('week', 'month', 'quarter')
+# periods kept per employee: two years of weeks, three of months and quarters
+DEFAULT_SLOTS = {'week': 104, 'month': 36, 'quarter': 12}
+
+# what is summed for each period
+FIELDS = ('days', 'income', 'work_hours', 'commute_hours', 'commute_costs')
+REPORT_COLUMNS = FIELDS + ('true_wage',)
+
+# roster values a log row may override for its day
+DAY_COLUMNS = ('daily_hours', 'commute_minutes', 'daily_miles', 'gas_price', 'mpg', 'ev_efficiency',
+               'electricity_price', 'public_daily_cost', 'public_walking_minutes', 'daily_costs')
+HOME_NAMES = {'wfh', 'home', 'remote'}
+# roster values kept for monthly passes, which are paid per month rather than per day
+PASS_COLUMNS = ('public_monthly_cost', 'commute_days')
+
+_EMPTY = np.iinfo(np.int64).min
+# week 0 starts on a Monday
+_MONDAY = np.datetime64('1970-01-05', 'D')
+
+
+def period_index(dates, period):
+    """Week, month or quarter number of each date"""
+    dates = np.asarray(dates, dtype='datetime64[D]')
+    if period == 'week':
+        return (dates - _MONDAY).astype(np.int64) // 7
+    months = dates.astype('datetime64[M]').astype(np.int64)
+    return months if period == 'month' else months // 3
+
+
+def period_start(index, period):
+    """First day of each period number"""
+    index = np.asarray(index, dtype=np.int64)
+    if period == 'week':
+        return _MONDAY + (index * 7).astype('timedelta64[D]')
+    months = index if period == 'month' else index * 3
+    return months.astype('datetime64[M]').astype('datetime64[D]')
+
+
+def true_wage(totals):
+    """(income - commute costs) / (work + commute hours) for an array of FIELDS totals"""
+    totals = np.asarray(totals, dtype=np.float64)
+    net = totals[..., FIELDS.index('income')] - totals[..., FIELDS.index('commute_costs')]
+    hours = totals[..., FIELDS.index('work_hours')] + totals[..., FIELDS.index('commute_hours')]
+    out = np.zeros(net.shape)
+    np.divide(net, hours, out=out, where=hours > 0)
+    return out
+
+
+class PeriodRing:
+    """FIELDS totals for each employee's last `slots` periods of one kind"""
+
+    def __init__(self, period, slots, capacity=0):
+        self.period = period
+        self.slots = slots
+        self.totals = np.zeros((capacity, slots, len(FIELDS)))
+        # period number held by each slot
+        self.stamps = np.full((capacity, slots), _EMPTY, dtype=np.int64)
+
+    def resize(self, capacity):
+        extra = capacity - len(self.stamps)
+        self.totals = np.concatenate([self.totals, np.zeros((extra, self.slots, len(FIELDS)))])
+        self.stamps = np.concatenate([self.stamps, np.full((extra, self.slots), _EMPTY, dtype=np.int64)])
+
+    def add(self, rows, periods, values):
+        """Add (n, len(FIELDS)) day values to each row's period
+
+        Days in a period older than the one now holding their slot have
+        fallen out of the window and are skipped.
+        """
+        keys = rows * self.slots + periods % self.slots
+        stamps = self.stamps.reshape(-1)
+        totals = self.totals.reshape(-1, len(FIELDS))
+
+        slots, inverse = np.unique(keys, return_inverse=True)
+        newest = stamps[slots].copy()
+        np.maximum.at(newest, inverse, periods)
+        moved = newest > stamps[slots]
+        totals[slots[moved]] = 0.0
+        stamps[slots[moved]] = newest[moved]
+
+        keep = periods == newest[inverse]
+        np.add.at(totals, keys[keep], values[keep])
+
+    def last(self, end, count):
+        """(period numbers, (employees, count, len(FIELDS)) totals) for end-count+1 .. end"""
+        count = min(count, self.slots)
+        periods = np.arange(end - count + 1, end + 1)
+        slots = periods % self.slots
+        held = self.stamps[:, slots] == periods
+        return periods, self.totals[:, slots] * held[..., None]
+
+
+class CommuteLedger:
+    """Per-employee profiles, lifetime totals and a PeriodRing per period kind"""
+
+    def __init__(self, slots=None):
+        slots = dict(DEFAULT_SLOTS, **(slots or {}))
+        self.ids = []
+        self.index = {}
+        self.profile = {name: np.zeros(0) for name in DAY_COLUMNS + PASS_COLUMNS + ('daily_income',)}
+        self.profile['transport'] = np.zeros(0, dtype=np.int8)
+        self.profile['use_monthly_pass'] = np.zeros(0, dtype=bool)
+        self.lifetime = np.zeros((0, len(FIELDS)))
+        self.rings = {period: PeriodRing(period, slots[period]) for period in PERIODS}
+        self.latest = np.datetime64('NaT', 'D')
+
+    def __len__(self):
+        return len(self.ids)
+
+    def _resize(self, capacity):
+        extra = capacity - len(self.lifetime)
+        for name, values in self.profile.items():
+            self.profile[name] = np.concatenate([values, np.zeros(extra, dtype=values.dtype)])
+        self.lifetime = np.concatenate([self.lifetime, np.zeros((extra, len(FIELDS)))])
+        for ring in self.rings.values():
+            ring.resize(capacity)
+
+    def rows(self, ids, create=False):
+        """Ledger row of each id; -1 for unknown ids unless create adds them"""
+        unique, inverse = np.unique(np.asarray(ids, dtype=str), return_inverse=True)
+        rows = np.array([self.index.get(name, -1) for name in unique.tolist()], dtype=np.intp)
+        if create and (rows < 0).any():
+            for position in np.flatnonzero(rows < 0):
+                name = str(unique[position])
+                rows[position] = self.index[name] = len(self.ids)
+                self.ids.append(name)
+            self._resize(len(self.ids))
+        return rows[inverse]
+
+    def set_roster(self, ids, columns):
+        """Add or update employees from engine input columns (e.g. a bulk-mode roster chunk)"""
+        rows = self.rows(ids, create=True)
+        count = len(rows)
+        for name in DAY_COLUMNS + ('transport', 'use_monthly_pass', 'public_monthly_cost'):
+            self.profile[name][rows] = np.broadcast_to(columns[name], (count,))
+        self.profile['commute_days'][rows] = np.broadcast_to(
+            np.asarray(columns['work_days'], dtype=np.float64) - columns['wfh_days'], (count,))
+        income = wage_engine.annual_income(columns['pay_frequency'], columns['paycheck'],
+                                           columns['work_days'])
+        workdays = np.broadcast_to(np.asarray(columns['work_days'], dtype=np.float64)
+                                   * wage_engine.WORK_WEEKS_PER_YEAR, (count,))
+        daily_income = np.zeros(count)
+        np.divide(np.broadcast_to(income, (count,)), workdays, out=daily_income, where=workdays > 0)
+        self.profile['daily_income'][rows] = daily_income
+
+    def add_days(self, ids, dates, transport=None, day_columns=None):
+        """Add a batch of logged days; returns (days added, rows skipped for unknown ids)
+
+        transport is a transport name per day ('wfh' for home days, blank
+        for the roster's mode); day_columns maps DAY_COLUMNS names to arrays
+        that are NaN where the roster's value applies.
+        """
+        rows = self.rows(ids)
+        known = rows >= 0
+        rows = rows[known]
+        dates = np.asarray(dates, dtype='datetime64[D]')[known]
+        count = len(rows)
+        if not count:
+            return 0, int((~known).sum())
+
+        inputs = {}
+        for name in DAY_COLUMNS:
+            roster = self.profile[name][rows]
+            values = (day_columns or {}).get(name)
+            if values is None:
+                inputs[name] = roster
+            else:
+                values = np.asarray(values, dtype=np.float64)[known]
+                inputs[name] = np.where(np.isnan(values), roster, values)
+
+        codes = self.profile['transport'][rows]
+        home = np.zeros(count, dtype=bool)
+        if transport is not None:
+            names = np.char.lower(np.char.strip(np.asarray(transport, dtype=str)[known]))
+            home = np.isin(names, list(HOME_NAMES))
+            codes = np.where((names == '') | home, codes, wage_engine.encode_transport(names))
+
+        # a pass costs the same share of its month on every commute day the roster schedules
+        pass_fare = np.zeros(count)
+        pass_days = self.profile['commute_days'][rows] * wage_engine.WEEKS_PER_MONTH
+        np.divide(self.profile['public_monthly_cost'][rows], pass_days, out=pass_fare, where=pass_days > 0)
+        public_fare = np.where(self.profile['use_monthly_pass'][rows], pass_fare, inputs['public_daily_cost'])
+
+        metrics = wage_engine.commute_metrics(
+            codes, inputs['commute_minutes'], inputs['daily_miles'], work_days=1.0,
+            gas_price=inputs['gas_price'], mpg=inputs['mpg'], ev_efficiency=inputs['ev_efficiency'],
+            electricity_price=inputs['electricity_price'], public_daily_cost=public_fare,
+            public_walking_minutes=inputs['public_walking_minutes'], daily_costs=inputs['daily_costs'],
+        )
+        values = np.column_stack([
+            np.ones(count),
+            self.profile['daily_income'][rows],
+            inputs['daily_hours'],
+            np.where(home, 0.0, metrics['daily_commute_hours']),
+            np.where(home, 0.0, metrics['daily_commute_cost']),
+        ])
+
+        np.add.at(self.lifetime, rows, values)
+        for period, ring in self.rings.items():
+            ring.add(rows, period_index(dates, period), values)
+        latest = dates.max()
+        if np.isnat(self.latest) or latest > self.latest:
+            self.latest = latest
+        return count, int((~known).sum())
+
+    def _end(self, period, end):
+        if end is None:
+            end = self.latest
+        if np.isnat(np.datetime64(end, 'D')):
+            raise ValueError("the ledger has no days yet")
+        return int(period_index(end, period))
+
+    def last(self, period, count=1, end=None):
+        """(period start dates, (employees, count, len(FIELDS)) totals) for the last count periods
+
+        The last period is the one holding end (default: the latest day added).
+        """
+        periods, totals = self.rings[period].last(self._end(period, end), count)
+        return period_start(periods, period), totals
+
+    def rolling(self, period, count, end=None):
+        """(employees, len(FIELDS)) totals over the last count periods"""
+        return self.last(period, count, end)[1].sum(axis=1)
+
+    def save(self, path):
+        arrays = {
+            'ids': np.array(self.ids, dtype=str),
+            'lifetime': self.lifetime,
+            'latest': np.array(self.latest),
+        }
+        for name, values in self.profile.items():
+            arrays[f'profile_{name}'] = values
+        for period, ring in self.rings.items():
+            arrays[f'{period}_totals'] = ring.totals
+            arrays[f'{period}_stamps'] = ring.stamps
+        tmp_path = f"{path}.tmp.npz"
+        np.savez(tmp_path, **arrays)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path, slots=None):
+        """Ledger saved by save(); a new one if path does not exist yet"""
+        if not path or not os.path.exists(path):
+            return cls(slots)
+        with np.load(path, allow_pickle=False) as data:
+            ledger = cls({period: data[f'{period}_stamps'].shape[1] for period in PERIODS})
+            ledger.ids = data['ids'].tolist()
+            ledger.index = {name: row for row, name in enumerate(ledger.ids)}
+            ledger.lifetime = data['lifetime']
+            ledger.latest = data['latest'][()]
+            for name, values in ledger.profile.items():
+                # ledgers saved before pass columns were kept have no passes
+                key = f'profile_{name}'
+                if key in data:
+                    ledger.profile[name] = data[key]
+                else:
+                    ledger.profile[name] = np.zeros(len(ledger.ids), dtype=values.dtype)
+            for period, ring in ledger.rings.items():
+                ring.totals = data[f'{period}_totals']
+                ring.stamps = data[f'{period}_stamps']
+        return ledger
+
+
+def _day_column(values):
+    try:
+        return np.array(values, dtype=np.float64)
+    except ValueError:
+        # blank cells -> NaN, i.e. the roster's value
+        return np.array([float(v) if str(v).strip() else np.nan for v in values], dtype=np.float64)
+
+
+def iter_log_chunks(stream, chunk_size=batch_io.DEFAULT_CHUNK_SIZE, prices=None):
+    """Yield (ids, dates, transport or None, day columns) for each chunk of a CSV log
+
+    prices is an optional prices.PriceTables; days that do not give their own
+    gas or electricity price get the one in effect that day in the row's
+    region (its 'region' column, else the tables' default series).
+    """
+    header = batch_io.read_header(stream)
+    for name in ('id', 'date'):
+        if name not in header:
+            raise ValueError(f"the log needs an '{name}' column")
+    width = len(header)
+    for lines in batch_io.iter_line_chunks(stream, chunk_size):
+        rows = [row + [''] * (width - len(row)) if len(row) < width else row for row in csv.reader(lines)]
+        if not rows:
+            continue
+        raw = {name: values for name, values in zip(header, zip(*rows))}
+        day_columns = {name: _day_column(raw[name]) for name in DAY_COLUMNS if name in raw}
+        dates = np.array(raw['date'], dtype='datetime64[D]')
+        if prices is not None:
+            for name, values in prices.lookup(dates, raw.get(batch_io.REGION_COLUMN)).items():
+                logged = day_columns.get(name)
+                day_columns[name] = values if logged is None else np.where(np.isnan(logged), values, logged)
+        yield list(raw['id']), dates, raw.get('transport'), day_columns
+
+
+def format_report(ids, starts, totals):
+    """CSV rows: one per employee and period with any days in it"""
+    employees, periods = np.nonzero(totals[..., FIELDS.index('days')] > 0)
+    picked = totals[employees, periods]
+    columns = [
+        np.asarray(ids)[employees].tolist(),
+        starts[periods].astype(str).tolist(),
+        *(np.round(picked[:, position], 4).tolist() for position in range(len(FIELDS))),
+        np.round(true_wage(picked), 4).tolist(),
+    ]
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, lineterminator='\n')
+    writer.writerows(zip(*columns))
+    return buffer.getvalue()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Rolling ledger of actual commute costs and true wage")
+    parser.add_argument('log', nargs='?', help="CSV of logged days (id, date, ...) to add, '-' for stdin")
+    parser.add_argument('--roster', help="bulk-mode input file (with ids) giving pay, hours and vehicles")
+    parser.add_argument('--state', metavar='PATH', help=".npz ledger to load and update")
+    parser.add_argument('--period', choices=PERIODS, default='month')
+    parser.add_argument('--last', type=int, default=1, help="periods to report, up to the latest day")
+    parser.add_argument('--rolling', action='store_true', help="one row per employee summing those periods")
+    parser.add_argument('--output', '-o', default='-', help="CSV report (default: stdout)")
+    parser.add_argument('--gas-prices', metavar='CSV',
+                        help="date,region,price table for days that do not log their own gas price")
+    parser.add_argument('--electricity-prices', metavar='CSV', help="the same for electricity prices")
+    parser.add_argument('--chunk-size', type=int, default=batch_io.DEFAULT_CHUNK_SIZE)
+    args = parser.parse_args(argv)
+
+    ledger = CommuteLedger.load(args.state)
+    if args.roster:
+        source = batch_io.open_input(args.roster)
+        try:
+            for ids, columns in batch_io.iter_record_chunks(source, batch_io.detect_format(args.roster),
+                                                            args.chunk_size):
+                if ids is None:
+                    parser.error("the roster needs an 'id' column")
+                ledger.set_roster(ids, columns)
+        finally:
+            if source is not sys.stdin:
+                source.close()
+
+    if args.log:
+        added = skipped = 0
+        prices = None
+        if args.gas_prices or args.electricity_prices:
+            prices = PriceTables.load(args.gas_prices, args.electricity_prices)
+        source = batch_io.open_input(args.log)
+        try:
+            for ids, dates, transport, day_columns in iter_log_chunks(source, args.chunk_size, prices):
+                counts = ledger.add_days(ids, dates, transport, day_columns)
+                added += counts[0]
+                skipped += counts[1]
+        finally:
+            if source is not sys.stdin:
+                source.close()
+        print(f"Added {added:,} days; skipped {skipped:,} for ids not in the roster", file=sys.stderr)
+
+    if args.state:
+        ledger.save(args.state)
+    if np.isnat(ledger.latest):
+        return
+
+    starts, totals = ledger.last(args.period, args.last)
+    sink = batch_io.open_output(args.output)
+    try:
+        if args.rolling:
+            sink.write(','.join(('id', 'from') + REPORT_COLUMNS) + '\n')
+            sink.write(format_report(ledger.ids, starts[:1], totals.sum(axis=1, keepdims=True)))
+        else:
+            sink.write(','.join(('id', args.period) + REPORT_COLUMNS) + '\n')
+            sink.write(format_report(ledger.ids, starts, totals))
+    finally:
+        if sink is not sys.stdout:
+            sink.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+"""Load generator for server.py.
+
+    python server.py --port 8080 &
+    python loadgen.py --port 8080 --batch-size 500 --connections 8 --duration 10
+    python loadgen.py --port 8080 --batch-size 0 --connections 64   # single /score requests
+
+Each connection is kept alive and sends requests back to back. Scenarios are
+random but reproducible (benchmark.make_columns). Prints scenarios/s,
+requests/s and request latency percentiles.
+"""
+import argparse
+import asyncio
+import json
+import time
+
+import numpy as np
+
+import wage_engine
+from benchmark import make_columns
+
+
+def make_scenarios(count, seed=0):
+    """Scenario dicts as a client would send them"""
+    columns = make_columns(count, seed=seed)
+    scenarios = []
+    for row in range(count):
+        scenario = {name: values[row].item() for name, values in columns.items()}
+        scenario['transport'] = wage_engine.TRANSPORT_NAMES[scenario['transport']]
+        scenario['pay_frequency'] = wage_engine.PAY_FREQUENCY_NAMES[scenario['pay_frequency']]
+        scenarios.append(scenario)
+    return scenarios
+
+
+def build_requests(scenarios, batch_size, host):
+    """Raw HTTP requests, encoded up front so the client spends its time waiting on the server"""
+    if batch_size:
+        path = '/score/batch'
+        bodies = [json.dumps(scenarios[start:start + batch_size]).encode('utf-8')
+                  for start in range(0, len(scenarios) - batch_size + 1, batch_size)]
+    else:
+        path = '/score'
+        bodies = [json.dumps(scenario).encode('utf-8') for scenario in scenarios]
+    return [(f"POST {path} HTTP/1.1\r\nHost: {host}\r\nContent-Type: application/json\r\n"
+             f"Content-Length: {len(body)}\r\n\r\n").encode('latin-1') + body
+            for body in bodies]
+
+
+async def read_response(reader):
+    status_line = await reader.readline()
+    if not status_line:
+        raise ConnectionError("server closed the connection")
+    status = int(status_line.split()[1])
+    length = 0
+    while True:
+        line = await reader.readline()
+        if line in (b'\r\n', b'\n', b''):
+            break
+        name, _, value = line.decode('latin-1').partition(':')
+        if name.strip().lower() == 'content-length':
+            length = int(value)
+    await reader.readexactly(length)
+    return status
+
+
+async def run_connection(host, port, requests, offset, deadline, latencies, errors):
+    reader, writer = await asyncio.open_connection(host, port)
+    position = offset
+    try:
+        while time.perf_counter() < deadline:
+            start = time.perf_counter()
+            writer.write(requests[position % len(requests)])
+            status = await read_response(reader)
+            latencies.append(time.perf_counter() - start)
+            if status != 200:
+                errors.append(status)
+            position += 1
+    finally:
+        writer.close()
+
+
+async def run(host, port, requests, connections, duration):
+    latencies = []
+    errors = []
+    deadline = time.perf_counter() + duration
+    start = time.perf_counter()
+    await asyncio.gather(*(run_connection(host, port, requests, index * 7, deadline, latencies, errors)
+                           for index in range(connections)))
+    return time.perf_counter() - start, np.array(latencies), errors
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Measure server.py throughput on this machine")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8080)
+    parser.add_argument('--batch-size', type=int, default=500,
+                        help="scenarios per /score/batch request, 0 for single /score requests")
+    parser.add_argument('--connections', '-c', type=int, default=8)
+    parser.add_argument('--duration', type=float, default=10.0, help="seconds")
+    parser.add_argument('--scenarios', type=int, default=20000, help="distinct scenarios to cycle through")
+    args = parser.parse_args(argv)
+
+    scenarios = make_scenarios(max(args.scenarios, args.batch_size))
+    requests = build_requests(scenarios, args.batch_size, f"{args.host}:{args.port}")
+    elapsed, latencies, errors = asyncio.run(
+        run(args.host, args.port, requests, args.connections, args.duration))
+
+    count = len(latencies)
+    per_request = args.batch_size or 1
+    print(f"Requests: {count:,} in {elapsed:.1f}s ({count / elapsed:,.0f}/s), errors: {len(errors)}")
+    print(f"Scenarios: {count * per_request / elapsed:,.0f}/s")
+    if count:
+        p50, p99 = np.percentile(latencies * 1000, [50, 99])
+        print(f"Latency: p50 {p50:.2f} ms, p99 {p99:.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
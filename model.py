@@ -0,0 +1,173 @@
+"""Scenario and Result: calculator inputs and outputs as small immutable objects.
+
+Both are frozen dataclasses with __slots__. A scenario is one compact object
+instead of a dict, a dozen loose arguments or a set of Tk variables, and a
+result has exactly the wage_engine.RESULT_COLUMNS fields. For millions of
+them, convert to the NumPy structured arrays the batch code uses
+(records.SCENARIO_DTYPE and records.RESULT_DTYPE) and back:
+
+    array = scenarios_to_array(scenarios)
+    results = results_to_array(wage_engine.calculate_batch(**records.engine_columns(array)))
+
+numpy is only imported by the functions that need it, so the GUI can use
+these types without loading it at startup.
+"""
+from dataclasses import dataclass, fields, replace
+
+
+@dataclass(frozen=True, slots=True)
+class Scenario:
+    """One set of calculator inputs (defaults match wage_engine.DEFAULT_SCENARIO)"""
+    paycheck: float = 2000.0
+    pay_frequency: str = 'biweekly'
+    daily_hours: float = 8.0
+    work_days: float = 5.0
+    wfh_days: float = 0.0
+    transport: str = 'car'
+    commute_minutes: float = 30.0
+    daily_miles: float = 10.0
+    gas_price: float = 3.50
+    mpg: float = 25.0
+    ev_efficiency: float = 4.0
+    electricity_price: float = 0.15
+    public_daily_cost: float = 5.50
+    public_monthly_cost: float = 100.0
+    public_walking_minutes: float = 10.0
+    use_monthly_pass: bool = False
+    daily_costs: float = 5.0
+
+    def __post_init__(self):
+        # the CLI's name for public transport
+        if self.transport == 'public_transport':
+            object.__setattr__(self, 'transport', 'public')
+
+    @classmethod
+    def from_dict(cls, data):
+        """From a dict of inputs; 'transport_type' is read as 'transport', other keys are ignored"""
+        values = {name: data[name] for name in SCENARIO_FIELDS if name in data}
+        if 'transport' not in values and 'transport_type' in data:
+            values['transport'] = data['transport_type']
+        return cls(**values)
+
+    def to_dict(self):
+        return {name: getattr(self, name) for name in SCENARIO_FIELDS}
+
+    def replace(self, **changes):
+        """Copy with some inputs changed"""
+        return replace(self, **changes)
+
+    def engine_inputs(self):
+        """Keyword arguments for wage_engine.calculate_batch()"""
+        import wage_engine
+        inputs = self.to_dict()
+        inputs['transport'] = wage_engine.TRANSPORT_CODES.get(self.transport, wage_engine.CAR)
+        inputs['pay_frequency'] = wage_engine.PAY_FREQUENCY_CODES.get(self.pay_frequency, wage_engine.BIWEEKLY)
+        return inputs
+
+    def score(self):
+        """Result from the vectorized engine"""
+        return score_scenarios([self])[0]
+
+
+@dataclass(frozen=True, slots=True)
+class Result:
+    """Calculator outputs, one field per wage_engine.RESULT_COLUMNS name"""
+    traditional_wage: float
+    true_wage: float
+    annual_income: float
+    yearly_work_hours: float
+    yearly_commute_hours: float
+    yearly_commute_costs: float
+    net_yearly_income: float
+    total_committed_hours: float
+    daily_commute_hours: float
+    daily_commute_cost: float
+    commute_days: float
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(**{name: data[name] for name in RESULT_FIELDS})
+
+    def to_dict(self):
+        return {name: getattr(self, name) for name in RESULT_FIELDS}
+
+
+SCENARIO_FIELDS = tuple(field.name for field in fields(Scenario))
+RESULT_FIELDS = tuple(field.name for field in fields(Result))
+
+
+def scenarios_to_columns(scenarios):
+    """Engine keyword arguments (NumPy arrays, integer codes) for a list of scenarios"""
+    import numpy as np
+    import wage_engine
+
+    columns = {}
+    for name in SCENARIO_FIELDS:
+        values = [getattr(scenario, name) for scenario in scenarios]
+        if name == 'transport':
+            columns[name] = wage_engine.encode_transport(values)
+        elif name == 'pay_frequency':
+            columns[name] = wage_engine.encode_pay_frequency(values)
+        elif name == 'use_monthly_pass':
+            columns[name] = np.array(values, dtype=bool)
+        else:
+            columns[name] = np.array(values, dtype=np.float64)
+    return columns
+
+
+def scenarios_to_array(scenarios, ids=None):
+    """records.SCENARIO_DTYPE array for a list of scenarios"""
+    import records
+    return records.records_from_columns(scenarios_to_columns(scenarios), ids)
+
+
+def scenarios_from_array(array):
+    """Scenarios for each row of a records.SCENARIO_DTYPE array"""
+    import wage_engine
+
+    columns = []
+    for name in SCENARIO_FIELDS:
+        values = array[name].tolist()
+        if name == 'transport':
+            values = [wage_engine.TRANSPORT_NAMES[code] for code in values]
+        elif name == 'pay_frequency':
+            values = [wage_engine.PAY_FREQUENCY_NAMES[code] for code in values]
+        columns.append(values)
+    return [Scenario(*row) for row in zip(*columns)]
+
+
+def results_from_columns(results):
+    """Results from a dict of arrays as returned by wage_engine.calculate_batch()"""
+    import numpy as np
+
+    count = max((np.size(results[name]) for name in RESULT_FIELDS), default=0)
+    columns = [np.broadcast_to(results[name], (count,)).tolist() for name in RESULT_FIELDS]
+    return [Result(*row) for row in zip(*columns)]
+
+
+def results_to_array(results):
+    """records.RESULT_DTYPE array from a list of Results or a dict of engine output arrays"""
+    import numpy as np
+    import records
+
+    if isinstance(results, dict):
+        count = max((np.size(results[name]) for name in RESULT_FIELDS), default=0)
+        array = np.zeros(count, dtype=records.RESULT_DTYPE)
+        for name in RESULT_FIELDS:
+            array[name] = results[name]
+        return array
+    return np.array([tuple(getattr(result, name) for name in RESULT_FIELDS) for result in results],
+                    dtype=records.RESULT_DTYPE)
+
+
+def results_from_array(array):
+    """Results for each row of a records.RESULT_DTYPE array"""
+    return [Result(*row) for row in zip(*(array[name].tolist() for name in RESULT_FIELDS))]
+
+
+def score_scenarios(scenarios):
+    """Results for a list of scenarios, in one engine call"""
+    import wage_engine
+    if not scenarios:
+        return []
+    return results_from_columns(wage_engine.calculate_batch(**scenarios_to_columns(scenarios)))
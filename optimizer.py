@@ -0,0 +1,187 @@
+"""Best transport mode, WFH days and fare option for each person.
+
+For a fixed mode (and, for public transport, pass or daily fares) the yearly
+commute cost and hours are linear in the number of commute days d:
+
+    cost(d) = fixed + per_day * d    (fixed is the monthly pass, 50 * M / 4.33)
+    hours(d) = per_day_hours * d
+
+so the true wage (income - cost) / (work hours + hours) is a linear-fractional
+function of d and is monotone on any interval of d. Budget limits are linear
+in d too, so they just shrink the interval of allowed WFH days. The best
+choice per mode therefore sits at one end of that interval: the solver scores
+those two points for every mode and row (a handful of batched engine calls
+for the whole roster) instead of trying every mode x WFH-days combination.
+
+    python optimizer.py roster.csv --min-office-days 2 --max-commute-cost 3000 -o best.csv
+"""
+import argparse
+import csv
+import io
+import sys
+
+import numpy as np
+
+import batch_io
+import wage_engine
+
+# decision variables - whatever the input says for these is ignored
+DECISION_COLUMNS = ('transport', 'wfh_days', 'use_monthly_pass')
+
+SOLUTION_COLUMNS = ('transport', 'wfh_days', 'use_monthly_pass', 'true_wage',
+                    'yearly_commute_costs', 'yearly_commute_hours', 'feasible')
+
+# commute_metrics() inputs that come straight from the roster
+_METRIC_INPUTS = ('commute_minutes', 'daily_miles', 'gas_price', 'mpg', 'ev_efficiency',
+                  'electricity_price', 'public_daily_cost', 'public_monthly_cost',
+                  'public_walking_minutes', 'daily_costs')
+
+# slack for float day counts, e.g. 5.0 - 2.9999999
+_EPSILON = 1e-9
+
+
+def candidates(modes=wage_engine.TRANSPORT_NAMES, allow_monthly_pass=True):
+    """(transport code, use_monthly_pass) pairs to consider"""
+    pairs = []
+    for name in modes:
+        code = wage_engine.TRANSPORT_CODES[name]
+        pairs.append((code, False))
+        if code == wage_engine.PUBLIC and allow_monthly_pass:
+            pairs.append((code, True))
+    return pairs
+
+
+def _linear_in_days(columns, transport, use_monthly_pass):
+    # yearly cost/hours at 1 and 2 commute days give the line for every d > 0
+    inputs = {name: columns[name] for name in _METRIC_INPUTS}
+    one = wage_engine.commute_metrics(transport, work_days=1.0, use_monthly_pass=use_monthly_pass, **inputs)
+    two = wage_engine.commute_metrics(transport, work_days=2.0, use_monthly_pass=use_monthly_pass, **inputs)
+    cost_slope = two['yearly_commute_costs'] - one['yearly_commute_costs']
+    hours_slope = two['yearly_commute_hours'] - one['yearly_commute_hours']
+    return (one['yearly_commute_costs'] - cost_slope, cost_slope,
+            one['yearly_commute_hours'] - hours_slope, hours_slope)
+
+
+def _min_wfh_for_limit(work_days, intercept, slope, limit):
+    # smallest whole number of WFH days with intercept + slope * (work_days - wfh) <= limit
+    with np.errstate(divide='ignore', invalid='ignore'):
+        max_commute_days = np.where(slope > 0, (limit - intercept) / slope, np.inf)
+    max_commute_days = np.where((slope <= 0) & (intercept > limit), -np.inf, max_commute_days)
+    return np.ceil(work_days - max_commute_days - _EPSILON)
+
+
+def solve(columns, min_office_days=0.0, max_commute_cost=np.inf, max_commute_hours=np.inf,
+          modes=wage_engine.TRANSPORT_NAMES, allow_monthly_pass=True):
+    """Best (transport, wfh_days, use_monthly_pass) for every row of engine columns
+
+    min_office_days and the two yearly limits may be scalars or per-row
+    arrays. Returns a dict of arrays keyed by SOLUTION_COLUMNS; rows where no
+    choice meets the limits have feasible == False and NaN results.
+    """
+    count = len(np.atleast_1d(columns['paycheck']))
+    work_days = np.broadcast_to(np.asarray(columns['work_days'], dtype=np.float64), (count,))
+    min_office_days = np.clip(np.broadcast_to(min_office_days, (count,)), 0.0, work_days)
+    max_wfh = np.floor(work_days - min_office_days + _EPSILON)
+
+    best = {
+        'transport': np.zeros(count, dtype=np.int8),
+        'wfh_days': np.full(count, np.nan),
+        'use_monthly_pass': np.zeros(count, dtype=bool),
+        'true_wage': np.full(count, -np.inf),
+        'yearly_commute_costs': np.full(count, np.nan),
+        'yearly_commute_hours': np.full(count, np.nan),
+    }
+
+    for transport, use_monthly_pass in candidates(modes, allow_monthly_pass):
+        cost_intercept, cost_slope, hours_intercept, hours_slope = _linear_in_days(
+            columns, transport, use_monthly_pass)
+        min_wfh = np.maximum.reduce([
+            np.zeros(count),
+            _min_wfh_for_limit(work_days, cost_intercept, cost_slope, max_commute_cost),
+            _min_wfh_for_limit(work_days, hours_intercept, hours_slope, max_commute_hours),
+        ])
+        # never commuting costs nothing, whatever the pass price
+        fully_remote = work_days - max_wfh <= _EPSILON
+        feasible = (min_wfh <= max_wfh) | fully_remote
+        min_wfh = np.where(min_wfh <= max_wfh, min_wfh, max_wfh)
+
+        for wfh_days in (min_wfh, max_wfh):
+            scenario = dict(columns)
+            scenario.update(transport=transport, wfh_days=wfh_days, use_monthly_pass=use_monthly_pass)
+            results = wage_engine.calculate_batch(**scenario)
+            better = feasible & (results['true_wage'] > best['true_wage'])
+            best['transport'][better] = transport
+            best['wfh_days'][better] = wfh_days[better]
+            best['use_monthly_pass'][better] = use_monthly_pass
+            for name in ('true_wage', 'yearly_commute_costs', 'yearly_commute_hours'):
+                best[name][better] = results[name][better]
+
+    best['feasible'] = np.isfinite(best['true_wage'])
+    best['true_wage'][~best['feasible']] = np.nan
+    return best
+
+
+def format_solution(ids, solution):
+    """CSV rows for one chunk of solutions"""
+    columns = [
+        [wage_engine.TRANSPORT_NAMES[code] for code in solution['transport']],
+        solution['wfh_days'].tolist(),
+        solution['use_monthly_pass'].tolist(),
+        np.round(solution['true_wage'], 4).tolist(),
+        np.round(solution['yearly_commute_costs'], 4).tolist(),
+        np.round(solution['yearly_commute_hours'], 4).tolist(),
+        solution['feasible'].tolist(),
+    ]
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, lineterminator='\n')
+    rows = zip(*columns)
+    if ids is not None:
+        rows = ([row_id, *row] for row_id, row in zip(ids, rows))
+    writer.writerows(rows)
+    return buffer.getvalue()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Best commute mode and WFH days for every row of a roster")
+    parser.add_argument('input', help="roster as CSV or JSON lines (engine input columns), '-' for stdin")
+    parser.add_argument('--output', '-o', default='-', help="CSV file for the results (default: stdout)")
+    parser.add_argument('--min-office-days', type=float, default=0.0)
+    parser.add_argument('--max-commute-cost', type=float, default=np.inf, help="yearly, in dollars")
+    parser.add_argument('--max-commute-hours', type=float, default=np.inf, help="yearly")
+    parser.add_argument('--modes', default=','.join(wage_engine.TRANSPORT_NAMES),
+                        help="comma-separated transport types to consider")
+    parser.add_argument('--no-monthly-pass', action='store_true', help="only daily public transport fares")
+    parser.add_argument('--chunk-size', type=int, default=batch_io.DEFAULT_CHUNK_SIZE)
+    args = parser.parse_args(argv)
+
+    modes = [name.strip() for name in args.modes.split(',') if name.strip()]
+    unknown = [name for name in modes if name not in wage_engine.TRANSPORT_CODES]
+    if unknown:
+        parser.error(f"unknown transport types: {', '.join(unknown)}")
+
+    input_format = batch_io.detect_format(args.input)
+    source = batch_io.open_input(args.input)
+    sink = batch_io.open_output(args.output)
+    try:
+        wrote_header = False
+        infeasible = 0
+        for ids, columns in batch_io.iter_record_chunks(source, input_format, args.chunk_size):
+            solution = solve(columns, args.min_office_days, args.max_commute_cost,
+                             args.max_commute_hours, modes, not args.no_monthly_pass)
+            if not wrote_header:
+                names = ([batch_io.ID_COLUMN] if ids is not None else []) + list(SOLUTION_COLUMNS)
+                sink.write(','.join(names) + '\n')
+                wrote_header = True
+            sink.write(format_solution(ids, solution))
+            infeasible += int((~solution['feasible']).sum())
+    finally:
+        if source is not sys.stdin:
+            source.close()
+        if sink is not sys.stdout:
+            sink.close()
+    if infeasible:
+        print(f"{infeasible:,} row(s) have no option within the limits", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
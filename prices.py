@@ -0,0 +1,151 @@
+"""Fuel and electricity prices in effect on a date, from local price tables.
+
+A price table is a CSV of date, region and price, one row per price change
+(or per day, week...). A row with a blank region is the default series, used
+for regions with no series of their own and for dates before a region's
+first price:
+
+    date,region,price
+    2025-01-06,,3.12
+    2025-01-06,CA,4.51
+    2025-01-13,CA,4.58
+
+Each table is kept as one sorted array of region << 32 | day keys, so the
+price in effect for a whole batch of (date, region) rows is one
+np.searchsorted call: the last entry at or before each row's key, if it is
+in the row's region.
+
+    tables = PriceTables.load(gas='gas.csv', electricity='power.csv')
+    columns = tables.apply(columns, dates, regions)
+"""
+import csv
+
+import numpy as np
+
+# engine column each table fills
+PRICE_COLUMNS = ('gas_price', 'electricity_price')
+DEFAULT_REGION = ''
+
+# days are offset so dates before 1970 still give non-negative low bits
+_DAY_BITS = 32
+_DAY_OFFSET = 1 << (_DAY_BITS - 1)
+
+
+def normalize_regions(regions):
+    return np.char.upper(np.char.strip(np.asarray(regions, dtype=str)))
+
+
+def as_dates(values):
+    """datetime64[D] array from ISO date strings or dates; blanks become NaT"""
+    try:
+        return np.asarray(values, dtype='datetime64[D]')
+    except ValueError:
+        return np.array([value if str(value).strip() else 'NaT' for value in values], dtype='datetime64[D]')
+
+
+class PriceSeries:
+    """One price table: every region's prices sorted by (region, date)"""
+
+    def __init__(self, dates, regions, prices):
+        dates = as_dates(dates)
+        prices = np.asarray(prices, dtype=np.float64)
+        keep = ~np.isnat(dates) & ~np.isnan(prices)
+        self.regions, codes = np.unique(normalize_regions(regions)[keep], return_inverse=True)
+        keys = self._keys(codes.reshape(-1), dates[keep])
+        # stable sort, then keep the last row given for any (region, date)
+        order = np.argsort(keys, kind='stable')
+        keys, prices = keys[order], prices[keep][order]
+        last = np.append(keys[1:] != keys[:-1], True)
+        self.keys, self.prices = keys[last], prices[last]
+        self.default_code = int(np.searchsorted(self.regions, DEFAULT_REGION))
+        if self.default_code >= len(self.regions) or self.regions[self.default_code] != DEFAULT_REGION:
+            self.default_code = -1
+
+    def __len__(self):
+        return len(self.keys)
+
+    @staticmethod
+    def _keys(codes, dates):
+        return (np.asarray(codes, dtype=np.int64) << _DAY_BITS) + (dates.astype(np.int64) + _DAY_OFFSET)
+
+    @classmethod
+    def load(cls, path):
+        with open(path, newline='', encoding='utf-8') as handle:
+            rows = list(csv.DictReader(handle))
+        missing = [name for name in ('date', 'price') if rows and name not in rows[0]]
+        if missing:
+            raise ValueError(f"{path} has no {', '.join(missing)} column")
+        return cls([row['date'] for row in rows], [row.get('region') or DEFAULT_REGION for row in rows],
+                   [float(row['price']) if row['price'].strip() else np.nan for row in rows])
+
+    def region_codes(self, regions):
+        """Position of each region in self.regions, -1 for regions without a series"""
+        # distinct values first, so only those are normalized
+        names, inverse = np.unique(np.asarray(regions, dtype=str), return_inverse=True)
+        names = normalize_regions(names)
+        if not len(self.regions):
+            return np.full(len(inverse), -1, dtype=np.int64)
+        found = np.minimum(np.searchsorted(self.regions, names), len(self.regions) - 1)
+        codes = np.where(self.regions[found] == names, found, -1)
+        return codes[inverse.reshape(-1)]
+
+    def _as_of(self, codes, dates):
+        prices = np.full(len(codes), np.nan)
+        usable = (codes >= 0) & ~np.isnat(dates)
+        if not usable.any() or not len(self.keys):
+            return prices
+        keys = self._keys(codes[usable], dates[usable])
+        found = np.searchsorted(self.keys, keys, side='right') - 1
+        valid = found >= 0
+        valid[valid] = (self.keys[found[valid]] >> _DAY_BITS) == (keys[valid] >> _DAY_BITS)
+        prices[np.flatnonzero(usable)[valid]] = self.prices[found[valid]]
+        return prices
+
+    def lookup(self, dates, regions=None):
+        """Price in effect on each date in each region (the default series otherwise), NaN if none"""
+        dates = as_dates(dates).reshape(-1)
+        if regions is None:
+            return self.prices_for(np.full(len(dates), -1, dtype=np.int64), dates)
+        return self.prices_for(self.region_codes(regions), dates)
+
+    def prices_for(self, codes, dates):
+        """lookup() for region codes and datetime64[D] dates that are already worked out"""
+        prices = self._as_of(codes, dates)
+        missing = np.isnan(prices)
+        if self.default_code >= 0 and missing.any():
+            prices[missing] = self._as_of(np.full(int(missing.sum()), self.default_code, dtype=np.int64),
+                                          dates[missing])
+        return prices
+
+
+class PriceTables:
+    """Gas and electricity price tables (either may be None) for engine columns
+
+    Plain arrays only, so it pickles to bulk-mode worker processes.
+    """
+
+    def __init__(self, gas=None, electricity=None):
+        self.series = {name: series for name, series in zip(PRICE_COLUMNS, (gas, electricity))
+                       if series is not None}
+
+    @classmethod
+    def load(cls, gas=None, electricity=None):
+        return cls(PriceSeries.load(gas) if gas else None,
+                   PriceSeries.load(electricity) if electricity else None)
+
+    def lookup(self, dates, regions=None):
+        """{price column: prices, NaN where no table price applies}"""
+        dates = as_dates(dates).reshape(-1)
+        if regions is None:
+            return {name: series.lookup(dates) for name, series in self.series.items()}
+        # dates and regions are parsed once for all tables
+        names, inverse = np.unique(np.asarray(regions, dtype=str), return_inverse=True)
+        return {name: series.prices_for(series.region_codes(names)[inverse.reshape(-1)], dates)
+                for name, series in self.series.items()}
+
+    def apply(self, columns, dates, regions=None):
+        """Engine columns with gas/electricity prices replaced wherever a table has a price"""
+        columns = dict(columns)
+        for name, prices in self.lookup(dates, regions).items():
+            columns[name] = np.where(np.isnan(prices), columns[name], prices)
+        return columns
@@ -0,0 +1,130 @@
+"""Rank many commute scenarios by true hourly wage.
+
+All scenarios go through the engine in one batched call and are ordered
+with a single argsort, so 500 relocation offers cost about the same as one:
+
+    order, results = rank_scenarios(offers, base={'paycheck': 2400})
+    best = offers[order[0]]
+
+Scenarios are model.Scenario objects or dicts of engine inputs; anything a scenario leaves out comes
+from base, then wage_engine.DEFAULT_SCENARIO. 'transport_type' (the GUI's
+name) is accepted as well as 'transport'.
+
+    python ranking.py offers.csv --top 20
+"""
+import argparse
+import csv
+import json
+
+import numpy as np
+
+import wage_engine
+from batch_io import TRUE_STRINGS
+
+
+def _as_bool(value):
+    return value is True or str(value).strip().lower() in TRUE_STRINGS
+
+
+def _names(values, names):
+    # numeric codes (the DEFAULT_SCENARIO style) next to names from a file
+    return [names[int(v)] if isinstance(v, (int, float, np.number)) and not isinstance(v, bool) else v
+            for v in values]
+
+
+def scenario_columns(scenarios, base=None):
+    """Engine keyword arguments with one row per scenario"""
+    defaults = dict(wage_engine.DEFAULT_SCENARIO)
+    defaults.update(base or {})
+    if 'transport_type' in defaults:
+        defaults['transport'] = defaults.pop('transport_type')
+
+    # one pass over the scenarios per field, no merged per-row dicts
+    scenarios = [scenario if isinstance(scenario, dict) else scenario.to_dict()  # model.Scenario
+                 for scenario in scenarios]
+    count = len(scenarios)
+    columns = {}
+    for name in wage_engine.DEFAULT_SCENARIO:
+        default = defaults[name]
+        if name == 'transport':
+            values = [scenario['transport_type'] if 'transport_type' in scenario
+                      else scenario.get(name, default) for scenario in scenarios]
+            columns[name] = wage_engine.encode_transport(_names(values, wage_engine.TRANSPORT_NAMES))
+        elif name == 'pay_frequency':
+            values = [scenario.get(name, default) for scenario in scenarios]
+            columns[name] = wage_engine.encode_pay_frequency(_names(values, wage_engine.PAY_FREQUENCY_NAMES))
+        elif name == 'use_monthly_pass':
+            columns[name] = np.fromiter((_as_bool(scenario.get(name, default)) for scenario in scenarios),
+                                        bool, count)
+        else:
+            columns[name] = np.fromiter((scenario.get(name, default) for scenario in scenarios),
+                                        np.float64, count)
+    return columns
+
+
+def rank_columns(columns, by='true_wage', descending=True):
+    """(order, results) for engine columns; results stay in input order"""
+    results = wage_engine.calculate_batch(**columns)
+    count = len(np.atleast_1d(columns['paycheck']))
+    values = np.broadcast_to(results[by], (count,))
+    # stable, so ties keep input order
+    order = np.argsort(-values if descending else values, kind='stable')
+    results = {name: np.broadcast_to(results[name], (count,)) for name in wage_engine.RESULT_COLUMNS}
+    return order, results
+
+
+def rank_scenarios(scenarios, base=None, by='true_wage', descending=True):
+    """(order, results) for a list of scenario dicts
+
+    order[0] is the index of the best scenario; results maps each
+    wage_engine.RESULT_COLUMNS name to an array in input order.
+    """
+    if not scenarios:
+        return np.zeros(0, dtype=np.intp), {name: np.zeros(0) for name in wage_engine.RESULT_COLUMNS}
+    return rank_columns(scenario_columns(scenarios, base), by, descending)
+
+
+def read_scenarios(path):
+    """Scenario dicts from a CSV or JSON-lines file; blank cells are left out"""
+    with open(path, 'r', newline='', encoding='utf-8') as handle:
+        if path.lower().endswith(('.jsonl', '.ndjson', '.json')):
+            records = [json.loads(line) for line in handle if line.strip()]
+        else:
+            records = list(csv.DictReader(handle))
+    return [{name: value for name, value in record.items()
+             if name is not None and value is not None and str(value).strip() != ''}
+            for record in records]
+
+
+def scenario_label(scenario, index):
+    return str(scenario.get('name', scenario.get('id', f"#{index + 1}")))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Rank commute scenarios by true hourly wage")
+    parser.add_argument('input', help="CSV or JSON-lines file, one scenario per row")
+    parser.add_argument('--base', help="JSON file with inputs shared by every scenario")
+    parser.add_argument('--by', default='true_wage', choices=wage_engine.RESULT_COLUMNS)
+    parser.add_argument('--ascending', action='store_true', help="smallest value first")
+    parser.add_argument('--top', type=int, default=None, help="only print the first N")
+    args = parser.parse_args(argv)
+
+    base = {}
+    if args.base:
+        with open(args.base, encoding='utf-8') as handle:
+            base = json.load(handle)
+    scenarios = read_scenarios(args.input)
+    order, results = rank_scenarios(scenarios, base, args.by, not args.ascending)
+
+    print(f"{'Rank':>4}  {'Scenario':<20} {'True wage':>10} {'Commute hrs':>12} "
+          f"{'Commute cost':>13} {'Net income':>12}")
+    for rank, index in enumerate(order[:args.top], start=1):
+        true_wage = f"${results['true_wage'][index]:.2f}"
+        commute_cost = f"${results['yearly_commute_costs'][index]:,.2f}"
+        net_income = f"${results['net_yearly_income'][index]:,.2f}"
+        print(f"{rank:>4}  {scenario_label(scenarios[index], index):<20.20} {true_wage:>10} "
+              f"{results['yearly_commute_hours'][index]:>12.0f} {commute_cost:>13} {net_income:>12}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+"""Fixed-width binary commute records.
+
+A record file is just a flat array of SCENARIO_DTYPE records with no
+header, so it can be memory-mapped and handed to the wage engine a slice at
+a time. The engine gets views of the record fields, nothing is copied or
+parsed.
+"""
+import os
+
+import numpy as np
+
+import wage_engine
+
+# the inputs the GUI keeps as tk.DoubleVars, plus the codes the engine needs
+SCENARIO_DTYPE = np.dtype([
+    ('id', '<u8'),
+    ('paycheck', '<f8'),
+    ('daily_hours', '<f8'),
+    ('work_days', '<f8'),
+    ('wfh_days', '<f8'),
+    ('commute_minutes', '<f8'),
+    ('daily_miles', '<f8'),
+    ('mpg', '<f8'),
+    ('gas_price', '<f8'),
+    ('ev_efficiency', '<f8'),
+    ('electricity_price', '<f8'),
+    ('public_daily_cost', '<f8'),
+    ('public_monthly_cost', '<f8'),
+    ('public_walking_minutes', '<f8'),
+    ('daily_costs', '<f8'),
+    ('pay_frequency', 'u1'),
+    ('transport', 'u1'),
+    ('use_monthly_pass', '?'),
+    ('_pad', 'V5'),
+])
+
+# one float per wage_engine.RESULT_COLUMNS name
+RESULT_DTYPE = np.dtype([(name, '<f8') for name in wage_engine.RESULT_COLUMNS])
+
+ENGINE_FIELDS = tuple(name for name in SCENARIO_DTYPE.names if name not in ('id', '_pad'))
+
+
+def is_record_file(path):
+    return bool(path) and path.lower().endswith(('.rec', '.bin'))
+
+
+def open_records(path, mode='r'):
+    """Memory-map a record file (read-only by default)"""
+    if os.path.getsize(path) == 0:
+        return np.zeros(0, dtype=SCENARIO_DTYPE)
+    return np.memmap(path, dtype=SCENARIO_DTYPE, mode=mode)
+
+
+def record_count(path):
+    size = os.path.getsize(path)
+    if size % SCENARIO_DTYPE.itemsize:
+        raise ValueError(f"{path} is not a whole number of {SCENARIO_DTYPE.itemsize}-byte records")
+    return size // SCENARIO_DTYPE.itemsize
+
+
+def engine_columns(records):
+    """Engine keyword arguments as views into a record array (no copy)"""
+    return {name: records[name] for name in ENGINE_FIELDS}
+
+
+def score_records(records):
+    return wage_engine.calculate_batch(**engine_columns(records))
+
+
+def iter_record_slices(path, chunk_size=1_000_000):
+    """Yield consecutive slices of a memory-mapped record file"""
+    records = open_records(path)
+    for start in range(0, len(records), chunk_size):
+        yield records[start:start + chunk_size]
+
+
+def records_from_columns(columns, ids=None):
+    """Pack engine-style columns (names or codes) into a record array"""
+    count = len(next(iter(columns.values())))
+    records = np.zeros(count, dtype=SCENARIO_DTYPE)
+    records['id'] = np.arange(count) if ids is None else ids
+    records['pay_frequency'] = wage_engine.BIWEEKLY
+    for name in ENGINE_FIELDS:
+        if name not in columns:
+            continue
+        values = columns[name]
+        if name == 'transport':
+            values = wage_engine.encode_transport(values)
+        elif name == 'pay_frequency':
+            values = wage_engine.encode_pay_frequency(values)
+        records[name] = values
+    return records
+
+
+def append_records(path, records):
+    """Append records to a record file, creating it if needed"""
+    with open(path, 'ab') as handle:
+        np.ascontiguousarray(records, dtype=SCENARIO_DTYPE).tofile(handle)
@@ -0,0 +1,526 @@
+"""Road-network commute distances and times from home and office coordinates.
+
+Fills daily_miles and commute_minutes (one way, home to office) for a whole
+roster from a local road graph instead of typing them in. The graph is an
+OpenStreetMap XML extract (.osm, e.g. from openstreetmap.org's export or
+`osmium cat extract.pbf -o extract.osm`) or a pair of CSV files:
+
+    nodes.csv   id,lat,lon
+    edges.csv   from,to,length_m[,speed_kph][,oneway]
+
+It is parsed once into compact arrays (CSR adjacency with minutes and miles
+per edge) and saved next to the source as <graph>.graph.npz, so later runs
+skip the parsing. Homes and offices are snapped to the nearest graph node,
+then each office gets one shortest-path search over the reversed graph,
+which gives the fastest time from every node to that office. Thousands of
+homes x dozens of offices is therefore a few dozen searches plus a gather,
+not one search per pair. scipy.sparse.csgraph runs the searches when it is
+installed; otherwise a heapq Dijkstra that stops as soon as every home is
+reached does, spread over --workers processes. Finished matrices are cached
+in --cache-dir, keyed by the graph and the snapped nodes.
+
+    python roadnet.py --graph city.osm --homes roster.csv --offices offices.csv -o routed.csv
+    python roadnet.py --graph edges.csv --nodes nodes.csv --homes roster.csv --offices offices.csv \\
+        --matrix travel.npz
+"""
+import argparse
+import csv
+import hashlib
+import heapq
+import math
+import os
+import sys
+import xml.etree.ElementTree as ElementTree
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from batch_io import TRUE_STRINGS
+
+try:
+    from scipy.sparse import csr_matrix
+    from scipy.sparse.csgraph import dijkstra
+except ImportError:  # optional
+    csr_matrix = None
+    dijkstra = None
+
+METERS_PER_MILE = 1609.344
+EARTH_RADIUS_M = 6371008.8
+
+# car speeds for OSM highway types without a maxspeed tag
+DEFAULT_SPEEDS_KPH = {
+    'motorway': 100, 'motorway_link': 60,
+    'trunk': 80, 'trunk_link': 50,
+    'primary': 65, 'primary_link': 45,
+    'secondary': 55, 'secondary_link': 40,
+    'tertiary': 45, 'tertiary_link': 35,
+    'unclassified': 40, 'road': 40,
+    'residential': 30, 'living_street': 10, 'service': 20,
+}
+DEFAULT_CSV_SPEED_KPH = 50.0
+# walking/biking minutes come from the road distance at these speeds
+MODE_SPEEDS_KPH = {'biking': 15.0, 'walking': 5.0}
+# straight-line leg between a coordinate and its nearest node
+ACCESS_SPEED_KPH = 20.0
+
+DEFAULT_CACHE_DIR = '.roadnet_cache'
+_GRAPH_ARRAYS = ('node_ids', 'lat', 'lon', 'indptr', 'indices', 'minutes', 'miles')
+
+
+def haversine_m(lat1, lon1, lat2, lon2):
+    lat1, lon1, lat2, lon2 = (np.radians(np.asarray(v, dtype=np.float64)) for v in (lat1, lon1, lat2, lon2))
+    a = np.sin((lat2 - lat1) / 2) ** 2 + np.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2) ** 2
+    return 2 * EARTH_RADIUS_M * np.arcsin(np.sqrt(np.minimum(a, 1.0)))
+
+
+def parse_maxspeed(text):
+    """OSM maxspeed tag in km/h ('50', '30 mph'), None if it is not a number"""
+    text = (text or '').strip().lower()
+    factor = 1.609344 if text.endswith('mph') else 1.0
+    try:
+        return float(text.replace('mph', '').replace('km/h', '').strip()) * factor
+    except ValueError:
+        return None
+
+
+class RoadGraph:
+    """Directed road graph as CSR arrays, with minutes and miles per edge"""
+
+    def __init__(self, node_ids, lat, lon, indptr, indices, minutes, miles, fingerprint=''):
+        self.node_ids = node_ids
+        self.lat = lat
+        self.lon = lon
+        self.indptr = indptr
+        self.indices = indices
+        self.minutes = minutes
+        self.miles = miles
+        self.fingerprint = fingerprint
+        self._grid = None
+
+    def __len__(self):
+        return len(self.node_ids)
+
+    @property
+    def edge_count(self):
+        return len(self.indices)
+
+    @classmethod
+    def from_edges(cls, node_ids, lat, lon, sources, targets, length_m, speed_kph, two_way=None,
+                   fingerprint=''):
+        """Build from edge lists (node positions, not ids); parallel edges keep the fastest
+
+        Edges where two_way is True are added in both directions.
+        """
+        if two_way is not None:
+            sources, targets = (np.concatenate([sources, targets[two_way]]),
+                                np.concatenate([targets, sources[two_way]]))
+            length_m = np.concatenate([length_m, length_m[two_way]])
+            speed_kph = np.concatenate([speed_kph, speed_kph[two_way]])
+        minutes = length_m / 1000.0 / speed_kph * 60.0
+        order = np.lexsort((minutes, targets, sources))
+        sources, targets, minutes, length_m = sources[order], targets[order], minutes[order], length_m[order]
+        first = np.ones(len(sources), dtype=bool)
+        first[1:] = (sources[1:] != sources[:-1]) | (targets[1:] != targets[:-1])
+        first &= sources != targets
+        sources, targets, minutes, length_m = sources[first], targets[first], minutes[first], length_m[first]
+        indptr = np.zeros(len(node_ids) + 1, dtype=np.int64)
+        np.cumsum(np.bincount(sources, minlength=len(node_ids)), out=indptr[1:])
+        return cls(np.asarray(node_ids, dtype=np.int64), lat, lon, indptr, targets.astype(np.int64),
+                   minutes, length_m / METERS_PER_MILE, fingerprint)
+
+    @classmethod
+    def from_csv(cls, nodes_path, edges_path, fingerprint=''):
+        with open(nodes_path, newline='', encoding='utf-8') as handle:
+            rows = list(csv.DictReader(handle))
+        node_ids = np.array([int(row['id']) for row in rows], dtype=np.int64)
+        lat = np.array([float(row['lat']) for row in rows])
+        lon = np.array([float(row['lon']) for row in rows])
+        order = np.argsort(node_ids)
+        node_ids, lat, lon = node_ids[order], lat[order], lon[order]
+
+        with open(edges_path, newline='', encoding='utf-8') as handle:
+            rows = list(csv.DictReader(handle))
+        sources = np.searchsorted(node_ids, np.array([int(row['from']) for row in rows], dtype=np.int64))
+        targets = np.searchsorted(node_ids, np.array([int(row['to']) for row in rows], dtype=np.int64))
+        length_m = np.array([float(row['length_m']) for row in rows])
+        speed = np.array([float(row.get('speed_kph') or DEFAULT_CSV_SPEED_KPH) for row in rows])
+        two_way = np.array([str(row.get('oneway') or '').strip().lower() not in TRUE_STRINGS for row in rows],
+                           dtype=bool)
+        return cls.from_edges(node_ids, lat, lon, sources, targets, length_m, speed, two_way, fingerprint)
+
+    @classmethod
+    def from_osm(cls, path, speeds=DEFAULT_SPEEDS_KPH, fingerprint=''):
+        """Car network from an OSM XML extract: ways with a routable highway tag"""
+        coords = {}
+        sources, targets, speed_values, oneway_values = [], [], [], []
+        for _, element in ElementTree.iterparse(path, events=('end',)):
+            if element.tag == 'node':
+                coords[int(element.get('id'))] = (float(element.get('lat')), float(element.get('lon')))
+            elif element.tag == 'way':
+                tags = {tag.get('k'): tag.get('v') for tag in element.iter('tag')}
+                highway = tags.get('highway')
+                refs = [int(nd.get('ref')) for nd in element.iter('nd')]
+                if highway in speeds and len(refs) > 1:
+                    speed = parse_maxspeed(tags.get('maxspeed')) or speeds[highway]
+                    oneway = tags.get('oneway', '').lower()
+                    if oneway == '-1':
+                        refs.reverse()
+                    one_way = (oneway in ('yes', 'true', '1', '-1') or tags.get('junction') == 'roundabout'
+                               or highway == 'motorway')
+                    sources.extend(refs[:-1])
+                    targets.extend(refs[1:])
+                    speed_values.extend([speed] * (len(refs) - 1))
+                    oneway_values.extend([one_way] * (len(refs) - 1))
+            else:
+                continue
+            element.clear()
+
+        sources = np.array(sources, dtype=np.int64)
+        targets = np.array(targets, dtype=np.int64)
+        known = np.array([ref in coords for ref in sources.tolist()], dtype=bool)
+        known &= np.array([ref in coords for ref in targets.tolist()], dtype=bool)
+        sources, targets = sources[known], targets[known]
+        speed = np.array(speed_values, dtype=np.float64)[known]
+        two_way = ~np.array(oneway_values, dtype=bool)[known]
+
+        node_ids = np.unique(np.concatenate([sources, targets]))
+        lat = np.array([coords[ref][0] for ref in node_ids.tolist()])
+        lon = np.array([coords[ref][1] for ref in node_ids.tolist()])
+        sources = np.searchsorted(node_ids, sources)
+        targets = np.searchsorted(node_ids, targets)
+        length_m = haversine_m(lat[sources], lon[sources], lat[targets], lon[targets])
+        return cls.from_edges(node_ids, lat, lon, sources, targets, length_m, speed, two_way, fingerprint)
+
+    @classmethod
+    def load(cls, graph_path, nodes_path=None):
+        """Graph from an .osm file or an edges CSV (with nodes_path), via the .graph.npz cache"""
+        sources = [graph_path] + ([nodes_path] if nodes_path else [])
+        fingerprint = '|'.join(f"{os.path.abspath(path)}:{os.stat(path).st_size}:{os.stat(path).st_mtime_ns}"
+                               for path in sources)
+        cache_path = f"{graph_path}.graph.npz"
+        if os.path.exists(cache_path):
+            with np.load(cache_path, allow_pickle=False) as data:
+                if str(data['fingerprint']) == fingerprint:
+                    return cls(*(data[name] for name in _GRAPH_ARRAYS), fingerprint=fingerprint)
+
+        if nodes_path:
+            graph = cls.from_csv(nodes_path, graph_path, fingerprint)
+        else:
+            graph = cls.from_osm(graph_path, fingerprint=fingerprint)
+        graph.save(cache_path)
+        return graph
+
+    def save(self, path):
+        tmp_path = f"{path}.tmp.npz"
+        np.savez(tmp_path, fingerprint=np.array(self.fingerprint),
+                 **{name: getattr(self, name) for name in _GRAPH_ARRAYS})
+        os.replace(tmp_path, path)
+
+    def reversed(self):
+        """(indptr, indices, minutes, miles) of the graph with every edge turned around"""
+        sources = np.repeat(np.arange(len(self), dtype=np.int64), np.diff(self.indptr))
+        order = np.argsort(self.indices, kind='stable')
+        indptr = np.zeros(len(self) + 1, dtype=np.int64)
+        np.cumsum(np.bincount(self.indices, minlength=len(self)), out=indptr[1:])
+        return indptr, sources[order], self.minutes[order], self.miles[order]
+
+    def _projected(self, lat, lon):
+        # equirectangular metres around the graph's middle latitude
+        scale = math.cos(math.radians(float(np.median(self.lat))))
+        return (np.radians(np.asarray(lon, dtype=np.float64)) * EARTH_RADIUS_M * scale,
+                np.radians(np.asarray(lat, dtype=np.float64)) * EARTH_RADIUS_M)
+
+    def _build_grid(self):
+        x, y = self._projected(self.lat, self.lon)
+        area = max((x.max() - x.min()) * (y.max() - y.min()), 1.0)
+        # about four nodes per cell
+        size = max(math.sqrt(area * 4 / len(self)), 1.0)
+        cx = np.floor((x - x.min()) / size).astype(np.int64)
+        cy = np.floor((y - y.min()) / size).astype(np.int64)
+        keys = cx * (1 << 32) + cy
+        order = np.argsort(keys, kind='stable')
+        cells, starts = np.unique(keys[order], return_index=True)
+        ends = np.append(starts[1:], len(order))
+        self._grid = (size, x.min(), y.min(), x, y, order, cells, starts, ends, cx.max(), cy.max())
+
+    def nearest_nodes(self, lat, lon):
+        """(node positions, straight-line metres) of the node nearest to each coordinate"""
+        if self._grid is None:
+            self._build_grid()
+        size, x0, y0, x, y, order, cells, starts, ends, max_cx, max_cy = self._grid
+        qx, qy = self._projected(np.atleast_1d(lat), np.atleast_1d(lon))
+        nodes = np.zeros(len(qx), dtype=np.int64)
+        distances = np.zeros(len(qx))
+        for position, (px, py) in enumerate(zip(qx.tolist(), qy.tolist())):
+            cx = math.floor((px - x0) / size)
+            cy = math.floor((py - y0) / size)
+            radius = 0
+            while True:
+                # every node outside this block is at least radius cells away
+                xs = np.arange(max(cx - radius, 0), min(cx + radius, max_cx) + 1)
+                ys = np.arange(max(cy - radius, 0), min(cy + radius, max_cy) + 1)
+                keys = (xs[:, None] * (1 << 32) + ys[None, :]).ravel()
+                found = np.searchsorted(cells, keys)
+                found = found[(found < len(cells)) & (cells[np.minimum(found, len(cells) - 1)] == keys)]
+                if len(found):
+                    candidates = order[np.concatenate([np.arange(starts[i], ends[i]) for i in found])]
+                    squared = (x[candidates] - px) ** 2 + (y[candidates] - py) ** 2
+                    best = int(np.argmin(squared))
+                    covers_grid = (cx - radius <= 0 and cy - radius <= 0
+                                   and cx + radius >= max_cx and cy + radius >= max_cy)
+                    if math.sqrt(squared[best]) <= radius * size or covers_grid:
+                        nodes[position] = candidates[best]
+                        distances[position] = math.sqrt(squared[best])
+                        break
+                radius += 1
+        return nodes, distances
+
+
+def _tree_miles(predecessors, node_miles):
+    # miles along each node's path to the root of a shortest-path tree, by pointer jumping
+    parent = np.where(predecessors < 0, np.arange(len(predecessors)), predecessors)
+    total = np.where(predecessors < 0, 0.0, node_miles)
+    while True:
+        grand = parent[parent]
+        if np.array_equal(grand, parent):
+            return total
+        total = total + total[parent]
+        parent = grand
+
+
+def _scipy_to_targets(graph, targets):
+    indptr, indices, minutes, miles = graph.reversed()
+    matrix = csr_matrix((minutes, indices, indptr), shape=(len(graph), len(graph)))
+    times, predecessors = dijkstra(matrix, directed=True, indices=targets, return_predecessors=True)
+
+    # miles of the original edge node -> next node towards the target, looked up by edge key
+    sources = np.repeat(np.arange(len(graph), dtype=np.int64), np.diff(graph.indptr))
+    edge_keys = sources * len(graph) + graph.indices
+    order = np.argsort(edge_keys)
+    edge_keys, edge_miles = edge_keys[order], graph.miles[order]
+    distances = np.empty_like(times)
+    for row, tree in enumerate(predecessors):
+        reached = tree >= 0
+        node_miles = np.zeros(len(graph))
+        keys = np.flatnonzero(reached) * len(graph) + tree[reached]
+        node_miles[reached] = edge_miles[np.searchsorted(edge_keys, keys)]
+        distances[row] = _tree_miles(tree, node_miles)
+    distances[~np.isfinite(times)] = np.inf
+    return times, distances
+
+
+_worker_graph = None
+
+
+def _init_worker(indptr, indices, minutes, miles):
+    global _worker_graph
+    _worker_graph = (indptr.tolist(), indices.tolist(), minutes.tolist(), miles.tolist())
+
+
+def _dijkstra_to(target, stops):
+    """(minutes, miles) from each stop node to target, via the reversed graph in _worker_graph"""
+    indptr, indices, minutes, miles = _worker_graph
+    best = [math.inf] * (len(indptr) - 1)
+    distance = [math.inf] * (len(indptr) - 1)
+    done = bytearray(len(indptr) - 1)
+    remaining = len(set(stops))
+    wanted = bytearray(len(indptr) - 1)
+    for node in stops:
+        wanted[node] = 1
+    best[target] = distance[target] = 0.0
+    heap = [(0.0, target)]
+    pop, push = heapq.heappop, heapq.heappush
+    while heap and remaining:
+        time, node = pop(heap)
+        if done[node]:
+            continue
+        done[node] = 1
+        if wanted[node]:
+            remaining -= 1
+        dist = distance[node]
+        for edge in range(indptr[node], indptr[node + 1]):
+            other = indices[edge]
+            candidate = time + minutes[edge]
+            if candidate < best[other]:
+                best[other] = candidate
+                distance[other] = dist + miles[edge]
+                push(heap, (candidate, other))
+    return ([best[node] if done[node] else math.inf for node in stops],
+            [distance[node] if done[node] else math.inf for node in stops])
+
+
+def _python_to_targets(graph, targets, stops, workers=1):
+    reverse = graph.reversed()
+    stops = stops.tolist()
+    if workers <= 1:
+        _init_worker(*reverse)
+        columns = [_dijkstra_to(target, stops) for target in targets.tolist()]
+    else:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=reverse) as executor:
+            columns = list(executor.map(_dijkstra_to, targets.tolist(), [stops] * len(targets)))
+    times = np.array([column[0] for column in columns]).reshape(len(targets), len(stops))
+    distances = np.array([column[1] for column in columns]).reshape(len(targets), len(stops))
+    return times, distances
+
+
+def node_matrix(graph, origins, targets, workers=1):
+    """(minutes, miles) arrays of shape (origins, targets) between graph node positions"""
+    origins = np.asarray(origins, dtype=np.int64)
+    targets = np.asarray(targets, dtype=np.int64)
+    if not len(origins) or not len(targets):
+        return np.zeros((len(origins), len(targets))), np.zeros((len(origins), len(targets)))
+    if dijkstra is not None:
+        times, distances = _scipy_to_targets(graph, targets)
+        return times[:, origins].T, distances[:, origins].T
+    unique, inverse = np.unique(origins, return_inverse=True)
+    times, distances = _python_to_targets(graph, targets, unique, workers)
+    return times.T[inverse], distances.T[inverse]
+
+
+def travel_matrix(graph, origin_lat, origin_lon, target_lat, target_lon, cache_dir=DEFAULT_CACHE_DIR,
+                  workers=1):
+    """One-way (minutes, miles) from each origin coordinate to each target, shape (origins, targets)
+
+    Unreachable pairs are NaN. Includes the straight-line legs to and from
+    the nearest nodes at ACCESS_SPEED_KPH.
+    """
+    origins, origin_gap = graph.nearest_nodes(origin_lat, origin_lon)
+    targets, target_gap = graph.nearest_nodes(target_lat, target_lon)
+    unique, inverse = np.unique(origins, return_inverse=True)
+
+    cache_path = None
+    if cache_dir:
+        digest = hashlib.sha1(graph.fingerprint.encode('utf-8'))
+        digest.update(unique.tobytes())
+        digest.update(targets.tobytes())
+        cache_path = os.path.join(cache_dir, f"travel-{digest.hexdigest()}.npz")
+    if cache_path and os.path.exists(cache_path):
+        with np.load(cache_path, allow_pickle=False) as data:
+            times, distances = data['minutes'], data['miles']
+    else:
+        times, distances = node_matrix(graph, unique, targets, workers)
+        if cache_path:
+            os.makedirs(cache_dir, exist_ok=True)
+            tmp_path = f"{cache_path}.tmp.npz"
+            np.savez(tmp_path, minutes=times, miles=distances)
+            os.replace(tmp_path, cache_path)
+
+    gap = origin_gap[:, None] + target_gap[None, :]
+    minutes = times[inverse] + gap / 1000.0 / ACCESS_SPEED_KPH * 60.0
+    miles = distances[inverse] + gap / METERS_PER_MILE
+    unreachable = ~np.isfinite(minutes)
+    minutes[unreachable] = np.nan
+    miles[unreachable] = np.nan
+    return minutes, miles
+
+
+def mode_minutes(transport, minutes, miles):
+    """Driving minutes, except walking/biking rows which use the road distance at MODE_SPEEDS_KPH"""
+    minutes = np.array(minutes, dtype=np.float64)
+    for mode, speed in MODE_SPEEDS_KPH.items():
+        rows = np.asarray(transport) == mode
+        minutes[rows] = np.asarray(miles)[rows] * METERS_PER_MILE / 1000.0 / speed * 60.0
+    return minutes
+
+
+def read_points(path, lat_column, lon_column):
+    """(rows as dicts, lat array, lon array) from a CSV file"""
+    with open(path, newline='', encoding='utf-8') as handle:
+        rows = list(csv.DictReader(handle))
+    missing = [name for name in (lat_column, lon_column) if rows and name not in rows[0]]
+    if missing:
+        raise ValueError(f"{path} has no {', '.join(missing)} column")
+    return (rows, np.array([float(row[lat_column]) for row in rows]),
+            np.array([float(row[lon_column]) for row in rows]))
+
+
+def office_label(row, index):
+    return str(row.get('id') or row.get('name') or index)
+
+
+def office_columns(homes, labels):
+    """Each home's office (its 'office' column, or the only office) as a position in labels"""
+    if homes and 'office' in homes[0]:
+        column_of = {label: column for column, label in enumerate(labels)}
+        unknown = sorted({row['office'] for row in homes} - set(column_of))
+        if unknown:
+            raise ValueError(f"offices not in the offices file: {', '.join(unknown)}")
+        return np.array([column_of[row['office']] for row in homes], dtype=np.intp)
+    if len(labels) == 1:
+        return np.zeros(len(homes), dtype=np.intp)
+    raise ValueError("the roster has no 'office' column and there is more than one office")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Fill commute miles and minutes from a road graph")
+    parser.add_argument('--graph', required=True, help="OSM XML extract (.osm) or edges CSV")
+    parser.add_argument('--nodes', help="nodes CSV (id,lat,lon) when --graph is an edges CSV")
+    parser.add_argument('--homes', required=True, help="roster CSV with home_lat and home_lon columns")
+    parser.add_argument('--offices', required=True, help="CSV of offices with id, lat and lon")
+    parser.add_argument('--output', '-o', default='-',
+                        help="roster with daily_miles and commute_minutes filled in for each row's office "
+                             "(its 'office' column, or the only office)")
+    parser.add_argument('--matrix', help="also save the full homes x offices matrix (.npz or .csv)")
+    parser.add_argument('--cache-dir', default=DEFAULT_CACHE_DIR, help="where computed matrices are kept, "
+                                                                       "'' for none")
+    parser.add_argument('--workers', '-w', type=int, default=1,
+                        help="processes for the searches when scipy is not installed")
+    args = parser.parse_args(argv)
+
+    graph = RoadGraph.load(args.graph, args.nodes)
+    homes, home_lat, home_lon = read_points(args.homes, 'home_lat', 'home_lon')
+    offices, office_lat, office_lon = read_points(args.offices, 'lat', 'lon')
+    minutes, miles = travel_matrix(graph, home_lat, home_lon, office_lat, office_lon,
+                                   args.cache_dir, args.workers)
+    labels = [office_label(row, index) for index, row in enumerate(offices)]
+
+    if args.matrix:
+        home_ids = [str(row.get('id', index)) for index, row in enumerate(homes)]
+        if args.matrix.lower().endswith('.csv'):
+            with open(args.matrix, 'w', newline='', encoding='utf-8') as handle:
+                writer = csv.writer(handle, lineterminator='\n')
+                writer.writerow(['id', 'office', 'commute_minutes', 'daily_miles'])
+                for row, home_id in enumerate(home_ids):
+                    writer.writerows((home_id, label, round(float(minutes[row, column]), 2),
+                                      round(float(miles[row, column]), 3))
+                                     for column, label in enumerate(labels))
+        else:
+            np.savez(args.matrix, home_ids=np.array(home_ids), office_ids=np.array(labels),
+                     commute_minutes=minutes, daily_miles=miles)
+
+    try:
+        columns = office_columns(homes, labels)
+    except ValueError as e:
+        if args.matrix and not (homes and 'office' in homes[0]):
+            return
+        parser.error(str(e))
+
+    rows = np.arange(len(homes))
+    chosen_miles = miles[rows, columns]
+    transport = [row.get('transport', 'car').strip().lower() for row in homes]
+    chosen_minutes = mode_minutes(transport, minutes[rows, columns], chosen_miles)
+
+    names = list(homes[0]) if homes else []
+    names += [name for name in ('daily_miles', 'commute_minutes') if name not in names]
+    sink = sys.stdout if args.output == '-' else open(args.output, 'w', newline='', encoding='utf-8')
+    unreachable = 0
+    try:
+        writer = csv.DictWriter(sink, names, lineterminator='\n')
+        writer.writeheader()
+        for row, row_miles, row_minutes in zip(homes, chosen_miles.tolist(), chosen_minutes.tolist()):
+            if math.isnan(row_miles):
+                unreachable += 1
+            else:
+                row['daily_miles'] = round(row_miles, 2)
+                row['commute_minutes'] = round(row_minutes, 1)
+            writer.writerow(row)
+    finally:
+        if sink is not sys.stdout:
+            sink.close()
+    if unreachable:
+        print(f"{unreachable:,} home(s) have no road route to their office; left as they were",
+              file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
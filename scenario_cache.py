@@ -0,0 +1,137 @@
+"""Bounded LRU cache of calculation results keyed by scenario.
+
+Scenarios are model.Scenario objects or plain dicts of calculator inputs.
+Before hashing they are normalized: values are rounded, and inputs that
+cannot affect the result for the chosen transport type (MPG when taking the
+train, say) are dropped, so equivalent scenarios share one entry.
+
+Values are model.Result objects. With a path, the cache is read from that
+JSON file when created and written back by save(), so results carry over
+between sessions.
+"""
+import hashlib
+import json
+import os
+from collections import OrderedDict
+
+from model import Result
+
+# inputs that matter no matter how you commute
+SCHEDULE_FIELDS = ('pay_frequency', 'paycheck', 'daily_hours', 'work_days', 'wfh_days')
+
+TRANSPORT_FIELDS = {
+    'car': ('commute_minutes', 'daily_miles', 'gas_price', 'mpg', 'daily_costs'),
+    'ev': ('commute_minutes', 'daily_miles', 'ev_efficiency', 'electricity_price', 'daily_costs'),
+    'public': ('commute_minutes', 'public_walking_minutes', 'use_monthly_pass', 'daily_costs'),
+    'biking': ('commute_minutes', 'daily_miles', 'daily_costs'),
+    'walking': ('commute_minutes', 'daily_miles', 'daily_costs'),
+}
+
+DEFAULT_MAXSIZE = 1024
+# bump when the engine's results change, so older cache files are not reused
+CACHE_VERSION = 2
+
+
+def normalize_scenario(scenario):
+    """Only the inputs that affect the result, with floats rounded
+
+    Takes a scenario dict or a model.Scenario.
+    """
+    if not isinstance(scenario, dict):
+        scenario = scenario.to_dict()
+    transport = scenario.get('transport_type', scenario.get('transport', 'car'))
+    if transport == 'public_transport':
+        transport = 'public'
+    fields = SCHEDULE_FIELDS + TRANSPORT_FIELDS.get(transport, TRANSPORT_FIELDS['car'])
+    if transport == 'public':
+        fields += ('public_monthly_cost',) if scenario.get('use_monthly_pass') else ('public_daily_cost',)
+
+    normalized = {'transport_type': transport}
+    for name in fields:
+        value = scenario.get(name)
+        if isinstance(value, bool) or value is None or isinstance(value, str):
+            normalized[name] = value
+        else:
+            normalized[name] = round(float(value), 6)
+    return normalized
+
+
+def scenario_key(scenario):
+    """Stable hex digest of the normalized scenario"""
+    canonical = json.dumps(normalize_scenario(scenario), sort_keys=True, separators=(',', ':'))
+    return hashlib.sha256(canonical.encode('utf-8')).hexdigest()
+
+
+class ScenarioCache:
+    """LRU mapping of scenario key -> result, with hit/miss counters"""
+
+    def __init__(self, maxsize=DEFAULT_MAXSIZE, path=None):
+        self.maxsize = maxsize
+        self.path = path
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        if path and os.path.exists(path):
+            try:
+                self.load(path)
+            except (OSError, ValueError, KeyError, TypeError, AttributeError):
+                self._entries.clear()  # unreadable or from another version: start empty
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, key):
+        return key in self._entries
+
+    def get(self, key, default=None):
+        if key in self._entries:
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return self._entries[key]
+        self.misses += 1
+        return default
+
+    def put(self, key, value):
+        self._entries[key] = value
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def clear(self):
+        self._entries.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'size': len(self._entries),
+            'maxsize': self.maxsize,
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+        }
+
+    def save(self, path=None):
+        """Write the entries, oldest first, as JSON"""
+        path = path or self.path
+        data = {'version': CACHE_VERSION,
+                'entries': [[key, value.to_dict()] for key, value in self._entries.items()]}
+        tmp_path = f"{path}.tmp"
+        try:
+            with open(tmp_path, 'w', encoding='utf-8') as handle:
+                json.dump(data, handle)
+            os.replace(tmp_path, path)
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+    def load(self, path=None):
+        """Add the entries of a file written by save()"""
+        path = path or self.path
+        with open(path, 'r', encoding='utf-8') as handle:
+            data = json.load(handle)
+        if data.get('version') != CACHE_VERSION:
+            raise ValueError(f"{path} is not a version {CACHE_VERSION} cache file")
+        for key, value in data['entries']:
+            self.put(key, Result.from_dict(value))
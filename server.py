@@ -0,0 +1,369 @@
+"""HTTP/JSON scoring service for other programs.
+
+    python server.py --port 8080
+
+    POST /score          one scenario object -> one result object
+    POST /score/batch    a list of scenarios (or {"scenarios": [...]}) -> {"results": [...]}
+    GET  /health
+
+Scenarios use the engine input names (see wage_engine.DEFAULT_SCENARIO, which
+fills in anything left out); 'transport_type' works as well as 'transport',
+and names like "public" or "biweekly" are accepted. Results have the
+wage_engine.RESULT_COLUMNS keys and come from the same vectorized engine the
+CLI uses.
+
+Single /score requests that arrive close together are coalesced into one
+engine call (up to --max-batch scenarios, waiting at most --max-delay-ms).
+Decoding, scoring and encoding run in a pool of worker processes (--workers,
+one per core beyond the event loop's; 0 scores on the event loop), so the
+loop only moves bytes and batches scale across cores. Connections are kept
+alive (HTTP/1.1 style) so clients don't pay a TCP handshake per request.
+Standard library only; loadgen.py measures throughput against a running
+server.
+"""
+import argparse
+import asyncio
+import json
+import multiprocessing
+import os
+import signal
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+import wage_engine
+from ranking import scenario_columns
+
+DEFAULT_PORT = 8080
+DEFAULT_MAX_BATCH = 2048
+DEFAULT_MAX_DELAY_MS = 2.0
+# one core stays with the event loop; on a single core, worker processes only add IPC
+DEFAULT_WORKERS = max((os.cpu_count() or 1) - 1, 0)
+MAX_BODY_BYTES = 64 * 1024 * 1024
+
+REASONS = {200: 'OK', 400: 'Bad Request', 404: 'Not Found', 405: 'Method Not Allowed',
+           413: 'Payload Too Large', 500: 'Internal Server Error'}
+
+
+class RequestError(Exception):
+    """A request we answer with an HTTP error status"""
+
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+    def __reduce__(self):
+        # raised in a worker process and re-raised in the server
+        return type(self), (self.status, str(self))
+
+
+# one result object; repr() of a finite float is valid JSON
+RESULT_TEMPLATE = '{' + ', '.join(f'"{name}": %r' for name in wage_engine.RESULT_COLUMNS) + '}'
+
+
+def score_scenarios(scenarios):
+    """JSON result objects (str) for a list of scenario dicts, in one engine call"""
+    results = wage_engine.calculate_batch(**scenario_columns(scenarios))
+    count = len(scenarios)
+    # rounded like the CLI's CSV output; also keeps the JSON short
+    columns = [np.round(np.broadcast_to(results[name], (count,)), 4) for name in wage_engine.RESULT_COLUMNS]
+    finite = all(np.isfinite(column).all() for column in columns)
+    rows = zip(*(column.tolist() for column in columns))
+    if finite:
+        return [RESULT_TEMPLATE % row for row in rows]
+    return [json.dumps(dict(zip(wage_engine.RESULT_COLUMNS, row))) for row in rows]
+
+
+def _parse_json(body):
+    try:
+        return json.loads(body or b'null')
+    except ValueError as e:
+        raise RequestError(400, f"invalid JSON: {e}")
+
+
+def _check_scenario(scenario):
+    if not isinstance(scenario, dict):
+        raise RequestError(400, "a scenario must be a JSON object")
+    return scenario
+
+
+def _score_batch_body(body):
+    # runs in a worker process: decoding, scoring and encoding all stay off the event loop
+    data = _parse_json(body)
+    scenarios = data.get('scenarios') if isinstance(data, dict) else data
+    if not isinstance(scenarios, list):
+        raise RequestError(400, "expected a list of scenarios or {\"scenarios\": [...]}")
+    for scenario in scenarios:
+        _check_scenario(scenario)
+    if not scenarios:
+        return b'{"results": []}'
+    try:
+        results = score_scenarios(scenarios)
+    except Exception as e:
+        raise RequestError(400, f"could not score scenarios: {e}")
+    return f'{{"results": [{", ".join(results)}]}}'.encode('utf-8')
+
+
+def _score_single_bodies(bodies):
+    """Encoded results for coalesced /score bodies, with a RequestError in place of each one that failed"""
+    results = [None] * len(bodies)
+    scenarios, positions = [], []
+    for position, body in enumerate(bodies):
+        try:
+            scenarios.append(_check_scenario(_parse_json(body)))
+            positions.append(position)
+        except RequestError as e:
+            results[position] = e
+    try:
+        scored = score_scenarios(scenarios) if scenarios else []
+    except Exception:
+        # one bad scenario must not fail the others: score them one by one
+        scored = []
+        for scenario in scenarios:
+            try:
+                scored.extend(score_scenarios([scenario]))
+            except Exception as e:
+                scored.append(RequestError(400, f"could not score scenario: {e}"))
+    for position, result in zip(positions, scored):
+        results[position] = result if isinstance(result, RequestError) else result.encode('utf-8')
+    return results
+
+
+class Coalescer:
+    """Collects single-scenario requests into batched engine calls"""
+
+    def __init__(self, executor, workers, max_batch=DEFAULT_MAX_BATCH, max_delay=DEFAULT_MAX_DELAY_MS / 1000):
+        self.executor = executor
+        self.max_batch = max_batch
+        self.max_delay = max_delay
+        workers = max(workers, 1)
+        self.queue = asyncio.Queue(maxsize=max_batch * workers * 4)
+        # bounds the batches in flight; the queue above then applies back-pressure
+        self.slots = asyncio.Semaphore(workers)
+        self.task = None
+
+    def start(self):
+        self.task = asyncio.get_running_loop().create_task(self.run())
+
+    async def stop(self):
+        if self.task is not None:
+            self.task.cancel()
+            try:
+                await self.task
+            except asyncio.CancelledError:
+                pass
+
+    async def call(self, func, *args):
+        """func(*args) in a worker process, or right here without a pool (--workers 0)"""
+        if self.executor is None:
+            return func(*args)
+        return await asyncio.get_running_loop().run_in_executor(self.executor, func, *args)
+
+    async def score(self, body):
+        """Encoded result for one /score request body"""
+        future = asyncio.get_running_loop().create_future()
+        await self.queue.put((body, future))
+        return await future
+
+    async def next_batch(self):
+        loop = asyncio.get_running_loop()
+        batch = [await self.queue.get()]
+        deadline = loop.time() + self.max_delay
+        while len(batch) < self.max_batch:
+            try:
+                batch.append(self.queue.get_nowait())
+                continue
+            except asyncio.QueueEmpty:
+                pass
+            timeout = deadline - loop.time()
+            if timeout <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self.queue.get(), timeout))
+            except asyncio.TimeoutError:
+                break
+        return batch
+
+    async def run(self):
+        while True:
+            batch = await self.next_batch()
+            await self.slots.acquire()
+            asyncio.get_running_loop().create_task(self.finish(batch))
+
+    async def finish(self, batch):
+        try:
+            bodies = [body for body, _ in batch]
+            try:
+                results = await self.call(_score_single_bodies, bodies)
+            except Exception as e:  # e.g. a worker process died
+                results = [e] * len(batch)
+            for (_, future), result in zip(batch, results):
+                if future.done():
+                    continue
+                if isinstance(result, Exception):
+                    future.set_exception(result)
+                else:
+                    future.set_result(result)
+        finally:
+            self.slots.release()
+
+
+class ScoringServer:
+    def __init__(self, host='127.0.0.1', port=DEFAULT_PORT, workers=DEFAULT_WORKERS,
+                 max_batch=DEFAULT_MAX_BATCH, max_delay_ms=DEFAULT_MAX_DELAY_MS):
+        self.host = host
+        self.port = port
+        self.workers = workers
+        self.max_batch = max_batch
+        self.max_delay = max_delay_ms / 1000
+        self.executor = None
+        self.coalescer = None
+        self.server = None
+
+    async def start(self):
+        if self.workers > 0:
+            # spawned rather than forked: workers must not inherit the listening socket
+            self.executor = ProcessPoolExecutor(max_workers=self.workers,
+                                                mp_context=multiprocessing.get_context('spawn'))
+        self.coalescer = Coalescer(self.executor, self.workers, self.max_batch, self.max_delay)
+        self.coalescer.start()
+        self.server = await asyncio.start_server(self.handle_connection, self.host, self.port)
+        # port 0 picks a free port
+        self.port = self.server.sockets[0].getsockname()[1]
+
+    async def stop(self):
+        self.server.close()
+        await self.coalescer.stop()
+        if self.executor is not None:
+            self.executor.shutdown(wait=False, cancel_futures=True)
+        await self.server.wait_closed()
+
+    async def serve_forever(self):
+        await self.start()
+        print(f"Scoring server listening on http://{self.host}:{self.port}")
+        try:
+            # SIGTERM stops the server like Ctrl-C does, so the worker processes don't outlive it
+            asyncio.get_running_loop().add_signal_handler(signal.SIGTERM, asyncio.current_task().cancel)
+        except NotImplementedError:  # Windows
+            pass
+        try:
+            await self.server.serve_forever()
+        finally:
+            await self.stop()
+
+    async def handle_connection(self, reader, writer):
+        try:
+            while True:
+                try:
+                    request = await read_request(reader)
+                except RequestError as e:
+                    await write_response(writer, e.status, {'error': str(e)}, keep_alive=False)
+                    break
+                if request is None:
+                    break
+                method, path, keep_alive, body = request
+                try:
+                    status, payload = 200, await self.dispatch(method, path, body)
+                except RequestError as e:
+                    status, payload = e.status, {'error': str(e)}
+                except Exception as e:
+                    status, payload = 500, {'error': str(e)}
+                await write_response(writer, status, payload, keep_alive)
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        except asyncio.CancelledError:
+            pass  # open connection at shutdown; re-raising only makes asyncio log a traceback
+        finally:
+            writer.close()
+
+    async def dispatch(self, method, path, body):
+        path = path.split('?', 1)[0].rstrip('/') or '/'
+        if path == '/health':
+            return {'status': 'ok'}
+        if path not in ('/score', '/score/batch'):
+            raise RequestError(404, f"no endpoint {path}")
+        if method != 'POST':
+            raise RequestError(405, f"{path} takes POST")
+
+        # both come back already encoded; write_response sends the bytes as they are
+        if path == '/score':
+            return await self.coalescer.score(body)
+
+        await self.coalescer.slots.acquire()
+        try:
+            return await self.coalescer.call(_score_batch_body, body)
+        finally:
+            self.coalescer.slots.release()
+
+
+async def read_request(reader):
+    """(method, path, keep_alive, body), or None once the client has closed"""
+    # the request line and headers in one read: per-line awaits cost more than the parsing
+    try:
+        head = await reader.readuntil(b'\r\n\r\n')
+    except asyncio.IncompleteReadError as e:
+        if not e.partial.strip():
+            return None
+        head = e.partial
+    except asyncio.LimitOverrunError:
+        raise RequestError(400, "request headers too long")
+    request_line, *lines = head.decode('latin-1').split('\r\n')
+    try:
+        method, path, version = request_line.split()
+    except ValueError:
+        raise RequestError(400, "malformed request line")
+
+    headers = {}
+    for line in lines:
+        name, _, value = line.partition(':')
+        headers[name.strip().lower()] = value.strip()
+
+    try:
+        length = int(headers.get('content-length') or 0)
+    except ValueError:
+        raise RequestError(400, "Content-Length is not a number")
+    if length < 0:
+        raise RequestError(400, "negative Content-Length")
+    if length > MAX_BODY_BYTES:
+        raise RequestError(413, f"body over {MAX_BODY_BYTES} bytes")
+    body = await reader.readexactly(length) if length else b''
+
+    connection = headers.get('connection', '').lower()
+    keep_alive = connection != 'close' if version == 'HTTP/1.1' else connection == 'keep-alive'
+    return method.upper(), path, keep_alive, body
+
+
+async def write_response(writer, status, payload, keep_alive=True):
+    body = payload if isinstance(payload, bytes) else json.dumps(payload).encode('utf-8')
+    head = (f"HTTP/1.1 {status} {REASONS.get(status, '')}\r\n"
+            f"Content-Type: application/json\r\n"
+            f"Content-Length: {len(body)}\r\n"
+            f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n")
+    writer.write(head.encode('latin-1') + body)
+    await writer.drain()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="HTTP/JSON true hourly wage scoring service")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT)
+    parser.add_argument('--workers', '-w', type=int, default=DEFAULT_WORKERS,
+                        help="worker processes (and batches in flight); 0 scores on the event loop "
+                             "(default: CPU cores - 1)")
+    parser.add_argument('--max-batch', type=int, default=DEFAULT_MAX_BATCH,
+                        help="most single requests coalesced into one engine call")
+    parser.add_argument('--max-delay-ms', type=float, default=DEFAULT_MAX_DELAY_MS,
+                        help="how long a single request may wait for others to batch with")
+    args = parser.parse_args(argv)
+
+    server = ScoringServer(args.host, args.port, args.workers, args.max_batch, args.max_delay_ms)
+    try:
+        asyncio.run(server.serve_forever())
+    except (KeyboardInterrupt, asyncio.CancelledError):
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,277 @@
+"""Pick office sites that leave employees with the best true wage.
+
+Every employee's true wage is worked out at every candidate site they could
+reasonably commute to, with the engine's usual formulas and their own pay,
+schedule and transport mode; only the commute changes from site to site.
+Sites are then ranked on their own, or k of them chosen together (each
+employee going to whichever chosen site suits them best), by the total or
+the median true wage:
+
+    python sites.py roster.csv candidates.csv --top 20
+    python sites.py roster.csv candidates.csv --pick 3 --by median --assign assigned.csv
+
+The roster is a bulk-mode file with home_lat and home_lon added; candidates
+is a CSV of id, lat and lon. Sites farther than --max-miles in a straight
+line from a home are not scored for that employee (they count as
+--unserved-wage). Pairs are found with a grid of cells --max-miles wide, so
+each home only looks at sites in its own and the eight neighbouring cells,
+and all pairs of a block of homes are scored in one calculate_batch() call.
+
+Commute distance and time are estimated from the straight-line distance
+(CIRCUITY and SPEEDS_KPH), or come from a road graph with --graph (see
+roadnet.py). Fares, walking minutes and everything else stay as the roster
+has them.
+"""
+import argparse
+import csv
+import json
+import math
+import sys
+
+import numpy as np
+
+import batch_io
+import roadnet
+import wage_engine
+
+# road miles per straight-line mile
+CIRCUITY = 1.3
+# average door-to-door speed per transport mode for straight-line estimates
+SPEEDS_KPH = {'car': 45.0, 'ev': 45.0, 'public': 20.0, **roadnet.MODE_SPEEDS_KPH}
+DEFAULT_MAX_MILES = 40.0
+DEFAULT_BLOCK_SIZE = 10000
+OBJECTIVES = ('total', 'median')
+
+_CELL_BITS = 32
+
+
+def read_roster(path):
+    """(ids, engine columns, home lat, home lon) for a CSV or JSON-lines roster"""
+    input_format = batch_io.detect_format(path)
+    with open(path, newline='', encoding='utf-8') as handle:
+        if input_format == 'csv':
+            header = batch_io.read_header(handle)
+            lines = [line for line in handle if line.strip()]
+            ids, columns = batch_io.parse_csv_chunk(header, lines)
+            missing = [name for name in ('home_lat', 'home_lon') if name not in header]
+            if missing:
+                raise ValueError(f"{path} has no {', '.join(missing)} column")
+            rows = list(csv.reader(lines))
+            lat = np.array([float(row[header.index('home_lat')]) for row in rows])
+            lon = np.array([float(row[header.index('home_lon')]) for row in rows])
+        else:
+            lines = [line for line in handle if line.strip()]
+            ids, columns = batch_io.parse_jsonl_chunk(lines)
+            records = [json.loads(line) for line in lines]
+            lat = np.array([float(record['home_lat']) for record in records])
+            lon = np.array([float(record['home_lon']) for record in records])
+    return ids, columns, lat, lon
+
+
+def _grid_keys(cx, cy):
+    return cx * (1 << _CELL_BITS) + cy
+
+
+def pairs_within(home_lat, home_lon, site_lat, site_lon, max_m):
+    """(home positions, site positions, metres) of every pair at most max_m apart
+
+    Sites are bucketed into square cells max_m wide (on a flat projection),
+    so only the 3 x 3 cells around each home are checked.
+    """
+    site_lat, site_lon = np.asarray(site_lat, dtype=np.float64), np.asarray(site_lon, dtype=np.float64)
+    home_lat, home_lon = np.asarray(home_lat, dtype=np.float64), np.asarray(home_lon, dtype=np.float64)
+    if not len(home_lat) or not len(site_lat):
+        empty = np.zeros(0, dtype=np.int64)
+        return empty, empty, np.zeros(0)
+    # east-west distances scaled for the highest latitude never exceed the true ones, so no pair within
+    # max_m can be more than one cell apart
+    scale = math.cos(math.radians(float(max(np.abs(home_lat).max(), np.abs(site_lat).max()))))
+    size = max_m / roadnet.EARTH_RADIUS_M
+    x0 = math.radians(min(home_lon.min(), site_lon.min())) * scale
+    y0 = math.radians(min(home_lat.min(), site_lat.min()))
+
+    def cells(lat, lon):
+        return (np.floor((np.radians(lon) * scale - x0) / size).astype(np.int64),
+                np.floor((np.radians(lat) - y0) / size).astype(np.int64))
+
+    site_cx, site_cy = cells(site_lat, site_lon)
+    home_cx, home_cy = cells(home_lat, home_lon)
+    site_keys = _grid_keys(site_cx, site_cy)
+    order = np.argsort(site_keys, kind='stable')
+    sorted_keys = site_keys[order]
+
+    homes, sites = [], []
+    for dx in (-1, 0, 1):
+        for dy in (-1, 0, 1):
+            keys = _grid_keys(home_cx + dx, home_cy + dy)
+            start = np.searchsorted(sorted_keys, keys, side='left')
+            counts = np.searchsorted(sorted_keys, keys, side='right') - start
+            total = int(counts.sum())
+            if not total:
+                continue
+            # ragged ranges start[i]:start[i] + counts[i], flattened
+            offsets = np.arange(total) - np.repeat(np.cumsum(counts) - counts, counts)
+            homes.append(np.repeat(np.arange(len(keys)), counts))
+            sites.append(order[np.repeat(start, counts) + offsets])
+    if not homes:
+        empty = np.zeros(0, dtype=np.int64)
+        return empty, empty, np.zeros(0)
+    homes, sites = np.concatenate(homes), np.concatenate(sites)
+    meters = roadnet.haversine_m(home_lat[homes], home_lon[homes], site_lat[sites], site_lon[sites])
+    close = meters <= max_m
+    return homes[close], sites[close], meters[close]
+
+
+def estimated_commutes(transport, meters):
+    """One-way (minutes, miles) from straight-line metres for each row's transport code"""
+    speeds = np.array([SPEEDS_KPH[name] for name in wage_engine.TRANSPORT_NAMES])
+    road_km = np.asarray(meters, dtype=np.float64) * CIRCUITY / 1000.0
+    return road_km / speeds[transport] * 60.0, road_km * 1000.0 / roadnet.METERS_PER_MILE
+
+
+def road_commutes(transport, minutes, miles):
+    """Road-graph (minutes, miles); modes other than driving cover the road distance at SPEEDS_KPH"""
+    speeds = np.array([SPEEDS_KPH[name] for name in wage_engine.TRANSPORT_NAMES])
+    driving = np.isin(transport, (wage_engine.CAR, wage_engine.EV))
+    other = miles * roadnet.METERS_PER_MILE / 1000.0 / speeds[transport] * 60.0
+    return np.where(driving, minutes, other), miles
+
+
+def wage_matrix(columns, home_lat, home_lon, site_lat, site_lon, max_miles=DEFAULT_MAX_MILES,
+                road=None, block_size=DEFAULT_BLOCK_SIZE):
+    """(employees, sites) float32 true wages, NaN where a site is out of reach
+
+    road is an optional (minutes, miles) pair of (employees, sites) matrices
+    from roadnet.travel_matrix() to use instead of straight-line estimates.
+    """
+    count = len(home_lat)
+    wages = np.full((count, len(site_lat)), np.nan, dtype=np.float32)
+    for start in range(0, count, block_size):
+        stop = min(start + block_size, count)
+        homes, sites, meters = pairs_within(home_lat[start:stop], home_lon[start:stop], site_lat, site_lon,
+                                            max_miles * roadnet.METERS_PER_MILE)
+        rows = homes + start
+        transport = columns['transport'][rows]
+        if road is None:
+            minutes, miles = estimated_commutes(transport, meters)
+        else:
+            minutes, miles = road_commutes(transport, road[0][rows, sites], road[1][rows, sites])
+            reachable = ~np.isnan(minutes)
+            rows, sites, transport = rows[reachable], sites[reachable], transport[reachable]
+            minutes, miles = minutes[reachable], miles[reachable]
+        pair_columns = {name: values[rows] for name, values in columns.items()}
+        pair_columns['commute_minutes'] = minutes
+        pair_columns['daily_miles'] = miles
+        wages[rows, sites] = wage_engine.calculate_batch(**pair_columns)['true_wage']
+    return wages
+
+
+def _objective(wages, by):
+    # wages: (employees, options) with no NaN; one value per option
+    if by == 'median':
+        return np.median(wages, axis=0)
+    return wages.sum(axis=0, dtype=np.float64)
+
+
+def rank_sites(wages, by='total', unserved_wage=0.0):
+    """(order, scores) for every site on its own, best first; median ties go to the higher total"""
+    filled = np.where(np.isnan(wages), np.float32(unserved_wage), wages)
+    scores = _objective(filled, by)
+    totals = _objective(filled, 'total')
+    return np.lexsort((-totals, -scores)), scores
+
+
+def pick_sites(wages, k, by='total', unserved_wage=0.0):
+    """Greedily choose k sites: each step adds the site that raises the objective most
+
+    Returns (chosen sites, objective after each pick, each employee's best
+    chosen site or -1). Employees go to whichever chosen site gives them the
+    highest true wage.
+    """
+    filled = np.where(np.isnan(wages), np.float32(unserved_wage), wages)
+    best = np.full(len(wages), np.float32(unserved_wage), dtype=np.float32)
+    assigned = np.full(len(wages), -1, dtype=np.int64)
+    available = np.ones(wages.shape[1], dtype=bool)
+    chosen, scores = [], []
+    for _ in range(min(k, wages.shape[1])):
+        # total gain of a site is what it adds over each employee's current best
+        gains = np.maximum(filled - best[:, None], 0).sum(axis=0, dtype=np.float64)
+        gains[~available] = -np.inf
+        if by == 'median':
+            # until most employees are served every median is the same; the total gain breaks ties
+            medians = _objective(np.maximum(filled, best[:, None]), by)
+            medians[~available] = -np.inf
+            site = int(np.lexsort((-gains, -medians))[0])
+        else:
+            site = int(np.argmax(gains))
+        moved = filled[:, site] > best
+        best[moved] = filled[moved, site]
+        assigned[moved & ~np.isnan(wages[:, site])] = site
+        available[site] = False
+        chosen.append(site)
+        scores.append(float(_objective(best[:, None], by)[0]))
+    return np.array(chosen, dtype=np.int64), np.array(scores), assigned
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Rank or choose office sites by employees' true wages")
+    parser.add_argument('roster', help="bulk-mode CSV or JSON lines with home_lat and home_lon columns")
+    parser.add_argument('sites', help="CSV of candidate sites with id, lat and lon")
+    parser.add_argument('--by', default='total', choices=OBJECTIVES,
+                        help="total or median true wage across employees")
+    parser.add_argument('--pick', type=int, default=0, help="choose this many sites together")
+    parser.add_argument('--top', type=int, default=20, help="sites to list when ranking")
+    parser.add_argument('--max-miles', type=float, default=DEFAULT_MAX_MILES,
+                        help="straight-line miles beyond which a site is out of reach")
+    parser.add_argument('--unserved-wage', type=float, default=0.0,
+                        help="true wage counted for an employee with no site in reach")
+    parser.add_argument('--graph', help="road graph (see roadnet.py) for commute times instead of estimates")
+    parser.add_argument('--nodes', help="nodes CSV when --graph is an edges CSV")
+    parser.add_argument('--assign', help="with --pick, write each employee's site and true wage to this CSV")
+    args = parser.parse_args(argv)
+
+    try:
+        ids, columns, home_lat, home_lon = read_roster(args.roster)
+        site_rows, site_lat, site_lon = roadnet.read_points(args.sites, 'lat', 'lon')
+    except (KeyError, ValueError) as e:
+        parser.error(str(e))
+    labels = [roadnet.office_label(row, index) for index, row in enumerate(site_rows)]
+
+    road = None
+    if args.graph:
+        graph = roadnet.RoadGraph.load(args.graph, args.nodes)
+        road = roadnet.travel_matrix(graph, home_lat, home_lon, site_lat, site_lon)
+    wages = wage_matrix(columns, home_lat, home_lon, site_lat, site_lon, args.max_miles, road)
+    current = _objective(wage_engine.calculate_batch(**columns)['true_wage'][:, None], args.by)[0]
+    served = (~np.isnan(wages)).sum(axis=0)
+    print(f"{len(home_lat):,} employees, {len(labels):,} sites; {args.by} true wage today: ${current:,.2f}")
+
+    if args.pick <= 0:
+        order, scores = rank_sites(wages, args.by, args.unserved_wage)
+        print(f"{'Rank':>4}  {'Site':<20} {'Served':>8} {args.by.capitalize() + ' true wage':>18}")
+        for rank, site in enumerate(order[:args.top], start=1):
+            print(f"{rank:>4}  {labels[site]:<20.20} {served[site]:>8,} {'$' + format(scores[site], ',.2f'):>18}")
+        return
+
+    chosen, scores, assigned = pick_sites(wages, args.pick, args.by, args.unserved_wage)
+    print(f"{'Pick':>4}  {'Site':<20} {'Served':>8} {args.by.capitalize() + ' true wage':>18}")
+    for rank, (site, score) in enumerate(zip(chosen.tolist(), scores.tolist()), start=1):
+        print(f"{rank:>4}  {labels[site]:<20.20} {int((assigned == site).sum()):>8,} "
+              f"{'$' + format(score, ',.2f'):>18}")
+    unserved = int((assigned < 0).sum())
+    if unserved:
+        print(f"{unserved:,} employee(s) have no chosen site within {args.max_miles:g} miles", file=sys.stderr)
+
+    if args.assign:
+        rows = np.arange(len(assigned))
+        wage = np.where(assigned >= 0, wages[rows, np.maximum(assigned, 0)], np.nan)
+        with open(args.assign, 'w', newline='', encoding='utf-8') as handle:
+            writer = csv.writer(handle, lineterminator='\n')
+            writer.writerow([batch_io.ID_COLUMN, 'site', 'true_wage'])
+            for row, (site, value) in enumerate(zip(assigned.tolist(), wage.tolist())):
+                writer.writerow([ids[row] if ids is not None else row, labels[site] if site >= 0 else '',
+                                 '' if math.isnan(value) else round(value, 2)])
+
+
+if __name__ == "__main__":
+    main()
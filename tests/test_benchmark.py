@@ -0,0 +1,19 @@
+import benchmark
+
+
+def test_inputs_are_built_only_for_the_cases_that_run(monkeypatch):
+    built = []
+    make_columns = benchmark.make_columns
+
+    def counting(rows, **options):
+        built.append(rows)
+        return make_columns(rows, **options)
+
+    monkeypatch.setattr(benchmark, 'make_columns', counting)
+    monkeypatch.setattr(benchmark, 'TARGET_SECONDS', 0.001)
+    benchmark.build_cases()
+    assert built == []
+
+    results = benchmark.run('batch_10k_car', repeat=1, stream=None)
+    assert list(results) == ['batch_10k_car']
+    assert built == [10_000]
@@ -0,0 +1,112 @@
+import os
+
+import numpy as np
+import pytest
+
+import incremental
+import wage_engine
+
+
+def roster(count, seed, ids=None):
+    rng = np.random.default_rng(seed)
+    columns = {name: np.full(count, float(value)) for name, value in wage_engine.DEFAULT_SCENARIO.items()}
+    columns['paycheck'] = rng.uniform(1000, 5000, count)
+    columns['commute_minutes'] = rng.uniform(5, 90, count)
+    columns['transport'] = rng.integers(0, 5, count).astype(np.int8)
+    columns['pay_frequency'] = np.full(count, wage_engine.BIWEEKLY, dtype=np.int8)
+    columns['use_monthly_pass'] = np.zeros(count, dtype=bool)
+    if ids is None:
+        ids = np.array([f"E{number}" for number in rng.permutation(count)])
+    return ids, columns
+
+
+def chunks(ids, columns, size):
+    for start in range(0, len(ids), size):
+        yield ids[start:start + size], {name: values[start:start + size] for name, values in columns.items()}
+
+
+def run(path, ids, columns, chunk_size):
+    previous = incremental.RunState.load(path)
+    writer = incremental.StateWriter(path)
+    outputs, recomputed = [], 0
+    for _, results, changed in incremental.iter_rescored(chunks(ids, columns, chunk_size), previous, writer):
+        outputs.append(results['true_wage'].copy())
+        recomputed += changed
+    previous.close()
+    writer.close()
+    return np.concatenate(outputs), recomputed
+
+
+@pytest.fixture(autouse=True)
+def small_merge_blocks(monkeypatch):
+    # a handful of rows per block, so the merge takes many steps
+    monkeypatch.setattr(incremental, 'MERGE_ROWS', 64)
+
+
+@pytest.mark.parametrize('chunk_size', [7, 100, 5000])
+def test_state_is_sorted_and_complete(tmp_path, chunk_size):
+    path = str(tmp_path / 'run.state')
+    ids, columns = roster(2000, seed=1)
+    wages, recomputed = run(path, ids, columns, chunk_size)
+
+    state = incremental.RunState.load(path)
+    assert recomputed == 2000
+    assert (state.ids[:-1] <= state.ids[1:]).all()
+    order = np.argsort(ids)
+    np.testing.assert_array_equal(state.ids, ids[order])
+    np.testing.assert_array_equal(state.results['true_wage'], wages[order])
+    np.testing.assert_array_equal(state.hashes, incremental.row_hashes(columns, 2000)[order])
+    assert sorted(os.listdir(tmp_path)) == ['run.state']
+
+
+def test_only_changed_records_are_recomputed(tmp_path):
+    path = str(tmp_path / 'run.state')
+    ids, columns = roster(1000, seed=2)
+    first, _ = run(path, ids, columns, 64)
+
+    columns['paycheck'][:10] += 1.0
+    second, recomputed = run(path, ids, columns, 64)
+    expected = wage_engine.calculate_batch(**columns)['true_wage']
+
+    assert recomputed == 10
+    np.testing.assert_allclose(second, expected)
+    np.testing.assert_array_equal(second[10:], first[10:])
+
+    _, recomputed = run(path, ids, columns, 300)
+    assert recomputed == 0
+
+
+def test_numeric_ids(tmp_path):
+    path = str(tmp_path / 'run.state')
+    ids, columns = roster(500, seed=3, ids=np.random.default_rng(3).permutation(500).astype(np.uint64))
+    run(path, ids, columns, 33)
+
+    assert incremental.RunState.load(path).ids.tolist() == list(range(500))
+    assert run(path, ids, columns, 33)[1] == 0
+
+
+def test_older_npz_states_still_load(tmp_path):
+    path = str(tmp_path / 'old.npz')
+    ids, columns = roster(100, seed=4)
+    results = wage_engine.calculate_batch(**columns)
+    order = np.argsort(ids)
+    np.savez(path, ids=ids[order], hashes=incremental.row_hashes(columns, 100)[order],
+             **{name: np.asarray(results[name])[order] for name in wage_engine.RESULT_COLUMNS})
+
+    assert run(path, ids, columns, 30)[1] == 0
+    assert run(path, ids, columns, 30)[1] == 0  # and the rewritten state too
+
+
+def test_discard_leaves_the_previous_state(tmp_path):
+    path = str(tmp_path / 'run.state')
+    ids, columns = roster(100, seed=5)
+    run(path, ids, columns, 50)
+    before = open(path, 'rb').read()
+
+    writer = incremental.StateWriter(path)
+    results = wage_engine.calculate_batch(**{name: values[:10] for name, values in columns.items()})
+    writer.add(ids[:10], np.zeros(10, dtype=np.uint64), results)
+    writer.discard()
+
+    assert open(path, 'rb').read() == before
+    assert os.listdir(tmp_path) == ['run.state']
@@ -0,0 +1,161 @@
+import io
+
+import numpy as np
+import pytest
+
+import batch_io
+import ledger
+import wage_engine
+
+ROSTER = """id,paycheck,daily_hours,work_days,wfh_days,transport,commute_minutes,daily_miles,gas_price,mpg,\
+public_daily_cost,public_monthly_cost,use_monthly_pass
+E1,2000,8,5,0,car,30,10,3.5,25,,,
+E2,2000,8,5,0,public,30,,,,,100,true
+E3,2000,8,5,2,public,30,,,,,100,true
+E4,2000,8,5,0,public,30,,,,6,100,false
+"""
+
+
+def roster_ledger(slots=None):
+    ids, columns = next(batch_io.iter_record_chunks(io.StringIO(ROSTER)))
+    book = ledger.CommuteLedger(slots)
+    book.set_roster(ids, columns)
+    return book
+
+
+def weekdays(start, stop, per_week=5):
+    days = np.arange(np.datetime64(start), np.datetime64(stop))
+    weekday = (days - np.datetime64('1970-01-05')).astype(np.int64) % 7
+    return days[weekday < per_week]
+
+
+def test_period_index_and_start_round_trip():
+    dates = np.array(['2025-01-01', '2025-03-31', '2025-04-01', '2024-12-30'], dtype='datetime64[D]')
+    np.testing.assert_array_equal(ledger.period_start(ledger.period_index(dates, 'month'), 'month'),
+                                  np.array(['2025-01-01', '2025-03-01', '2025-04-01', '2024-12-01'],
+                                           dtype='datetime64[D]'))
+    np.testing.assert_array_equal(ledger.period_start(ledger.period_index(dates, 'quarter'), 'quarter'),
+                                  np.array(['2025-01-01', '2025-01-01', '2025-04-01', '2024-10-01'],
+                                           dtype='datetime64[D]'))
+    # 2024-12-30 and 2025-01-01 are in the week starting Monday 2024-12-30
+    weeks = ledger.period_start(ledger.period_index(dates, 'week'), 'week')
+    assert weeks[0] == weeks[3] == np.datetime64('2024-12-30')
+
+
+def test_ring_matches_summing_every_day():
+    rng = np.random.default_rng(1)
+    ring = ledger.PeriodRing('week', slots=8, capacity=3)
+    rows = rng.integers(0, 3, 500)
+    periods = rng.integers(0, 30, 500)
+    values = rng.random((500, len(ledger.FIELDS)))
+    # add in several out-of-order batches
+    for part in np.array_split(np.arange(500), 7):
+        ring.add(rows[part], periods[part], values[part])
+
+    found, totals = ring.last(29, 8)
+    np.testing.assert_array_equal(found, np.arange(22, 30))
+    for row in range(3):
+        for position, period in enumerate(found):
+            # the newest 8 periods own their slots, so every one of their days counts
+            picked = (rows == row) & (periods == period)
+            np.testing.assert_allclose(totals[row, position], values[picked].sum(axis=0))
+
+
+def test_ring_drops_days_older_than_their_slot():
+    ring = ledger.PeriodRing('month', slots=3, capacity=1)
+    one_day = np.ones((1, len(ledger.FIELDS)))
+    ring.add(np.array([0]), np.array([10]), one_day)
+    # period 13 reuses period 10's slot and clears it
+    ring.add(np.array([0]), np.array([13]), 2 * one_day)
+    ring.add(np.array([0]), np.array([10]), 5 * one_day)
+
+    periods, totals = ring.last(13, 4)
+    np.testing.assert_array_equal(periods, [11, 12, 13])
+    np.testing.assert_array_equal(totals[0, :, 0], [0.0, 0.0, 2.0])
+
+
+def test_day_values_match_the_engine():
+    book = roster_ledger()
+    days = weekdays('2025-03-03', '2025-03-08')
+    book.add_days(['E1'] * len(days), days)
+
+    expected = wage_engine.calculate_batch(paycheck=2000.0, daily_hours=8.0, work_days=5.0,
+                                           transport=wage_engine.CAR, commute_minutes=30.0, daily_miles=10.0,
+                                           gas_price=3.5, mpg=25.0)
+    totals = book.rolling('week', 1)[book.index['E1']]
+    week = dict(zip(ledger.FIELDS, totals))
+    assert week['days'] == 5
+    np.testing.assert_allclose(week['income'], expected['annual_income'] / 50)
+    np.testing.assert_allclose(week['commute_costs'], expected['yearly_commute_costs'] / 50)
+    np.testing.assert_allclose(week['commute_hours'], expected['yearly_commute_hours'] / 50)
+    np.testing.assert_allclose(ledger.true_wage(totals), expected['true_wage'])
+
+
+@pytest.mark.parametrize('employee, per_week', [('E2', 5), ('E3', 3)])
+def test_monthly_pass_is_spread_over_the_rosters_commute_days(employee, per_week):
+    book = roster_ledger()
+    # 4.33 weeks of scheduled commute days cost exactly one pass
+    days = weekdays('2025-03-03', '2025-04-03', per_week)[:round(per_week * wage_engine.WEEKS_PER_MONTH)]
+    book.add_days([employee] * len(days), days)
+
+    totals = book.lifetime[book.index[employee]]
+    np.testing.assert_allclose(totals[ledger.FIELDS.index('commute_costs')],
+                               100 * len(days) / (per_week * wage_engine.WEEKS_PER_MONTH))
+
+
+def test_daily_fares_without_a_pass():
+    book = roster_ledger()
+    days = weekdays('2025-03-03', '2025-03-08')
+    fares = np.array([np.nan, 8, np.nan, 8, 6])
+    book.add_days(['E4'] * len(days), days, day_columns={'public_daily_cost': fares})
+
+    assert book.lifetime[book.index['E4'], ledger.FIELDS.index('commute_costs')] == pytest.approx(34.0)
+
+
+def test_home_days_have_no_commute_and_unknown_ids_are_skipped():
+    book = roster_ledger()
+    days = np.array(['2025-03-03', '2025-03-04', '2025-03-04'], dtype='datetime64[D]')
+    added, skipped = book.add_days(['E1', 'E1', 'X9'], days, transport=['', 'wfh', 'car'])
+
+    assert (added, skipped) == (2, 1)
+    week = dict(zip(ledger.FIELDS, book.lifetime[book.index['E1']]))
+    assert week['days'] == 2
+    assert week['work_hours'] == 16
+    assert week['commute_hours'] == pytest.approx(1.0)
+
+
+def test_save_and_load_keep_everything(tmp_path):
+    book = roster_ledger({'week': 4})
+    days = weekdays('2025-01-06', '2025-03-01')
+    book.add_days(['E3'] * len(days), days)
+    path = tmp_path / 'ledger.npz'
+    book.save(path)
+
+    loaded = ledger.CommuteLedger.load(path)
+    assert loaded.ids == book.ids
+    assert loaded.latest == book.latest
+    assert loaded.rings['week'].slots == 4
+    for period in ledger.PERIODS:
+        np.testing.assert_array_equal(loaded.last(period, 3)[1], book.last(period, 3)[1])
+
+    # both ledgers go on the same way
+    more = weekdays('2025-03-03', '2025-03-08')
+    for each in (book, loaded):
+        each.add_days(['E3'] * len(more), more)
+    np.testing.assert_array_equal(loaded.rolling('month', 2), book.rolling('month', 2))
+
+
+def test_ledgers_saved_without_pass_columns_still_load(tmp_path):
+    book = roster_ledger()
+    book.add_days(['E1'], np.array(['2025-03-03'], dtype='datetime64[D]'))
+    path = tmp_path / 'old.npz'
+    book.save(path)
+    with np.load(path) as data:
+        arrays = {name: data[name] for name in data.files
+                  if name not in ('profile_use_monthly_pass', 'profile_public_monthly_cost',
+                                  'profile_commute_days')}
+    np.savez(path, **arrays)
+
+    loaded = ledger.CommuteLedger.load(path)
+    assert not loaded.profile['use_monthly_pass'].any()
+    np.testing.assert_array_equal(loaded.lifetime, book.lifetime)
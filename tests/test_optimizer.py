@@ -0,0 +1,112 @@
+import itertools
+
+import numpy as np
+import pytest
+
+import optimizer
+import wage_engine
+
+
+def random_roster(count, seed):
+    rng = np.random.default_rng(seed)
+    columns = {name: np.full(count, float(value)) for name, value in wage_engine.DEFAULT_SCENARIO.items()
+               if name not in ('transport', 'pay_frequency', 'use_monthly_pass')}
+    columns.update(
+        paycheck=rng.uniform(800, 6000, count),
+        daily_hours=rng.uniform(4, 10, count),
+        work_days=rng.choice([3.0, 4.0, 4.5, 5.0, 6.0], count),
+        commute_minutes=rng.uniform(5, 90, count),
+        daily_miles=rng.uniform(1, 60, count),
+        gas_price=rng.uniform(2, 6, count),
+        mpg=rng.uniform(12, 55, count),
+        ev_efficiency=rng.uniform(2.5, 4.5, count),
+        public_daily_cost=rng.uniform(0, 15, count),
+        public_monthly_cost=rng.uniform(0, 250, count),
+        public_walking_minutes=rng.uniform(0, 20, count),
+        daily_costs=rng.uniform(0, 20, count),
+    )
+    columns['transport'] = np.zeros(count, dtype=np.int8)
+    columns['pay_frequency'] = rng.integers(0, len(wage_engine.PAY_FREQUENCY_NAMES), count).astype(np.int8)
+    columns['use_monthly_pass'] = np.zeros(count, dtype=bool)
+    return columns
+
+
+def brute_force(columns, min_office_days, max_commute_cost, max_commute_hours):
+    """Best true wage per row from trying every mode, fare option and whole number of WFH days"""
+    count = len(columns['paycheck'])
+    best = np.full(count, -np.inf)
+    for transport, use_monthly_pass in optimizer.candidates():
+        for wfh_days in range(int(columns['work_days'].max()) + 1):
+            wfh = np.full(count, float(wfh_days))
+            scenario = dict(columns, transport=transport, wfh_days=wfh, use_monthly_pass=use_monthly_pass)
+            results = wage_engine.calculate_batch(**scenario)
+            commute_days = columns['work_days'] - wfh
+            allowed = (commute_days >= min_office_days - 1e-9) & (wfh <= columns['work_days'])
+            within = ((results['yearly_commute_costs'] <= max_commute_cost + 1e-6)
+                      & (results['yearly_commute_hours'] <= max_commute_hours + 1e-6))
+            within |= commute_days <= 1e-9
+            better = allowed & within & (results['true_wage'] > best)
+            best[better] = results['true_wage'][better]
+    return np.where(np.isfinite(best), best, np.nan)
+
+
+@pytest.mark.parametrize('min_office_days, max_commute_cost, max_commute_hours',
+                         list(itertools.product([0.0, 2.0, 3.0], [np.inf, 3000.0, 800.0], [np.inf, 150.0])))
+def test_solve_matches_brute_force(min_office_days, max_commute_cost, max_commute_hours):
+    columns = random_roster(400, seed=7)
+    solution = optimizer.solve(columns, min_office_days, max_commute_cost, max_commute_hours)
+    expected = brute_force(columns, min_office_days, max_commute_cost, max_commute_hours)
+
+    np.testing.assert_array_equal(solution['feasible'], np.isfinite(expected))
+    np.testing.assert_allclose(solution['true_wage'], expected, rtol=1e-9, equal_nan=True)
+
+
+def test_solution_is_what_the_engine_gives_for_that_choice():
+    columns = random_roster(200, seed=3)
+    solution = optimizer.solve(columns, 1.0, 2500.0)
+    feasible = solution['feasible']
+    scenario = dict(columns, transport=solution['transport'], wfh_days=np.nan_to_num(solution['wfh_days']),
+                    use_monthly_pass=solution['use_monthly_pass'])
+    results = wage_engine.calculate_batch(**scenario)
+
+    assert feasible.any()
+    np.testing.assert_allclose(results['true_wage'][feasible], solution['true_wage'][feasible])
+    assert (results['yearly_commute_costs'][feasible] <= 2500.0 + 1e-6).all()
+    assert (columns['work_days'] - solution['wfh_days'] >= 1.0)[feasible].all()
+
+
+def test_modes_and_pass_can_be_restricted():
+    columns = random_roster(100, seed=11)
+    solution = optimizer.solve(columns, modes=('public',), allow_monthly_pass=False)
+
+    assert (solution['transport'] == wage_engine.PUBLIC).all()
+    assert not solution['use_monthly_pass'].any()
+
+
+def test_unreachable_limit_is_infeasible():
+    columns = random_roster(50, seed=5)
+    columns['daily_costs'][:] = 100.0
+    solution = optimizer.solve(columns, min_office_days=1.0, max_commute_cost=10.0, modes=('car',))
+
+    assert not solution['feasible'].any()
+    assert np.isnan(solution['true_wage']).all()
+
+
+def test_staying_home_every_day_meets_any_cost_limit():
+    columns = random_roster(20, seed=9)
+    columns['work_days'][:] = 5.0
+    columns['public_monthly_cost'][:] = 200.0
+    columns['public_daily_cost'][:] = 10.0
+    solution = optimizer.solve(columns, max_commute_cost=50.0, modes=('public',))
+
+    assert solution['feasible'].all()
+    np.testing.assert_array_equal(solution['wfh_days'], 5.0)
+    np.testing.assert_array_equal(solution['yearly_commute_costs'], 0.0)
+
+
+def test_float_noise_in_day_counts_is_ignored():
+    columns = random_roster(20, seed=13)
+    columns['work_days'][:] = 3.0
+    solution = optimizer.solve(columns, min_office_days=1.0 + 1e-12)
+
+    np.testing.assert_array_equal(solution['wfh_days'], 2.0)
@@ -0,0 +1,62 @@
+import json
+
+import pytest
+
+from model import Result, Scenario
+from scenario_cache import ScenarioCache, scenario_key
+
+
+def test_equivalent_scenarios_share_a_key():
+    # MPG does not matter when taking the train
+    train = Scenario(transport='public')
+    assert scenario_key(train.replace(mpg=25)) == scenario_key(train.replace(mpg=40))
+    assert scenario_key(Scenario(mpg=25)) != scenario_key(Scenario(mpg=40))
+    assert scenario_key(Scenario()) == scenario_key(Scenario().to_dict())
+
+
+def test_least_recently_used_entries_are_dropped():
+    cache = ScenarioCache(maxsize=2)
+    cache.put('a', 1)
+    cache.put('b', 2)
+    cache.get('a')
+    cache.put('c', 3)
+
+    assert 'a' in cache and 'c' in cache and 'b' not in cache
+    assert cache.stats()['hits'] == 1
+
+
+def test_results_persist_between_sessions(tmp_path):
+    path = str(tmp_path / 'cache.json')
+    scenarios = [Scenario(), Scenario(transport='ev'), Scenario(wfh_days=2)]
+    cache = ScenarioCache(path=path)
+    for scenario in scenarios:
+        cache.put(scenario_key(scenario), scenario.score())
+    cache.save()
+
+    reloaded = ScenarioCache(path=path)
+    assert len(reloaded) == 3
+    for scenario in scenarios:
+        result = reloaded.get(scenario_key(scenario))
+        assert isinstance(result, Result)
+        assert result == scenario.score()
+    assert reloaded.stats()['hit_rate'] == 1.0
+    assert list(tmp_path.iterdir()) == [tmp_path / 'cache.json']
+
+
+def test_failed_save_leaves_no_temp_file(tmp_path):
+    path = tmp_path / 'cache.json'
+    cache = ScenarioCache(path=str(path))
+    cache.put('bad', Scenario().score().to_dict())  # not a Result
+
+    with pytest.raises(AttributeError):
+        cache.save()
+    assert list(tmp_path.iterdir()) == []
+
+
+@pytest.mark.parametrize('content', ['not json', '[["key", {"true_wage": 1}]]',
+                                     json.dumps({'version': 0, 'entries': []})])
+def test_unreadable_or_old_files_start_empty(tmp_path, content):
+    path = tmp_path / 'cache.json'
+    path.write_text(content)
+
+    assert len(ScenarioCache(path=str(path))) == 0
@@ -0,0 +1,71 @@
+import asyncio
+import json
+import pickle
+
+import numpy as np
+import pytest
+
+import server
+import wage_engine
+from ranking import scenario_columns
+
+SCENARIOS = [{'paycheck': 3000, 'transport': 'biking'},
+             {'transport_type': 'public', 'use_monthly_pass': 'yes'},
+             {'pay_frequency': 'weekly', 'wfh_days': 2}]
+
+
+def test_results_are_json_objects_matching_the_engine():
+    expected = wage_engine.calculate_batch(**scenario_columns(SCENARIOS))
+    for row, encoded in enumerate(server.score_scenarios(SCENARIOS)):
+        result = json.loads(encoded)
+        assert list(result) == list(wage_engine.RESULT_COLUMNS)
+        for name, value in result.items():
+            assert value == pytest.approx(np.broadcast_to(expected[name], (3,))[row], abs=1e-4)
+
+
+def test_one_bad_body_does_not_fail_the_batch():
+    bodies = [json.dumps(SCENARIOS[0]).encode(), b'{not json', b'[1]', b'{"paycheck": "lots"}',
+              json.dumps(SCENARIOS[1]).encode()]
+    results = server._score_single_bodies(bodies)
+
+    assert json.loads(results[0]) == json.loads(server.score_scenarios(SCENARIOS[:1])[0])
+    assert json.loads(results[4]) == json.loads(server.score_scenarios(SCENARIOS[1:2])[0])
+    assert [result.status for result in results[1:4]] == [400, 400, 400]
+    assert 'could not score' in str(results[3])
+
+
+def test_request_errors_survive_the_trip_back_from_a_worker():
+    error = pickle.loads(pickle.dumps(server.RequestError(413, "too big")))
+    assert (error.status, str(error)) == (413, "too big")
+
+
+async def request(port, method, path, body=b''):
+    reader, writer = await asyncio.open_connection('127.0.0.1', port)
+    writer.write(f"{method} {path} HTTP/1.1\r\nContent-Length: {len(body)}\r\n"
+                 f"Connection: close\r\n\r\n".encode() + body)
+    response = await reader.read()
+    writer.close()
+    head, _, payload = response.partition(b'\r\n\r\n')
+    return int(head.split()[1]), json.loads(payload)
+
+
+@pytest.mark.parametrize('workers', [0, 1])
+def test_endpoints(workers):
+    async def run():
+        app = server.ScoringServer(port=0, workers=workers)
+        await app.start()
+        try:
+            port = app.port
+            singles = await asyncio.gather(*(request(port, 'POST', '/score', json.dumps(s).encode())
+                                             for s in SCENARIOS))
+            batch = await request(port, 'POST', '/score/batch', json.dumps({'scenarios': SCENARIOS}).encode())
+            errors = [await request(port, 'POST', '/score', b'[]'), await request(port, 'GET', '/score'),
+                      await request(port, 'GET', '/nowhere')]
+        finally:
+            await app.stop()
+        return singles, batch, errors
+
+    singles, batch, errors = asyncio.run(run())
+    assert batch[0] == 200
+    assert [payload for _, payload in singles] == batch[1]['results']
+    assert [status for status, _ in errors] == [400, 405, 404]
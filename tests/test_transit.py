@@ -0,0 +1,258 @@
+import datetime
+import os
+
+import numpy as np
+import pytest
+
+import transit
+
+WEDNESDAY = datetime.date(2025, 3, 5)
+
+# stops on one parallel, about 1.7 km apart except D and E (17 m, within walking distance)
+STOPS = {'A': 0.00, 'B': 0.02, 'C': 0.04, 'D': 0.06, 'E': 0.0602, 'F': 0.10}
+
+# (trip, route, service, [(stop, 'HH:MM:SS'), ...]); the 08:02 rail trip overtakes the 08:00 one
+TRIPS = [
+    ('rail-0800', 'RAIL', 'WK', [('A', '08:00:00'), ('B', '08:10:00'), ('C', '08:20:00')]),
+    ('rail-0802', 'RAIL', 'WK', [('A', '08:02:00'), ('B', '08:08:00'), ('C', '08:15:00')]),
+    ('rail-0830', 'RAIL', 'WK', [('A', '08:30:00'), ('B', '08:40:00'), ('C', '08:50:00')]),
+    ('slow-0825', 'SLOW', 'WK', [('C', '08:25:00'), ('F', '09:00:00')]),
+    ('express-0805', 'EXPRESS', 'WK', [('A', '08:05:00'), ('D', '08:15:00')]),
+    ('feeder-0820', 'FEEDER', 'WK', [('E', '08:20:00'), ('F', '08:30:00')]),
+    ('weekend-0801', 'EXPRESS', 'WE', [('A', '08:01:00'), ('D', '08:03:00')]),
+]
+
+
+def write_feed(path, stops, trips, fares=True):
+    os.makedirs(path, exist_ok=True)
+    files = {
+        'stops.txt': ['stop_id,stop_name,stop_lat,stop_lon']
+                     + [f"{stop},{stop},40.0,{lon}" for stop, lon in stops.items()],
+        'trips.txt': ['route_id,service_id,trip_id'] + [f"{route},{service},{trip}"
+                                                         for trip, route, service, _ in trips],
+        'stop_times.txt': ['trip_id,arrival_time,departure_time,stop_id,stop_sequence']
+                          + [f"{trip},{time},{time},{stop},{sequence}" for trip, _, _, times in trips
+                             for sequence, (stop, time) in enumerate(times, start=1)],
+        'calendar.txt': ['service_id,monday,tuesday,wednesday,thursday,friday,saturday,sunday,'
+                         'start_date,end_date',
+                         'WK,1,1,1,1,1,0,0,20250101,20251231',
+                         'WE,0,0,0,0,0,1,1,20250101,20251231'],
+    }
+    if fares:
+        files['fare_attributes.txt'] = ['fare_id,price,currency_type,payment_method,transfers,'
+                                        'transfer_duration',
+                                        'bus,2.50,USD,0,1,1800',
+                                        'rail,4.00,USD,0,0,']
+        files['fare_rules.txt'] = ['fare_id,route_id', 'bus,EXPRESS', 'bus,FEEDER', 'rail,RAIL']
+    for name, lines in files.items():
+        with open(os.path.join(path, name), 'w', encoding='utf-8') as handle:
+            handle.write('\n'.join(lines) + '\n')
+    return path
+
+
+@pytest.fixture
+def table(tmp_path):
+    return transit.Timetable.build(write_feed(str(tmp_path / 'feed'), STOPS, TRIPS), WEDNESDAY)
+
+
+def stop(table, stop_id):
+    return table.stop_index[stop_id]
+
+
+def route(table, route_id):
+    return table.gtfs_route_ids.index(route_id)
+
+
+def seconds(text):
+    return transit.parse_time(text)
+
+
+def test_earliest_arrival(table):
+    search = transit.raptor(table, stop(table, 'A'), seconds('08:00'))
+    best = dict(zip(table.stop_ids, search.best.tolist()))
+
+    assert best['A'] == seconds('08:00')
+    assert best['B'] == seconds('08:08')  # the overtaking trip, not the one leaving first
+    assert best['C'] == seconds('08:15')
+    assert best['D'] == seconds('08:15')
+    assert best['E'] == seconds('08:15') + int(np.ceil(transit.walk_seconds(
+        transit.haversine_m(40.0, STOPS['D'], 40.0, STOPS['E']))))
+    assert best['F'] == seconds('08:30')  # express, walk, feeder beats rail then slow
+
+
+def test_missed_departures_and_round_limit(table):
+    later = transit.raptor(table, stop(table, 'A'), seconds('08:06'))
+    assert later.best[stop(table, 'C')] == seconds('08:50')
+    assert later.best[stop(table, 'F')] == transit.NEVER
+
+    one_ride = transit.raptor(table, stop(table, 'A'), seconds('08:00'), max_rounds=1)
+    assert one_ride.best[stop(table, 'D')] == seconds('08:15')
+    assert one_ride.best[stop(table, 'F')] == transit.NEVER
+
+
+def test_service_calendar(tmp_path):
+    feed = write_feed(str(tmp_path / 'feed'), STOPS, TRIPS)
+    saturday = transit.Timetable.build(feed, datetime.date(2025, 3, 8))
+    search = transit.raptor(saturday, saturday.stop_index['A'], seconds('08:00'))
+
+    assert search.best[saturday.stop_index['D']] == seconds('08:03')
+    assert search.best[saturday.stop_index['C']] == transit.NEVER
+
+
+def test_overtaking_trips_are_split_into_fifo_routes(table):
+    rail = route(table, 'RAIL')
+    split = np.unique(table.entry_route[table.route_gtfs[table.entry_route] == rail])
+    assert len(split) == 2
+    for entry in range(len(table.entry_stop)):
+        block = table.departures[table.entry_offset[entry]:table.entry_offset[entry + 1]]
+        assert (np.diff(block) >= 0).all()
+
+
+def test_legs(table):
+    search = transit.raptor(table, stop(table, 'A'), seconds('08:00'))
+    legs = search.legs(stop(table, 'F'))
+
+    walk = search.best[stop(table, 'E')] - seconds('08:15')
+    a, b, d, e, f = (stop(table, stop_id) for stop_id in 'ABDEF')
+    assert legs == [
+        ('ride', route(table, 'EXPRESS'), a, d, seconds('08:05'), seconds('08:15')),
+        ('walk', d, e, walk),
+        ('ride', route(table, 'FEEDER'), e, f, seconds('08:20'), seconds('08:30')),
+    ]
+    assert search.legs(a) == []
+    assert search.legs(b) == [('ride', route(table, 'RAIL'), a, b, seconds('08:02'), seconds('08:08'))]
+
+
+def test_legs_of_an_unreachable_stop(table):
+    search = transit.raptor(table, stop(table, 'F'), seconds('08:00'))
+    assert search.legs(stop(table, 'A')) is None
+
+
+def ride(table, route_id, depart):
+    return ('ride', route(table, route_id), 0, 0, seconds(depart), seconds(depart) + 600)
+
+
+def test_journey_fare_transfer_allowance(table):
+    walk = ('walk', 0, 1, 60)
+    # one transfer within 30 minutes is free
+    assert transit.journey_fare(table, [ride(table, 'EXPRESS', '08:05'), walk,
+                                        ride(table, 'FEEDER', '08:20')]) == pytest.approx(2.50)
+    # a second transfer pays again
+    assert transit.journey_fare(table, [ride(table, 'EXPRESS', '08:05'), ride(table, 'FEEDER', '08:20'),
+                                        ride(table, 'EXPRESS', '08:25')]) == pytest.approx(5.00)
+    # so does a transfer after the allowance runs out
+    assert transit.journey_fare(table, [ride(table, 'EXPRESS', '08:05'),
+                                        ride(table, 'FEEDER', '08:36')]) == pytest.approx(5.00)
+    # rail has no transfers, and changing fare pays the new one
+    assert transit.journey_fare(table, [ride(table, 'RAIL', '08:00'),
+                                        ride(table, 'RAIL', '08:30')]) == pytest.approx(8.00)
+    assert transit.journey_fare(table, [ride(table, 'RAIL', '08:00'),
+                                        ride(table, 'FEEDER', '08:20')]) == pytest.approx(6.50)
+    assert transit.journey_fare(table, []) == 0.0
+
+
+def test_journey_fare_unknown_route(table):
+    assert transit.journey_fare(table, [ride(table, 'SLOW', '08:25')]) is None
+
+
+def test_plan(table):
+    planner = transit.JourneyPlanner(table, window_minutes=1)
+    journey = planner.plan(40.0, STOPS['A'] - 0.001, 40.0, STOPS['F'] + 0.001, seconds('07:55'))
+
+    assert [leg[0] for leg in journey['legs']] == ['ride', 'walk', 'ride']
+    assert journey['fare'] == pytest.approx(2.50)
+    assert journey['minutes'] > 35
+    assert journey['minutes'] == pytest.approx(journey['walking_minutes'] + journey['riding_minutes'])
+
+
+def test_load_rebuilds_when_a_feed_file_changes(tmp_path):
+    feed = write_feed(str(tmp_path / 'feed'), STOPS, TRIPS)
+    first = transit.Timetable.load(feed, WEDNESDAY)
+    assert transit.Timetable.load(feed, WEDNESDAY).fingerprint == first.fingerprint
+
+    directory_mtime = os.stat(feed).st_mtime_ns
+    write_feed(feed, STOPS, TRIPS[:2])
+    os.utime(feed, ns=(directory_mtime, directory_mtime))
+    reloaded = transit.Timetable.load(feed, WEDNESDAY)
+
+    assert reloaded.fingerprint != first.fingerprint
+    assert len(reloaded.departures) == len(transit.Timetable.build(feed, WEDNESDAY).departures)
+    assert len(reloaded.departures) < len(first.departures)
+
+
+def connection_scan(table, origin, depart):
+    """Earliest arrivals by scanning every timetable connection in departure order
+
+    Walks set off from the origin and from ride arrivals only, as in raptor().
+    """
+    walks = {}
+    for source, target, walk in zip(table.path_from.tolist(), table.path_to.tolist(),
+                                    table.path_seconds.tolist()):
+        walks.setdefault(source, []).append((target, walk))
+    connections = []
+    for route_ in range(table.route_count):
+        entries = np.flatnonzero(table.entry_route == route_)
+        for trip in range(int(table.entry_trips[entries[0]])):
+            for board, alight in zip(entries[:-1], entries[1:]):
+                connections.append((int(table.departures[table.entry_offset[board] + trip]),
+                                    int(table.arrivals[table.entry_offset[alight] + trip]),
+                                    int(table.entry_stop[board]), int(table.entry_stop[alight]),
+                                    (route_, trip)))
+    connections.sort(key=lambda connection: connection[0])
+
+    best = np.full(table.stop_count, transit.NEVER, dtype=np.int64)
+    best[origin] = depart
+    for target, walk in walks.get(origin, []):
+        best[target] = min(best[target], depart + walk)
+    on_trip = set()
+    for leave, arrive, source, target, trip in connections:
+        if trip in on_trip or best[source] <= leave:
+            on_trip.add(trip)
+            if arrive < best[target]:
+                best[target] = arrive
+            for other, walk in walks.get(target, []):
+                best[other] = min(best[other], arrive + walk)
+    return best
+
+
+@pytest.mark.parametrize('seed', range(12))
+def test_raptor_matches_connection_scan(tmp_path, seed):
+    rng = np.random.default_rng(seed)
+    # stops in a 3 km square, so some are within walking distance of each other
+    stops = {f"S{position}": (40.0 + lat, -75.0 + lon)
+             for position, (lat, lon) in enumerate(rng.uniform(0, 0.027, (30, 2)).tolist())}
+    names = list(stops)
+    trips = []
+    for route_ in range(8):
+        pattern = rng.choice(names, size=int(rng.integers(2, 7)), replace=False).tolist()
+        hops = rng.integers(60, 600, len(pattern) - 1)
+        for trip in range(int(rng.integers(1, 6))):
+            # varying speeds make some trips overtake others
+            times = seconds('07:30') + int(rng.integers(0, 5400)) + np.concatenate(
+                [[0], np.cumsum(hops * rng.uniform(0.6, 1.4, len(hops)))]).astype(int)
+            trips.append((f"T{route_}-{trip}", f"R{route_}", 'WK',
+                          [(stop_id, f"{time // 3600:02d}:{time // 60 % 60:02d}:{time % 60:02d}")
+                           for stop_id, time in zip(pattern, times.tolist())]))
+    feed = str(tmp_path / 'feed')
+    write_feed(feed, {}, trips, fares=False)
+    with open(os.path.join(feed, 'stops.txt'), 'w', encoding='utf-8') as handle:
+        handle.write('stop_id,stop_lat,stop_lon\n'
+                     + ''.join(f"{stop_id},{lat},{lon}\n" for stop_id, (lat, lon) in stops.items()))
+    table = transit.Timetable.build(feed, WEDNESDAY)
+
+    for origin in range(0, table.stop_count, 3):
+        depart = seconds('07:30') + int(rng.integers(0, 3600))
+        search = transit.raptor(table, origin, depart, max_rounds=len(trips) + 1)
+        np.testing.assert_array_equal(search.best, connection_scan(table, origin, depart))
+        for target in np.flatnonzero(search.best < transit.NEVER).tolist():
+            legs = search.legs(target)
+            # the legs chain up from the origin and arrive at the earliest time
+            at, clock = origin, depart
+            for leg in legs:
+                assert leg[1 if leg[0] == 'walk' else 2] == at
+                if leg[0] == 'ride':
+                    assert leg[4] >= clock
+                    at, clock = leg[3], leg[5]
+                else:
+                    at, clock = leg[2], clock + leg[3]
+            assert (at, clock) == (target, search.best[target])
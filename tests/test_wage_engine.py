@@ -0,0 +1,16 @@
+import numpy as np
+
+import wage_engine
+
+
+def test_more_wfh_days_than_work_days_means_no_commute():
+    results = wage_engine.calculate_batch(
+        paycheck=2000.0, daily_hours=8.0, work_days=np.array([5.0, 3.0, 3.0]),
+        wfh_days=np.array([2.0, 3.0, 5.0]), transport=wage_engine.PUBLIC, commute_minutes=30.0,
+        public_monthly_cost=100.0, use_monthly_pass=True, daily_costs=5.0)
+
+    np.testing.assert_array_equal(results['commute_days'], [3.0, 0.0, 0.0])
+    np.testing.assert_array_equal(results['yearly_commute_hours'][1:], 0.0)
+    np.testing.assert_array_equal(results['yearly_commute_costs'][1:], 0.0)
+    np.testing.assert_array_equal(results['true_wage'][1:], results['traditional_wage'][1:])
+    assert (results['true_wage'] <= results['traditional_wage']).all()
@@ -0,0 +1,642 @@
+"""Public transport commute times and fares from a local GTFS feed.
+
+The feed (a directory or .zip with stops.txt, trips.txt, stop_times.txt and
+optionally calendar.txt, calendar_dates.txt, transfers.txt, fare_attributes.txt
+and fare_rules.txt) is compiled once per service date into compact arrays and
+cached next to it as <feed>.<date>.timetable.npz:
+
+- every distinct stop pattern of a GTFS route becomes a route whose trips
+  never overtake each other, so each stop's departures are sorted;
+- route stops are laid out as one flat array of "entries", and each entry's
+  trip times are stored together, so the first catchable trip at every
+  entry is a single np.searchsorted;
+- footpaths link stops within walking distance (and transfers.txt pairs).
+
+Journeys are found with RAPTOR: one round per boarding, each round a handful
+of whole-array operations over all entries at once. A search from one stop
+at one departure time gives the earliest arrival at every stop, so searches
+are memoized per (origin stop, departure window): employees who walk to the
+same stop around the same time share one search.
+
+    python transit.py --feed gtfs.zip --homes roster.csv --offices offices.csv --depart 08:00 -o routed.csv
+
+fills commute_minutes (riding and waiting), public_walking_minutes and, when
+the feed has fares, public_daily_cost (both ways) for the roster's public
+transport rows.
+"""
+import argparse
+import csv
+import datetime
+import io
+import math
+import os
+import sys
+import zipfile
+from collections import OrderedDict
+
+import numpy as np
+
+from roadnet import haversine_m, office_columns, office_label, read_points
+
+WALK_SPEED_KPH = 4.8
+# street distance per straight-line metre
+WALK_DETOUR = 1.3
+MAX_WALK_M = 1000.0
+TRANSFER_RADIUS_M = 300.0
+MAX_ROUNDS = 4  # boardings, i.e. up to three transfers
+DEFAULT_WINDOW_MINUTES = 5
+DEFAULT_CACHE_SIZE = 256
+
+NEVER = np.iinfo(np.int64).max // 4
+# entry * _SCALE + seconds orders all entries' departures in one sorted array
+_SCALE = 1 << 22
+
+# how a stop's label was set in a round
+_NONE, _ORIGIN, _RIDE, _WALK = 0, 1, 2, 3
+
+_TIMETABLE_ARRAYS = (
+    'stop_lat', 'stop_lon', 'route_gtfs', 'entry_stop', 'entry_route', 'entry_start', 'entry_trips',
+    'entry_offset', 'departures', 'arrivals', 'dep_keys', 'path_from', 'path_to', 'path_seconds',
+    'fare_price', 'fare_transfers', 'fare_duration', 'route_fare',
+)
+_TIMETABLE_NAMES = ('stop_ids', 'gtfs_route_ids', 'fare_ids')
+# every file a timetable is built from, for the cache fingerprint
+GTFS_FILES = ('stops.txt', 'trips.txt', 'stop_times.txt', 'calendar.txt', 'calendar_dates.txt',
+              'transfers.txt', 'fare_attributes.txt', 'fare_rules.txt')
+
+
+def walk_seconds(meters):
+    return np.asarray(meters, dtype=np.float64) * WALK_DETOUR / 1000.0 / WALK_SPEED_KPH * 3600.0
+
+
+def parse_time(text):
+    """GTFS 'HH:MM:SS' (hours may pass 24) or 'HH:MM' -> seconds after midnight"""
+    parts = [int(part) for part in text.strip().split(':')]
+    return parts[0] * 3600 + parts[1] * 60 + (parts[2] if len(parts) > 2 else 0)
+
+
+def read_table(feed, name):
+    """Rows of one GTFS file as dicts, or None if the feed does not have it"""
+    if zipfile.is_zipfile(feed):
+        with zipfile.ZipFile(feed) as archive:
+            if name not in archive.namelist():
+                return None
+            text = archive.read(name).decode('utf-8-sig')
+    else:
+        path = os.path.join(feed, name)
+        if not os.path.exists(path):
+            return None
+        with open(path, encoding='utf-8-sig') as handle:
+            text = handle.read()
+    return list(csv.DictReader(io.StringIO(text)))
+
+
+def feed_fingerprint(feed, date):
+    """Identifies the feed's contents and the service date; a directory's own mtime does not change
+    when a file in it is rewritten, so each GTFS file in it is stat'ed"""
+    paths = [feed]
+    if os.path.isdir(feed):
+        paths = [os.path.join(feed, name) for name in GTFS_FILES if os.path.exists(os.path.join(feed, name))]
+    stats = '|'.join(f"{os.path.abspath(path)}:{os.stat(path).st_size}:{os.stat(path).st_mtime_ns}"
+                     for path in paths)
+    return f"{stats}|{date.isoformat()}"
+
+
+def active_services(feed, date):
+    """service_ids running on date, or None when the feed has no calendar at all"""
+    calendar = read_table(feed, 'calendar.txt')
+    exceptions = read_table(feed, 'calendar_dates.txt')
+    if calendar is None and exceptions is None:
+        return None
+    day = date.strftime('%Y%m%d')
+    weekday = date.strftime('%A').lower()
+    services = {row['service_id'] for row in calendar or []
+                if row['start_date'] <= day <= row['end_date'] and row[weekday].strip() == '1'}
+    for row in exceptions or []:
+        if row['date'] == day:
+            if row['exception_type'].strip() == '1':
+                services.add(row['service_id'])
+            else:
+                services.discard(row['service_id'])
+    return services
+
+
+def _fifo_groups(departures, arrivals):
+    # split trips (sorted by first departure) into groups where no trip overtakes an earlier one
+    groups, lasts = [], []
+    for trip in range(len(departures)):
+        for group, last in enumerate(lasts):
+            if (departures[last] <= departures[trip]).all() and (arrivals[last] <= arrivals[trip]).all():
+                groups[group].append(trip)
+                lasts[group] = trip
+                break
+        else:
+            groups.append([trip])
+            lasts.append(trip)
+    return groups
+
+
+class Timetable:
+    """A GTFS feed for one service date as flat NumPy arrays"""
+
+    def __init__(self, arrays, names, fingerprint=''):
+        for name, values in arrays.items():
+            setattr(self, name, values)
+        for name, values in names.items():
+            setattr(self, name, list(values))
+        self.fingerprint = fingerprint
+        self.stop_index = {stop_id: position for position, stop_id in enumerate(self.stop_ids)}
+
+    @property
+    def stop_count(self):
+        return len(self.stop_ids)
+
+    @property
+    def route_count(self):
+        return int(self.entry_route.max()) + 1 if len(self.entry_route) else 0
+
+    @classmethod
+    def build(cls, feed, date, fingerprint=''):
+        stops = read_table(feed, 'stops.txt')
+        trips = read_table(feed, 'trips.txt')
+        stop_times = read_table(feed, 'stop_times.txt')
+        if stops is None or trips is None or stop_times is None:
+            raise ValueError(f"{feed} needs stops.txt, trips.txt and stop_times.txt")
+
+        stop_ids = [row['stop_id'] for row in stops]
+        stop_index = {stop_id: position for position, stop_id in enumerate(stop_ids)}
+        stop_lat = np.array([float(row['stop_lat']) for row in stops])
+        stop_lon = np.array([float(row['stop_lon']) for row in stops])
+
+        services = active_services(feed, date)
+        trip_route = {row['trip_id']: row['route_id'] for row in trips
+                      if services is None or row['service_id'] in services}
+        timed = {}
+        for row in stop_times:
+            trip_id = row['trip_id']
+            if trip_id not in trip_route:
+                continue
+            arrival = row.get('arrival_time', '').strip()
+            departure = row.get('departure_time', '').strip()
+            if not arrival and not departure:
+                continue  # untimed stop
+            timed.setdefault(trip_id, []).append((
+                int(row['stop_sequence']), stop_index[row['stop_id']],
+                parse_time(arrival or departure), parse_time(departure or arrival)))
+
+        patterns = {}
+        for trip_id, rows in timed.items():
+            if len(rows) < 2:
+                continue
+            rows.sort()
+            key = (trip_route[trip_id], tuple(row[1] for row in rows))
+            patterns.setdefault(key, []).append(([row[2] for row in rows], [row[3] for row in rows]))
+
+        gtfs_route_ids = sorted({route_id for route_id, _ in patterns})
+        gtfs_index = {route_id: position for position, route_id in enumerate(gtfs_route_ids)}
+        route_gtfs, entry_stop, entry_route, entry_start, entry_trips = [], [], [], [], []
+        departure_blocks, arrival_blocks = [], []
+        for (route_id, pattern), times in sorted(patterns.items()):
+            arrivals = np.array([trip[0] for trip in times], dtype=np.int64)
+            departures = np.array([trip[1] for trip in times], dtype=np.int64)
+            order = np.lexsort((arrivals[:, -1], departures[:, 0]))
+            arrivals, departures = arrivals[order], departures[order]
+            for group in _fifo_groups(departures, arrivals):
+                route = len(route_gtfs)
+                route_gtfs.append(gtfs_index[route_id])
+                entry_stop.extend(pattern)
+                entry_route.extend([route] * len(pattern))
+                entry_start.extend([True] + [False] * (len(pattern) - 1))
+                entry_trips.extend([len(group)] * len(pattern))
+                # one block per entry: that stop's times for every trip of the route
+                departure_blocks.append(departures[group].T.ravel())
+                arrival_blocks.append(arrivals[group].T.ravel())
+
+        entry_trips = np.array(entry_trips, dtype=np.int64)
+        entry_offset = np.zeros(len(entry_trips) + 1, dtype=np.int64)
+        np.cumsum(entry_trips, out=entry_offset[1:])
+        departures = np.concatenate(departure_blocks) if departure_blocks else np.zeros(0, dtype=np.int64)
+        arrivals = np.concatenate(arrival_blocks) if arrival_blocks else np.zeros(0, dtype=np.int64)
+        entries = np.repeat(np.arange(len(entry_trips), dtype=np.int64), entry_trips)
+
+        path_from, path_to, path_seconds = _footpaths(feed, stop_index, stop_lat, stop_lon)
+        fares = _fares(feed, gtfs_route_ids)
+        arrays = {
+            'stop_lat': stop_lat, 'stop_lon': stop_lon,
+            'route_gtfs': np.array(route_gtfs, dtype=np.int64),
+            'entry_stop': np.array(entry_stop, dtype=np.int64),
+            'entry_route': np.array(entry_route, dtype=np.int64),
+            'entry_start': np.array(entry_start, dtype=bool),
+            'entry_trips': entry_trips, 'entry_offset': entry_offset,
+            'departures': departures, 'arrivals': arrivals,
+            'dep_keys': entries * _SCALE + departures,
+            'path_from': path_from, 'path_to': path_to, 'path_seconds': path_seconds,
+            **fares[0],
+        }
+        names = {'stop_ids': stop_ids, 'gtfs_route_ids': gtfs_route_ids, 'fare_ids': fares[1]}
+        return cls(arrays, names, fingerprint)
+
+    @classmethod
+    def load(cls, feed, date):
+        """Timetable for date, from the <feed>.<date>.timetable.npz cache when it is current"""
+        fingerprint = feed_fingerprint(feed, date)
+        cache_path = f"{feed.rstrip(os.sep)}.{date.isoformat()}.timetable.npz"
+        if os.path.exists(cache_path):
+            with np.load(cache_path, allow_pickle=False) as data:
+                if str(data['fingerprint']) == fingerprint:
+                    return cls({name: data[name] for name in _TIMETABLE_ARRAYS},
+                               {name: data[name].tolist() for name in _TIMETABLE_NAMES}, fingerprint)
+        timetable = cls.build(feed, date, fingerprint)
+        timetable.save(cache_path)
+        return timetable
+
+    def save(self, path):
+        tmp_path = f"{path}.tmp.npz"
+        np.savez(tmp_path, fingerprint=np.array(self.fingerprint),
+                 **{name: getattr(self, name) for name in _TIMETABLE_ARRAYS},
+                 **{name: np.array(getattr(self, name), dtype=str) for name in _TIMETABLE_NAMES})
+        os.replace(tmp_path, path)
+
+    def stops_near(self, lat, lon, max_walk_m=MAX_WALK_M):
+        """(stop positions, walking seconds) within max_walk_m of a point"""
+        meters = haversine_m(lat, lon, self.stop_lat, self.stop_lon)
+        near = np.flatnonzero(meters <= max_walk_m)
+        return near, np.ceil(walk_seconds(meters[near])).astype(np.int64)
+
+    def access_stops(self, lat, lon, max_walk_m=MAX_WALK_M):
+        """stops_near() cut down to the nearest stop of each route; a farther stop on the same
+        route seldom gives an earlier arrival and would cost a search of its own"""
+        near, walks = self.stops_near(lat, lon, max_walk_m)
+        walk_of = np.full(self.stop_count, -1, dtype=np.int64)
+        walk_of[near] = walks
+        entries = np.flatnonzero(walk_of[self.entry_stop] >= 0)
+        order = entries[np.lexsort((walk_of[self.entry_stop[entries]], self.entry_route[entries]))]
+        nearest = order[np.unique(self.entry_route[order], return_index=True)[1]]
+        stops = np.unique(self.entry_stop[nearest])
+        return stops, walk_of[stops]
+
+
+def _footpaths(feed, stop_index, lat, lon):
+    # walking links between stops within TRANSFER_RADIUS_M, plus transfers.txt; the fastest per pair
+    pairs = {}
+    order = np.argsort(lat)
+    sorted_lat = lat[order]
+    radius_deg = TRANSFER_RADIUS_M / 111000.0
+    for position, stop in enumerate(order.tolist()):
+        end = np.searchsorted(sorted_lat, sorted_lat[position] + radius_deg, side='right')
+        others = order[position + 1:end]
+        meters = haversine_m(lat[stop], lon[stop], lat[others], lon[others])
+        close = meters <= TRANSFER_RADIUS_M
+        walks = np.ceil(walk_seconds(meters[close])).astype(np.int64)
+        for other, walk in zip(others[close].tolist(), walks.tolist()):
+            pairs[(stop, other)] = pairs[(other, stop)] = walk
+
+    for row in read_table(feed, 'transfers.txt') or []:
+        source, target = stop_index.get(row['from_stop_id']), stop_index.get(row['to_stop_id'])
+        if source is None or target is None or source == target:
+            continue
+        if row.get('transfer_type', '').strip() not in ('', '0', '2'):
+            continue
+        walk = int(row.get('min_transfer_time') or 0) or int(np.ceil(walk_seconds(
+            haversine_m(lat[source], lon[source], lat[target], lon[target]))))
+        pairs[(source, target)] = min(walk, pairs.get((source, target), walk))
+
+    keys = sorted(pairs)
+    return (np.array([key[0] for key in keys], dtype=np.int64),
+            np.array([key[1] for key in keys], dtype=np.int64),
+            np.array([pairs[key] for key in keys], dtype=np.int64))
+
+
+def _fares(feed, gtfs_route_ids):
+    # GTFS fares v1: a price per fare_id, the routes each applies to and its transfer allowance
+    attributes = read_table(feed, 'fare_attributes.txt') or []
+    fare_ids = [row['fare_id'] for row in attributes]
+    fare_index = {fare_id: position for position, fare_id in enumerate(fare_ids)}
+    route_fare = np.full(len(gtfs_route_ids), -1, dtype=np.int64)
+    rules = read_table(feed, 'fare_rules.txt') or []
+    route_index = {route_id: position for position, route_id in enumerate(gtfs_route_ids)}
+    for row in rules:
+        route = route_index.get(row.get('route_id', ''))
+        fare = fare_index.get(row['fare_id'])
+        if route is not None and fare is not None:
+            current = route_fare[route]
+            if current < 0 or float(attributes[fare]['price']) < float(attributes[current]['price']):
+                route_fare[route] = fare
+    if len(fare_ids) == 1 and not any(row.get('route_id') for row in rules):
+        route_fare[:] = 0  # one flat fare for the whole feed
+    arrays = {
+        'fare_price': np.array([float(row['price']) for row in attributes]),
+        # '' = unlimited transfers -> -1
+        'fare_transfers': np.array([int(row['transfers']) if row.get('transfers', '').strip() else -1
+                                    for row in attributes], dtype=np.int64),
+        'fare_duration': np.array([int(row['transfer_duration']) if row.get('transfer_duration', '').strip()
+                                   else -1 for row in attributes], dtype=np.int64),
+        'route_fare': route_fare,
+    }
+    return arrays, fare_ids
+
+
+class Search:
+    """Labels of one RAPTOR search: arrival seconds at every stop after each round"""
+
+    def __init__(self, timetable, origin, depart, arrival, how, ride_board, ride_alight, ride_trip, walk_from):
+        self.timetable = timetable
+        self.origin = origin
+        self.depart = depart
+        self.arrival = arrival          # (rounds + 1, stops)
+        self.how = how                  # _NONE/_ORIGIN/_RIDE/_WALK per round and stop
+        self.ride_board = ride_board    # entry boarded for the ride that reached the stop
+        self.ride_alight = ride_alight  # entry where that ride was left
+        self.ride_trip = ride_trip
+        self.walk_from = walk_from
+
+    @property
+    def best(self):
+        """Earliest arrival at each stop (NEVER if unreachable)"""
+        return self.arrival[-1]
+
+    def legs(self, stop):
+        """Journey to stop as [('ride', route, board, alight, depart, arrive) or ('walk', from, to, seconds)]
+
+        Stops are positions in timetable.stop_ids and routes in timetable.gtfs_route_ids.
+        """
+        table = self.timetable
+        legs = []
+        round_, force_ride = len(self.arrival) - 1, False
+        while True:
+            if not force_ride:
+                labelled = np.flatnonzero(self.how[:round_ + 1, stop] != _NONE)
+                if not len(labelled):
+                    return None
+                round_ = int(labelled[-1])
+            how = _RIDE if force_ride else self.how[round_, stop]
+            force_ride = False
+            if how == _ORIGIN:
+                break
+            if how == _WALK:
+                source = int(self.walk_from[round_, stop])
+                legs.append(('walk', source, stop, int(self.arrival[round_, stop]
+                                                       - self._ride_arrival(round_, source))))
+                stop = source
+                force_ride = round_ > 0
+                continue
+            board, alight, trip = (int(self.ride_board[round_, stop]), int(self.ride_alight[round_, stop]),
+                                   int(self.ride_trip[round_, stop]))
+            legs.append(('ride', int(table.route_gtfs[table.entry_route[board]]), int(table.entry_stop[board]),
+                         stop, int(table.departures[table.entry_offset[board] + trip]),
+                         int(table.arrivals[table.entry_offset[alight] + trip])))
+            stop = int(table.entry_stop[board])
+            round_ -= 1
+        legs.reverse()
+        return legs
+
+    def _ride_arrival(self, round_, stop):
+        if round_ == 0:
+            return self.depart
+        table = self.timetable
+        alight, trip = int(self.ride_alight[round_, stop]), int(self.ride_trip[round_, stop])
+        return int(table.arrivals[table.entry_offset[alight] + trip])
+
+
+def raptor(timetable, origin, depart, max_rounds=MAX_ROUNDS):
+    """Search from stop origin leaving at depart (seconds after midnight)"""
+    table = timetable
+    stops, entries = table.stop_count, len(table.entry_stop)
+    rows = max_rounds + 1
+    arrival = np.full((rows, stops), NEVER, dtype=np.int64)
+    how = np.zeros((rows, stops), dtype=np.int8)
+    ride_board = np.full((rows, stops), -1, dtype=np.int64)
+    ride_alight = np.full((rows, stops), -1, dtype=np.int64)
+    ride_trip = np.full((rows, stops), -1, dtype=np.int64)
+    walk_from = np.full((rows, stops), -1, dtype=np.int64)
+
+    arrival[0, origin] = depart
+    how[0, origin] = _ORIGIN
+    _relax_footpaths(table, arrival[0], how[0], walk_from[0], np.array([origin]), arrival[0])
+
+    entry_ids = np.arange(entries, dtype=np.int64)
+    # routes are laid out in order, so keys of later routes are always smaller than earlier ones and a
+    # running minimum over the whole array restarts at every route's first entry
+    route_base = (table.route_count - table.entry_route) * (int(table.entry_trips.max(initial=0)) + 1)
+    no_trip = route_base + table.entry_trips
+    # earliest arrival at each stop by a ride; walks leave from these, not from walk labels, so a
+    # better walk label at a stop never hides a walk onwards from a later ride
+    ride_arrival = np.full(stops, NEVER, dtype=np.int64)
+    for round_ in range(1, rows):
+        previous = arrival[round_ - 1]
+        current = arrival[round_]
+        current[:] = previous
+        ready = previous[table.entry_stop]
+        reachable = ready < NEVER
+        found = np.searchsorted(table.dep_keys, entry_ids * _SCALE + np.minimum(ready, _SCALE - 1))
+        catchable = np.where(reachable, np.minimum(found - table.entry_offset[:-1], table.entry_trips),
+                             table.entry_trips)
+        keys = route_base + catchable
+        running = np.minimum.accumulate(keys) if entries else keys
+        # where the trip being ridden was boarded: the last entry at which the running minimum dropped
+        boarded = np.ones(entries, dtype=bool)
+        boarded[1:] = table.entry_start[1:] | (keys[1:] < running[:-1])
+        board_entry = np.maximum.accumulate(np.where(boarded, entry_ids, 0)) if entries else entry_ids
+
+        onboard = np.empty_like(running)
+        onboard[1:] = running[:-1]
+        onboard[table.entry_start] = no_trip[table.entry_start]
+        alight = np.flatnonzero(onboard < no_trip)
+        if not len(alight):
+            break
+        trip = onboard[alight] - route_base[alight]
+        times = table.arrivals[table.entry_offset[alight] + trip]
+        reached = table.entry_stop[alight]
+
+        # earliest ride arrival per stop
+        order = np.lexsort((times, reached))
+        best = order[np.unique(reached[order], return_index=True)[1]]
+        improved = times[best] < ride_arrival[reached[best]]
+        if not improved.any():
+            break
+        best = best[improved]
+        stop_ids, stop_times = reached[best], times[best]
+        ride_arrival[stop_ids] = stop_times
+        ride_alight[round_, stop_ids] = alight[best]
+        ride_board[round_, stop_ids] = board_entry[alight[best] - 1]
+        ride_trip[round_, stop_ids] = trip[best]
+        better = stop_times < current[stop_ids]
+        current[stop_ids[better]] = stop_times[better]
+        how[round_, stop_ids[better]] = _RIDE
+        _relax_footpaths(table, current, how[round_], walk_from[round_], stop_ids, ride_arrival)
+    else:
+        round_ = rows
+    used = max(round_, 1)
+    return Search(timetable, origin, depart, arrival[:used], how[:used], ride_board[:used],
+                  ride_alight[:used], ride_trip[:used], walk_from[:used])
+
+
+def _relax_footpaths(table, arrival, how, walk_from, sources, leave):
+    # one walk from each stop in sources, setting off at its time in leave
+    marked = np.zeros(table.stop_count, dtype=bool)
+    marked[sources] = True
+    paths = np.flatnonzero(marked[table.path_from])
+    if not len(paths):
+        return
+    targets = table.path_to[paths]
+    times = leave[table.path_from[paths]] + table.path_seconds[paths]
+    order = np.lexsort((times, targets))
+    first = order[np.unique(targets[order], return_index=True)[1]]
+    better = times[first] < arrival[targets[first]]
+    improved = targets[first][better]
+    arrival[improved] = times[first][better]
+    how[improved] = _WALK
+    walk_from[improved] = table.path_from[paths[first][better]]
+
+
+def journey_fare(timetable, legs):
+    """Fare for a journey's rides under GTFS fares v1, None when the feed has no fare for a ride"""
+    table = timetable
+    total = 0.0
+    fare = start = used = None
+    for leg in legs:
+        if leg[0] != 'ride':
+            continue
+        route_fare = int(table.route_fare[leg[1]])
+        if route_fare < 0:
+            return None
+        transfers, duration = int(table.fare_transfers[route_fare]), int(table.fare_duration[route_fare])
+        if (route_fare == fare and (transfers < 0 or used < transfers)
+                and (duration < 0 or leg[4] - start <= duration)):
+            used += 1
+            continue
+        total += float(table.fare_price[route_fare])
+        fare, start, used = route_fare, leg[4], 0
+    return total
+
+
+class JourneyPlanner:
+    """Door-to-door public transport journeys, with searches memoized per (stop, departure window)
+
+    A search from a stop reached at time t is run for t rounded up to the
+    next window boundary, so nobody is shown a departure they would miss;
+    at most one window of extra waiting is the price of sharing searches.
+    """
+
+    def __init__(self, timetable, window_minutes=DEFAULT_WINDOW_MINUTES, max_rounds=MAX_ROUNDS,
+                 max_walk_m=MAX_WALK_M, cache_size=DEFAULT_CACHE_SIZE):
+        self.timetable = timetable
+        self.window = max(int(window_minutes * 60), 1)
+        self.max_rounds = max_rounds
+        self.max_walk_m = max_walk_m
+        self.cache_size = cache_size
+        self.cache = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def search(self, stop, ready):
+        depart = -(-int(ready) // self.window) * self.window
+        key = (int(stop), depart)
+        result = self.cache.get(key)
+        if result is not None:
+            self.hits += 1
+            self.cache.move_to_end(key)
+            return result
+        self.misses += 1
+        result = raptor(self.timetable, int(stop), depart, self.max_rounds)
+        self.cache[key] = result
+        if len(self.cache) > self.cache_size:
+            self.cache.popitem(last=False)
+        return result
+
+    def plan(self, home_lat, home_lon, office_lat, office_lon, depart):
+        """Fastest journey leaving home at depart (seconds), as a dict, or None
+
+        Keys: minutes (door to door), walking_minutes, riding_minutes (riding
+        and waiting), fare (None if unknown) and legs.
+        """
+        table = self.timetable
+        direct = float(walk_seconds(haversine_m(home_lat, home_lon, office_lat, office_lon)))
+        best_arrival = depart + direct if direct <= walk_seconds(self.max_walk_m) * 2 else math.inf
+        best = None
+        access, access_walk = table.access_stops(home_lat, home_lon, self.max_walk_m)
+        egress, egress_walk = table.stops_near(office_lat, office_lon, self.max_walk_m)
+        if len(egress):
+            for stop, walk in zip(access.tolist(), access_walk.tolist()):
+                result = self.search(stop, depart + walk)
+                arrive = result.best[egress] + egress_walk
+                position = int(np.argmin(arrive))
+                if arrive[position] < best_arrival and result.best[egress[position]] < NEVER:
+                    best_arrival = int(arrive[position])
+                    best = (result, walk, int(egress[position]), int(egress_walk[position]))
+
+        if best_arrival == math.inf:
+            return None
+        if best is None:
+            return {'minutes': direct / 60, 'walking_minutes': direct / 60, 'riding_minutes': 0.0,
+                    'fare': 0.0, 'legs': []}
+        result, walk_in, stop, walk_out = best
+        legs = result.legs(stop)
+        walking = walk_in + walk_out + sum(leg[3] for leg in legs if leg[0] == 'walk')
+        minutes = (best_arrival - depart) / 60
+        return {'minutes': minutes, 'walking_minutes': walking / 60, 'riding_minutes': minutes - walking / 60,
+                'fare': journey_fare(table, legs), 'legs': legs}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Fill public transport commute times and fares from GTFS")
+    parser.add_argument('--feed', required=True, help="GTFS directory or .zip")
+    parser.add_argument('--homes', required=True, help="roster CSV with home_lat and home_lon columns")
+    parser.add_argument('--offices', required=True, help="CSV of offices with id, lat and lon")
+    parser.add_argument('--output', '-o', default='-', help="roster with the public transport columns filled")
+    parser.add_argument('--date', help="service date YYYY-MM-DD (default: next Wednesday)")
+    parser.add_argument('--depart', default='08:00', help="time leaving home (default 08:00)")
+    parser.add_argument('--window', type=float, default=DEFAULT_WINDOW_MINUTES,
+                        help="departure window in minutes that searches are shared within")
+    parser.add_argument('--max-walk', type=float, default=MAX_WALK_M, help="metres to walk to or from a stop")
+    parser.add_argument('--all', action='store_true', help="fill every row, not only public transport ones")
+    args = parser.parse_args(argv)
+
+    if args.date:
+        date = datetime.date.fromisoformat(args.date)
+    else:
+        today = datetime.date.today()
+        date = today + datetime.timedelta(days=(2 - today.weekday()) % 7 or 7)
+    timetable = Timetable.load(args.feed, date)
+    planner = JourneyPlanner(timetable, args.window, max_walk_m=args.max_walk)
+    depart = parse_time(args.depart)
+
+    homes, home_lat, home_lon = read_points(args.homes, 'home_lat', 'home_lon')
+    offices, office_lat, office_lon = read_points(args.offices, 'lat', 'lon')
+    try:
+        columns = office_columns(homes, [office_label(row, index) for index, row in enumerate(offices)])
+    except ValueError as e:
+        parser.error(str(e))
+
+    names = list(homes[0]) if homes else []
+    names += [name for name in ('commute_minutes', 'public_walking_minutes', 'public_daily_cost')
+              if name not in names]
+    sink = sys.stdout if args.output == '-' else open(args.output, 'w', newline='', encoding='utf-8')
+    unreachable = 0
+    try:
+        writer = csv.DictWriter(sink, names, lineterminator='\n')
+        writer.writeheader()
+        for index, row in enumerate(homes):
+            if args.all or row.get('transport', 'public').strip().lower() == 'public':
+                office = columns[index]
+                journey = planner.plan(home_lat[index], home_lon[index], office_lat[office], office_lon[office],
+                                       depart)
+                if journey is None:
+                    unreachable += 1
+                else:
+                    row['commute_minutes'] = round(journey['riding_minutes'], 1)
+                    row['public_walking_minutes'] = round(journey['walking_minutes'], 1)
+                    if journey['fare'] is not None:
+                        row['public_daily_cost'] = round(journey['fare'] * 2, 2)
+            writer.writerow(row)
+    finally:
+        if sink is not sys.stdout:
+            sink.close()
+    print(f"{planner.misses:,} searches for {len(homes):,} rows ({planner.hits:,} shared)", file=sys.stderr)
+    if unreachable:
+        print(f"{unreachable:,} row(s) have no transit journey within reach; left as they were",
+              file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
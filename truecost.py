@@ -1,3 +1,9 @@
+import argparse
+import sys
+
+from model import Scenario
+
+
 def validate_input(prompt, input_type=float, min_value=None, max_value=None, allow_zero=False):
     """Validate user input with optional range checking"""
     while True:
@@ -83,6 +89,8 @@ def calculate_true_hourly_wage():
     electricity_price = 0
     daily_public_transport_cost = 0
     monthly_pass_cost = 0
+    daily_walking_minutes = 0
+    use_monthly_pass = False
     
     if transport_choice == '2':  # Public Transport
         transport_type = "public_transport"
@@ -99,20 +107,19 @@ def calculate_true_hourly_wage():
             )
             # No need for monthly pass cost
         else:
+            use_monthly_pass = True
             monthly_pass_cost = validate_input(
                 "Monthly pass cost: $", 
                 float, min_value=0
             )
-            # Calculate daily cost from monthly pass
-            daily_public_transport_cost = monthly_pass_cost / (work_days_per_week * 4.33)  # Average weeks per month
+            # the engine spreads the pass over the month's commute days
         
         print("\n--- Additional Public Transport Details ---")
         daily_walking_minutes = validate_input(
             "Daily walking time to/from stations/stops (minutes): ", 
             float, min_value=0
         )
-        # Add walking time to commute time
-        daily_commute_minutes += daily_walking_minutes
+        # walking time is added to the commute time by the engine
         
     elif transport_choice == '3':  # EV
         transport_type = "ev"
@@ -165,74 +172,73 @@ def calculate_true_hourly_wage():
         annual_income = paycheck_amount * 12
         pay_description = f"${paycheck_amount:.2f} per month"
     
-    # Calculate commute costs and time
-    daily_commute_hours = (daily_commute_minutes * 2) / 60  # Round trip
-    
-    # Calculate daily commute costs based on transport type
-    daily_commute_cost = 0
+    # score the inputs with the same engine as the bulk mode and the GUI
+    scenario = Scenario(
+        paycheck=paycheck_amount,
+        pay_frequency=pay_frequency,
+        daily_hours=daily_work_hours,
+        work_days=work_days_per_week,
+        transport=transport_type,
+        commute_minutes=daily_commute_minutes,
+        daily_miles=daily_commute_miles,
+        gas_price=gas_price,
+        mpg=gas_mileage,
+        ev_efficiency=ev_efficiency,
+        electricity_price=electricity_price,
+        public_daily_cost=daily_public_transport_cost,
+        public_monthly_cost=monthly_pass_cost,
+        public_walking_minutes=daily_walking_minutes,
+        use_monthly_pass=use_monthly_pass,
+        daily_costs=daily_other_costs,
+    )
+    result = scenario.score()
+    
+    annual_income = result.annual_income
+    daily_commute_hours = result.daily_commute_hours
+    daily_commute_cost = result.daily_commute_cost
+    
+    # daily cost breakdown text
     cost_details = ""
+    transport_cost = daily_commute_cost - daily_other_costs
     
     if transport_type == "car":
-        round_trip_miles = daily_commute_miles * 2
-        if gas_mileage > 0:
-            daily_fuel_cost = (round_trip_miles / gas_mileage) * gas_price
-        daily_commute_cost = daily_fuel_cost + daily_other_costs
-        cost_details = f"Fuel: ${daily_fuel_cost:.2f}"
+        cost_details = f"Fuel: ${transport_cost:.2f}"
         if daily_other_costs > 0:
             cost_details += f" + Other: ${daily_other_costs:.2f}"
         
     elif transport_type == "ev":
-        round_trip_miles = daily_commute_miles * 2
-        if ev_efficiency > 0:
-            daily_electricity_cost = (round_trip_miles / ev_efficiency) * electricity_price
-        daily_commute_cost = daily_electricity_cost + daily_other_costs
-        cost_details = f"Electricity: ${daily_electricity_cost:.2f}"
+        cost_details = f"Electricity: ${transport_cost:.2f}"
         if daily_other_costs > 0:
             cost_details += f" + Other: ${daily_other_costs:.2f}"
         
     elif transport_type == "public_transport":
-        daily_commute_cost = daily_public_transport_cost + daily_other_costs
-        cost_details = f"Transport fare: ${daily_public_transport_cost:.2f}"
+        cost_details = f"Transport fare: ${transport_cost:.2f}"
         if monthly_pass_cost > 0:
             cost_details += f" (from ${monthly_pass_cost:.2f}/month pass)"
         if daily_other_costs > 0:
             cost_details += f" + Other: ${daily_other_costs:.2f}"
     
     elif transport_type == "biking":
-        daily_commute_cost = daily_other_costs
         cost_details = "No fuel/transportation costs"
         if daily_other_costs > 0:
             cost_details = f"Maintenance/gear: ${daily_other_costs:.2f}"
     
     elif transport_type == "walking":
-        daily_commute_cost = daily_other_costs
         cost_details = "No fuel/transportation costs"
         if daily_other_costs > 0:
             cost_details = f"Gear/other: ${daily_other_costs:.2f}"
     
-    # Yearly calculations
     weekly_work_hours = daily_work_hours * work_days_per_week
     weekly_commute_hours = daily_commute_hours * work_days_per_week
-    weekly_commute_costs = daily_commute_cost * work_days_per_week
     
-    work_weeks_per_year = 50
-    yearly_work_hours = weekly_work_hours * work_weeks_per_year
-    yearly_commute_hours = weekly_commute_hours * work_weeks_per_year
-    yearly_commute_costs = weekly_commute_costs * work_weeks_per_year
+    yearly_work_hours = result.yearly_work_hours
+    yearly_commute_hours = result.yearly_commute_hours
+    yearly_commute_costs = result.yearly_commute_costs
     
-    # Wage calculations
-    if yearly_work_hours > 0:
-        traditional_wage = annual_income / yearly_work_hours
-    else:
-        traditional_wage = 0
-    
-    net_yearly_income = annual_income - yearly_commute_costs
-    total_committed_hours = yearly_work_hours + yearly_commute_hours
-    
-    if total_committed_hours > 0:
-        true_wage = net_yearly_income / total_committed_hours
-    else:
-        true_wage = 0
+    traditional_wage = result.traditional_wage
+    net_yearly_income = result.net_yearly_income
+    total_committed_hours = result.total_committed_hours
+    true_wage = result.true_wage
     
     # Display results
     print("\n" + "="*60)
@@ -264,7 +270,7 @@ def calculate_true_hourly_wage():
     print("-"*60)
     print(f"Work hours per day: {daily_work_hours} hours")
     print(f"Work days per week: {work_days_per_week} days")
-    print(f"Daily commute time: {daily_commute_hours:.1f} hours ({daily_commute_minutes*2:.0f} min total)")
+    print(f"Daily commute time: {daily_commute_hours:.1f} hours ({daily_commute_hours*60:.0f} min total)")
     print(f"Weekly work hours: {weekly_work_hours:.1f} hours")
     print(f"Weekly commute hours: {weekly_commute_hours:.1f} hours")
     print(f"Yearly work hours: {yearly_work_hours:.0f} hours")
@@ -333,8 +339,160 @@ def calculate_true_hourly_wage():
     return true_wage
 
 
-def main():
+def run_bulk(input_path, output_path=None, input_format=None, output_format=None,
+             chunk_size=None, workers=1, state_path=None, calendar=None, prices=None):
+    """Score a CSV/JSONL/binary record file (or stdin) chunk by chunk - no prompts
+
+    With state_path, only records that changed since the run that wrote the
+    state file are recomputed, and the state file is updated afterwards;
+    that path runs in one process, so it cannot be combined with workers.
+    calendar (a workcalendar.WorkCalendar) replaces the default 50-week year
+    with actual workdays. prices (a prices.PriceTables) sets gas and
+    electricity prices from each record's date and region columns.
+    """
+    import batch_io
+    import columnar
+    import incremental
+    import records
+
+    if not input_format:
+        input_format = 'records' if records.is_record_file(input_path) else batch_io.detect_format(input_path)
+    output_format = (output_format or columnar.detect_format(output_path)
+                     or batch_io.detect_format(output_path, default=input_format))
+    chunk_size = chunk_size or batch_io.DEFAULT_CHUNK_SIZE
+    if state_path and workers > 1:
+        raise ValueError("incremental runs (state_path) are single-process; use workers=1")
+    if prices is not None and input_format == 'records':
+        raise ValueError("price tables need CSV/JSONL input with a date column; binary records have no dates")
+    counter = batch_io.ThroughputCounter()
+
+    if output_format in columnar.FORMATS:
+        if not output_path or output_path == '-':
+            raise ValueError(f"{output_format} output needs an --output path")
+        sink = columnar.open_writer(output_path, output_format)
+    else:
+        sink = batch_io.open_output(output_path)
+
+    source = None if input_format == 'records' else batch_io.open_input(input_path)
+    new_state = None
+    try:
+        wrote_header = False
+        if state_path:
+            previous = incremental.RunState.load(state_path)
+            new_state = incremental.StateWriter(state_path)
+            recomputed = 0
+            input_chunks = batch_io.iter_input_chunks(input_path, source, input_format, chunk_size, prices)
+
+            def rescored():
+                nonlocal recomputed
+                rescored_chunks = incremental.iter_rescored(input_chunks, previous, new_state, calendar)
+                for ids, results, changed in rescored_chunks:
+                    recomputed += changed
+                    yield batch_io.finish_chunk(ids, results, output_format)
+
+            chunks = rescored()
+        elif input_format == 'records':
+            chunks = batch_io.iter_processed_records(input_path, output_format, chunk_size, workers,
+                                                     calendar)
+        else:
+            chunks = batch_io.iter_processed_chunks(source, input_format, output_format,
+                                                    chunk_size, workers, calendar, prices)
+        for output, rows, has_ids in chunks:
+            if output_format in columnar.FORMATS:
+                sink.write(output)
+            else:
+                if not wrote_header:
+                    sink.write(batch_io.output_header(has_ids, output_format))
+                    wrote_header = True
+                sink.write(output)
+            counter.add(rows)
+    except BaseException:
+        if new_state is not None:
+            new_state.discard()
+        raise
+    finally:
+        if source is not None and source is not sys.stdin:
+            source.close()
+        if sink is sys.stdout:
+            sink.flush()
+        else:
+            sink.close()
+
+    counter.report(final=True)
+    if state_path:
+        previous.close()
+        new_state.close()
+        print(f"Recomputed {recomputed:,} of {counter.rows:,} records, "
+              f"carried forward {counter.rows - recomputed:,}", file=sys.stderr)
+    return counter.rows
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(
+        description="True hourly wage calculator. Runs interactively unless --input is given.")
+    parser.add_argument('--input', '-i', help="CSV/JSONL file of records to score ('-' for stdin)")
+    parser.add_argument('--output', '-o', help="where to write results (default: stdout)")
+    parser.add_argument('--input-format', choices=['csv', 'jsonl', 'records'],
+                        help="input format (default: guessed from the file name, csv for stdin); "
+                             "records is the fixed-width binary format from --save-records")
+    parser.add_argument('--output-format', choices=['csv', 'jsonl', 'npy', 'arrow', 'parquet'],
+                        help="output format (default: guessed from the file name, else same as input); "
+                             "npy writes a directory of per-column .npy files, arrow/parquet need pyarrow")
+    parser.add_argument('--chunk-size', type=int, default=None,
+                        help="records per chunk in bulk mode (default: 50000)")
+    parser.add_argument('--save-records', metavar='PATH',
+                        help="convert the CSV/JSONL input to a binary record file instead of scoring it")
+    parser.add_argument('--workers', '-w', type=int, default=1,
+                        help="worker processes for bulk mode (default: 1; not with --state)")
+    parser.add_argument('--state', metavar='PATH',
+                        help="incremental mode: only recompute records (by id) that changed since the "
+                             "run that wrote this state file, then update it")
+    parser.add_argument('--calendar-year', type=int, metavar='YEAR',
+                        help="bulk mode: count actual workdays in YEAR (weekdays minus holidays minus "
+                             "--pto-days) instead of a 50-week year")
+    parser.add_argument('--region', default='US',
+                        help="holiday region from holidays.csv for --calendar-year, or 'none' (default: US)")
+    parser.add_argument('--pto-days', type=float, default=0.0,
+                        help="days of paid time off a year, with --calendar-year")
+    parser.add_argument('--gas-prices', metavar='CSV',
+                        help="bulk mode: date,region,price table; records with a date column get the gas "
+                             "price in effect then in their region")
+    parser.add_argument('--electricity-prices', metavar='CSV',
+                        help="bulk mode: the same for electricity prices")
+    args = parser.parse_args(argv)
+    if args.state and args.workers > 1:
+        parser.error("--state runs in one process; drop --workers")
+    return args
+
+
+def main(argv=None):
     """Main program"""
+    args = parse_args(argv)
+    prices = None
+    if args.input and (args.gas_prices or args.electricity_prices):
+        from prices import PriceTables
+        prices = PriceTables.load(args.gas_prices, args.electricity_prices)
+    if args.input and args.save_records:
+        import batch_io
+        source = batch_io.open_input(args.input)
+        try:
+            count = batch_io.convert_to_records(source, args.save_records,
+                                                args.input_format or batch_io.detect_format(args.input),
+                                                args.chunk_size or batch_io.DEFAULT_CHUNK_SIZE, prices)
+        finally:
+            if source is not sys.stdin:
+                source.close()
+        print(f"Wrote {count:,} records to {args.save_records}", file=sys.stderr)
+        return
+    if args.input:
+        calendar = None
+        if args.calendar_year:
+            from workcalendar import WorkCalendar
+            calendar = WorkCalendar(args.calendar_year, args.region, args.pto_days)
+        run_bulk(args.input, args.output, args.input_format, args.output_format, args.chunk_size,
+                 args.workers, args.state, calendar, prices)
+        return
+
     print("Calculate your actual hourly wage including commute time and costs")
     
     while True:
@@ -0,0 +1,154 @@
+"""Fuel economy by make, model and year, from the bundled vehicles.csv.
+
+The table holds approximate EPA combined ratings: mpg for gas and hybrid
+cars, miles per kWh (MPGe / 33.7) for electric ones. VehicleIndex keeps
+every word-suffix of each vehicle's name ("toyota camry 2023", "camry 2023",
+"2023") in one sorted list, so completing what has been typed is a bisect
+for its longest word plus a check of the other words on the few vehicles in
+that range - fast enough to run on every keystroke:
+
+    index = load_index()
+    index.complete('camry hyb')         # [Vehicle(2024 Toyota Camry Hybrid), ...]
+    index.resolve(['2023-tesla-model-3', '2020-honda-civic'])   # (mpg, ev_efficiency) arrays
+
+Bulk-mode records with a 'vehicle' column of ids get their mpg and
+ev_efficiency filled in from the table where the record leaves them blank.
+
+numpy is only imported by resolve(), so the GUI can complete names without
+loading it at startup.
+
+    python vehicles.py camry hybrid
+"""
+import argparse
+import bisect
+import csv
+import functools
+import os
+from dataclasses import dataclass
+
+VEHICLES_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'vehicles.csv')
+VEHICLE_COLUMN = 'vehicle'
+FUELS = ('gas', 'hybrid', 'ev')
+DEFAULT_LIMIT = 10
+
+
+def _words(text):
+    return text.lower().replace(',', ' ').split()
+
+
+@dataclass(frozen=True, slots=True)
+class Vehicle:
+    id: str
+    year: int
+    make: str
+    model: str
+    fuel: str
+    mpg: float = 0.0
+    ev_efficiency: float = 0.0
+
+    @property
+    def label(self):
+        return f"{self.year} {self.make} {self.model}"
+
+    @property
+    def efficiency(self):
+        """'52 mpg' or '3.9 mi/kWh'"""
+        return f"{self.ev_efficiency:g} mi/kWh" if self.fuel == 'ev' else f"{self.mpg:g} mpg"
+
+
+def read_vehicles(path=VEHICLES_PATH):
+    with open(path, newline='', encoding='utf-8') as handle:
+        return [Vehicle(row['id'].strip().lower(), int(row['year']), row['make'], row['model'],
+                        row['fuel'].strip().lower(), float(row['mpg'] or 0), float(row['ev_efficiency'] or 0))
+                for row in csv.DictReader(handle)]
+
+
+class VehicleIndex:
+    """Vehicles in display order (make, model, newest first) with a sorted word-suffix list for completion"""
+
+    def __init__(self, vehicles):
+        self.vehicles = sorted(vehicles, key=lambda v: (v.make.lower(), v.model.lower(), -v.year))
+        self.by_id = {vehicle.id: vehicle for vehicle in self.vehicles}
+        self.words = [_words(f"{v.make} {v.model} {v.year}") for v in self.vehicles]
+        suffixes = sorted((' '.join(words[start:]), position)
+                          for position, words in enumerate(self.words) for start in range(len(words)))
+        self.keys = [key for key, _ in suffixes]
+        self.positions = [position for _, position in suffixes]
+        self._arrays = None
+
+    def __len__(self):
+        return len(self.vehicles)
+
+    def complete(self, text, fuels=None, limit=DEFAULT_LIMIT):
+        """Up to limit vehicles with a word starting with each word of text, in display order"""
+        words = _words(text)
+        if not words:
+            return []
+        # the longest word gives the narrowest range of suffixes; the others are checked per vehicle
+        longest = max(range(len(words)), key=lambda i: len(words[i]))
+        start = bisect.bisect_left(self.keys, words[longest])
+        stop = bisect.bisect_left(self.keys, words[longest] + '\uffff', start)
+        others = words[:longest] + words[longest + 1:]
+        matches = []
+        for position in sorted(set(self.positions[start:stop])):
+            vehicle = self.vehicles[position]
+            if fuels is not None and vehicle.fuel not in fuels:
+                continue
+            if all(any(name.startswith(word) for name in self.words[position]) for word in others):
+                matches.append(vehicle)
+                if len(matches) == limit:
+                    break
+        return matches
+
+    def get(self, vehicle_id):
+        return self.by_id.get(vehicle_id.strip().lower())
+
+    def resolve(self, ids):
+        """(mpg, ev_efficiency) float arrays for vehicle ids, NaN for unknown or blank ids"""
+        import numpy as np
+
+        if self._arrays is None:
+            order = sorted(self.by_id)
+            self._arrays = (np.array(order, dtype=str),
+                            np.array([self.by_id[name].mpg or np.nan for name in order]),
+                            np.array([self.by_id[name].ev_efficiency or np.nan for name in order]))
+        sorted_ids, mpg, ev_efficiency = self._arrays
+        # distinct ids first, so only those are normalized and searched
+        names, inverse = np.unique(np.asarray(ids, dtype=str), return_inverse=True)
+        names = np.char.lower(np.char.strip(names))
+        found = np.minimum(np.searchsorted(sorted_ids, names), max(len(sorted_ids) - 1, 0))
+        known = (sorted_ids[found] == names) if len(sorted_ids) else np.zeros(len(names), dtype=bool)
+        inverse = inverse.reshape(-1)
+        return (np.where(known, mpg[found], np.nan)[inverse],
+                np.where(known, ev_efficiency[found], np.nan)[inverse])
+
+    def apply(self, columns, ids):
+        """Engine columns with mpg/ev_efficiency from the table wherever a row leaves them at 0"""
+        import numpy as np
+
+        mpg, ev_efficiency = self.resolve(ids)
+        columns = dict(columns)
+        for name, values in (('mpg', mpg), ('ev_efficiency', ev_efficiency)):
+            columns[name] = np.where((columns[name] <= 0) & ~np.isnan(values), values, columns[name])
+        return columns
+
+
+@functools.lru_cache(maxsize=None)
+def load_index(path=VEHICLES_PATH):
+    """The index for a vehicles CSV, read once per process"""
+    return VehicleIndex(read_vehicles(path))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Look up vehicle fuel economy and ids")
+    parser.add_argument('words', nargs='+', help="make, model and/or year, or the start of them")
+    parser.add_argument('--fuel', choices=FUELS, action='append', help="only this fuel (repeatable)")
+    parser.add_argument('--limit', type=int, default=25)
+    args = parser.parse_args(argv)
+
+    for vehicle in load_index().complete(' '.join(args.words), args.fuel, args.limit):
+        print(f"{vehicle.id:<36} {vehicle.label:<36} {vehicle.efficiency}")
+
+
+if __name__ == "__main__":
+    main()
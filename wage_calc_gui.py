@@ -1,11 +1,54 @@
+import time
+START_TIME = time.perf_counter()
+
+import argparse
+import os
+import queue
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
 import tkinter as tk
-from tkinter import ttk, messagebox
-import matplotlib.pyplot as plt
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
-import numpy as np
+from tkinter import ttk, messagebox, filedialog
+import math
+from model import Scenario, Result
+from scenario_cache import ScenarioCache, scenario_key, SCHEDULE_FIELDS
+
+# the plotting stack is only needed once a chart is drawn, so it is imported
+# on first use (or warmed in a background thread after the window is up)
+Figure = None
+FigureCanvasTkAgg = None
+_plotting_lock = threading.Lock()
+
+def load_plotting():
+    global Figure, FigureCanvasTkAgg
+    with _plotting_lock:
+        if Figure is None:
+            from matplotlib.figure import Figure as figure_class
+            from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg as canvas_class
+            Figure, FigureCanvasTkAgg = figure_class, canvas_class
+
+# results from earlier sessions, reloaded on start and saved on exit
+DEFAULT_CACHE_PATH = os.path.join(os.path.expanduser('~'), '.true_wage_cache.json')
+
+_warmup_thread = None
+
+def warm_plotting():
+    global _warmup_thread
+    if _warmup_thread is None:
+        _warmup_thread = threading.Thread(target=load_plotting, name="plotting-warmup", daemon=True)
+        _warmup_thread.start()
+
+def plotting_loaded():
+    return Figure is not None
 
 class TrueHourlyWageCalculator:
-    def __init__(self, root):
+    LIVE_DELAY_MS = 150  # debounce for live recompute
+    LIVE_POLL_MS = 16  # ~60 fps check for finished live jobs
+    PLOTTING_POLL_MS = 50  # check for the background matplotlib import behind a deferred chart
+    RANKING_PAGE_SIZE = 25  # rows in the ranking table at a time
+    
+    def __init__(self, root, render_timing=False, cache_path=None):
+        self.render_timing = render_timing
         self.font_family = "Segoe UI"
         self.title_font = (self.font_family, 24, 'bold')
         self.heading_font = (self.font_family, 16, 'bold')
@@ -55,12 +98,54 @@ class TrueHourlyWageCalculator:
         
         self.pay_frequency = tk.StringVar(value="biweekly")
         
+        # results cache, plus keys of what is currently on screen
+        self.cache = ScenarioCache(path=cache_path)
+        self.displayed_results_key = None
+        self.displayed_comparison_key = None
+        
+        # charts are built once and then only updated
+        self.results_chart = None
+        self.results_chart_job = None
+        self.comparison_chart = None
+        self.result_labels = {}
+        self.comparison_labels = {}
+        
+        # N-way ranking: scenario dicts plus the last ranking (numpy arrays)
+        self.ranking_scenarios = []
+        self.ranking_order = None
+        self.ranking_results = None
+        self.ranking_base = None
+        self.ranking_page = 0
+        
+        # live mode: debounced recompute on a worker thread
+        self.live_update_var = tk.BooleanVar(value=False)
+        self.live_job = None
+        self.live_poll_job = None
+        self.live_generation = 0
+        self.live_pending = 0
+        self.live_executor = None
+        self.live_results = queue.Queue()
+        
         self.setup_ui()
+        
+        for var in self.live_input_vars():
+            var.trace_add('write', self.on_input_change)
+
+    def save_cache(self):
+        if self.render_timing:
+            stats = self.cache.stats()
+            print(f"results cache: {stats['hits']} hits, {stats['misses']} misses "
+                  f"({stats['hit_rate']:.0%} hit rate), {stats['size']} entries")
+        if self.cache.path:
+            try:
+                self.cache.save()
+            except OSError as e:
+                print(f"Could not save the results cache: {e}", file=sys.stderr)
 
     def exit_app(self):
         try:
-            if hasattr(self, 'results'):
-                plt.close('all')
+            if self.live_executor is not None:
+                self.live_executor.shutdown(wait=False)
             self.root.quit()
         except:
             self.root.destroy()
@@ -161,7 +246,9 @@ class TrueHourlyWageCalculator:
         ttk.Label(costs_frame, text="parking, tolls, etc.", font=self.body_font, foreground='gray').grid(row=1, column=0, columnspan=3, sticky='w', pady=(0, 5))
         
         ttk.Button(left_column, text="Calculate True Hourly Wage", 
-                  command=self.calculate, style='Accent.TButton').pack(pady=30)
+                  command=self.calculate, style='Accent.TButton').pack(pady=(30, 10))
+        ttk.Checkbutton(left_column, text="Live update as you type", variable=self.live_update_var,
+                       command=self.on_input_change).pack(pady=(0, 30))
         
         # commute time - editable entry
         commute_time_frame = ttk.LabelFrame(right_column, text="Commute Time", padding=15)
@@ -192,87 +279,141 @@ class TrueHourlyWageCalculator:
         self.setup_transport_details()
         
     def setup_transport_details(self, is_comparison=False):
-        # determine which frame and vars to use
+        # panels for every transport type are built once, then swapped in and out
         if is_comparison:
             frame = self.comp_transport_details_frame
             transport_type = self.comp_transport_type.get()
+        else:
+            frame = self.transport_details_frame
+            transport_type = self.transport_type.get()
+        
+        panels_attr = 'comp_transport_panels' if is_comparison else 'transport_panels'
+        panels = getattr(self, panels_attr, None)
+        if panels is None:
+            panels = self.build_transport_panels(frame, is_comparison)
+            setattr(self, panels_attr, panels)
+        
+        frame.config(text=f"{transport_type.title()} Details")
+        
+        panel_name = 'distance' if transport_type in ["biking", "walking"] else transport_type
+        for name, panel in panels.items():
+            if name != panel_name:
+                panel.pack_forget()
+        if panel_name in panels:
+            panels[panel_name].pack(fill='x')
+        if panel_name == 'public':
+            self.on_public_cost_change(is_comparison)
+    
+    def build_transport_panels(self, frame, is_comparison=False):
+        # determine which vars to use
+        if is_comparison:
             daily_miles_var = self.comp_daily_miles_var
             gas_price_var = self.comp_gas_price_var
             mpg_var = self.comp_mpg_var
             ev_efficiency_var = self.comp_ev_efficiency_var
             electricity_price_var = self.comp_electricity_price_var
             public_daily_cost_var = self.comp_public_daily_cost_var
-            public_monthly_cost_var = self.comp_public_monthly_cost_var
             public_walking_minutes_var = self.comp_public_walking_minutes_var
             use_monthly_pass = self.comp_use_monthly_pass
         else:
-            frame = self.transport_details_frame
-            transport_type = self.transport_type.get()
             daily_miles_var = self.daily_miles_var
             gas_price_var = self.gas_price_var
             mpg_var = self.mpg_var
             ev_efficiency_var = self.ev_efficiency_var
             electricity_price_var = self.electricity_price_var
             public_daily_cost_var = self.public_daily_cost_var
-            public_monthly_cost_var = self.public_monthly_cost_var
             public_walking_minutes_var = self.public_walking_minutes_var
             use_monthly_pass = self.use_monthly_pass
         
-        for widget in frame.winfo_children():
-            widget.destroy()
-        
-        frame.config(text=f"{transport_type.title()} Details")
-        
-        if transport_type == "car":
-            ttk.Label(frame, text="One-way Distance:", font=self.body_font).grid(row=0, column=0, sticky='w', pady=8)
-            ttk.Entry(frame, textvariable=daily_miles_var, width=15, font=self.body_font).grid(row=0, column=1, padx=10, pady=8)
-            ttk.Label(frame, text="miles", font=self.body_font).grid(row=0, column=2, sticky='w', pady=8)
-            
-            ttk.Label(frame, text="Gas Price:", font=self.body_font).grid(row=1, column=0, sticky='w', pady=8)
-            ttk.Entry(frame, textvariable=gas_price_var, width=15, font=self.body_font).grid(row=1, column=1, padx=10, pady=8)
-            ttk.Label(frame, text="$/gallon", font=self.body_font).grid(row=1, column=2, sticky='w', pady=8)
-            
-            ttk.Label(frame, text="MPG:", font=self.body_font).grid(row=2, column=0, sticky='w', pady=8)
-            ttk.Entry(frame, textvariable=mpg_var, width=15, font=self.body_font).grid(row=2, column=1, padx=10, pady=8)
-            ttk.Label(frame, text="miles/gallon", font=self.body_font).grid(row=2, column=2, sticky='w', pady=8)
-            
-        elif transport_type == "ev":
-            ttk.Label(frame, text="One-way Distance:", font=self.body_font).grid(row=0, column=0, sticky='w', pady=8)
-            ttk.Entry(frame, textvariable=daily_miles_var, width=15, font=self.body_font).grid(row=0, column=1, padx=10, pady=8)
-            ttk.Label(frame, text="miles", font=self.body_font).grid(row=0, column=2, sticky='w', pady=8)
-            
-            ttk.Label(frame, text="EV Efficiency:", font=self.body_font).grid(row=1, column=0, sticky='w', pady=8)
-            ttk.Entry(frame, textvariable=ev_efficiency_var, width=15, font=self.body_font).grid(row=1, column=1, padx=10, pady=8)
-            ttk.Label(frame, text="mi/kWh", font=self.body_font).grid(row=1, column=2, sticky='w', pady=8)
-            
-            ttk.Label(frame, text="Electricity Price:", font=self.body_font).grid(row=2, column=0, sticky='w', pady=8)
-            ttk.Entry(frame, textvariable=electricity_price_var, width=15, font=self.body_font).grid(row=2, column=1, padx=10, pady=8)
-            ttk.Label(frame, text="$/kWh", font=self.body_font).grid(row=2, column=2, sticky='w', pady=8)
-            
-        elif transport_type == "public":
-            ttk.Radiobutton(frame, text="Daily Cost", variable=use_monthly_pass, value=False, 
-                          command=lambda: self.on_public_cost_change(is_comparison)).grid(row=0, column=0, sticky='w', pady=8, padx=10)
-            ttk.Radiobutton(frame, text="Monthly Pass", variable=use_monthly_pass, value=True, 
-                          command=lambda: self.on_public_cost_change(is_comparison)).grid(row=0, column=1, sticky='w', pady=8, padx=10)
-            
-            cost_label_attr = 'comp_public_cost_label' if is_comparison else 'public_cost_label'
-            cost_entry_attr = 'comp_public_cost_entry' if is_comparison else 'public_cost_entry'
-            
-            setattr(self, cost_label_attr, ttk.Label(frame, text="Daily Cost:", font=self.body_font))
-            getattr(self, cost_label_attr).grid(row=1, column=0, sticky='w', pady=8)
-            setattr(self, cost_entry_attr, ttk.Entry(frame, textvariable=public_daily_cost_var, width=15, font=self.body_font))
-            getattr(self, cost_entry_attr).grid(row=1, column=1, padx=10, pady=8)
-            ttk.Label(frame, text="$", font=self.body_font).grid(row=1, column=2, sticky='w', pady=8)
-            
-            ttk.Label(frame, text="Walking Time to/from Stations:", font=self.body_font).grid(row=2, column=0, sticky='w', pady=8)
-            ttk.Entry(frame, textvariable=public_walking_minutes_var, width=15, font=self.body_font).grid(row=2, column=1, padx=10, pady=8)
-            ttk.Label(frame, text="minutes", font=self.body_font).grid(row=2, column=2, sticky='w', pady=8)
-            
-        elif transport_type in ["biking", "walking"]:
-            ttk.Label(frame, text="One-way Distance:", font=self.body_font).grid(row=0, column=0, sticky='w', pady=8)
-            ttk.Entry(frame, textvariable=daily_miles_var, width=15, font=self.body_font).grid(row=0, column=1, padx=10, pady=8)
-            ttk.Label(frame, text="miles", font=self.body_font).grid(row=0, column=2, sticky='w', pady=8)
+        panels = {}
+        
+        panel = panels['car'] = ttk.Frame(frame)
+        ttk.Label(panel, text="One-way Distance:", font=self.body_font).grid(row=0, column=0, sticky='w', pady=8)
+        ttk.Entry(panel, textvariable=daily_miles_var, width=15, font=self.body_font).grid(row=0, column=1, padx=10, pady=8)
+        ttk.Label(panel, text="miles", font=self.body_font).grid(row=0, column=2, sticky='w', pady=8)
+        
+        ttk.Label(panel, text="Gas Price:", font=self.body_font).grid(row=1, column=0, sticky='w', pady=8)
+        ttk.Entry(panel, textvariable=gas_price_var, width=15, font=self.body_font).grid(row=1, column=1, padx=10, pady=8)
+        ttk.Label(panel, text="$/gallon", font=self.body_font).grid(row=1, column=2, sticky='w', pady=8)
+        
+        ttk.Label(panel, text="MPG:", font=self.body_font).grid(row=2, column=0, sticky='w', pady=8)
+        ttk.Entry(panel, textvariable=mpg_var, width=15, font=self.body_font).grid(row=2, column=1, padx=10, pady=8)
+        ttk.Label(panel, text="miles/gallon", font=self.body_font).grid(row=2, column=2, sticky='w', pady=8)
+        self.add_vehicle_picker(panel, 3, mpg_var, ('gas', 'hybrid'))
+        
+        panel = panels['ev'] = ttk.Frame(frame)
+        ttk.Label(panel, text="One-way Distance:", font=self.body_font).grid(row=0, column=0, sticky='w', pady=8)
+        ttk.Entry(panel, textvariable=daily_miles_var, width=15, font=self.body_font).grid(row=0, column=1, padx=10, pady=8)
+        ttk.Label(panel, text="miles", font=self.body_font).grid(row=0, column=2, sticky='w', pady=8)
+        
+        ttk.Label(panel, text="EV Efficiency:", font=self.body_font).grid(row=1, column=0, sticky='w', pady=8)
+        ttk.Entry(panel, textvariable=ev_efficiency_var, width=15, font=self.body_font).grid(row=1, column=1, padx=10, pady=8)
+        ttk.Label(panel, text="mi/kWh", font=self.body_font).grid(row=1, column=2, sticky='w', pady=8)
+        
+        ttk.Label(panel, text="Electricity Price:", font=self.body_font).grid(row=2, column=0, sticky='w', pady=8)
+        ttk.Entry(panel, textvariable=electricity_price_var, width=15, font=self.body_font).grid(row=2, column=1, padx=10, pady=8)
+        ttk.Label(panel, text="$/kWh", font=self.body_font).grid(row=2, column=2, sticky='w', pady=8)
+        self.add_vehicle_picker(panel, 3, ev_efficiency_var, ('ev',))
+        
+        panel = panels['public'] = ttk.Frame(frame)
+        ttk.Radiobutton(panel, text="Daily Cost", variable=use_monthly_pass, value=False, 
+                      command=lambda: self.on_public_cost_change(is_comparison)).grid(row=0, column=0, sticky='w', pady=8, padx=10)
+        ttk.Radiobutton(panel, text="Monthly Pass", variable=use_monthly_pass, value=True, 
+                      command=lambda: self.on_public_cost_change(is_comparison)).grid(row=0, column=1, sticky='w', pady=8, padx=10)
+        
+        cost_label_attr = 'comp_public_cost_label' if is_comparison else 'public_cost_label'
+        cost_entry_attr = 'comp_public_cost_entry' if is_comparison else 'public_cost_entry'
+        
+        setattr(self, cost_label_attr, ttk.Label(panel, text="Daily Cost:", font=self.body_font))
+        getattr(self, cost_label_attr).grid(row=1, column=0, sticky='w', pady=8)
+        setattr(self, cost_entry_attr, ttk.Entry(panel, textvariable=public_daily_cost_var, width=15, font=self.body_font))
+        getattr(self, cost_entry_attr).grid(row=1, column=1, padx=10, pady=8)
+        ttk.Label(panel, text="$", font=self.body_font).grid(row=1, column=2, sticky='w', pady=8)
+        
+        ttk.Label(panel, text="Walking Time to/from Stations:", font=self.body_font).grid(row=2, column=0, sticky='w', pady=8)
+        ttk.Entry(panel, textvariable=public_walking_minutes_var, width=15, font=self.body_font).grid(row=2, column=1, padx=10, pady=8)
+        ttk.Label(panel, text="minutes", font=self.body_font).grid(row=2, column=2, sticky='w', pady=8)
+        
+        # biking and walking
+        panel = panels['distance'] = ttk.Frame(frame)
+        ttk.Label(panel, text="One-way Distance:", font=self.body_font).grid(row=0, column=0, sticky='w', pady=8)
+        ttk.Entry(panel, textvariable=daily_miles_var, width=15, font=self.body_font).grid(row=0, column=1, padx=10, pady=8)
+        ttk.Label(panel, text="miles", font=self.body_font).grid(row=0, column=2, sticky='w', pady=8)
+        
+        return panels
             
+    def add_vehicle_picker(self, panel, row, efficiency_var, fuels):
+        # type a make/model/year; picking a suggestion fills in the MPG or mi/kWh entry
+        ttk.Label(panel, text="Vehicle:", font=self.body_font).grid(row=row, column=0, sticky='w', pady=8)
+        box = ttk.Combobox(panel, width=32, font=self.body_font)
+        box.grid(row=row, column=1, columnspan=2, sticky='w', padx=10, pady=8)
+        suggestions = {}
+        
+        def on_key(event):
+            if event.keysym in ('Up', 'Down', 'Return', 'Escape', 'Tab'):
+                return
+            start = time.perf_counter()
+            suggestions.clear()
+            for vehicle in self.vehicle_index().complete(box.get(), fuels):
+                suggestions[f"{vehicle.label} ({vehicle.efficiency})"] = vehicle
+            box['values'] = list(suggestions)
+            if self.render_timing:
+                print(f"Vehicle suggestions in {(time.perf_counter() - start) * 1000:.2f} ms")
+        
+        def on_pick(event=None):
+            vehicle = suggestions.get(box.get())
+            if vehicle is not None:
+                efficiency_var.set(vehicle.ev_efficiency if vehicle.fuel == 'ev' else vehicle.mpg)
+        
+        box.bind('<KeyRelease>', on_key)
+        box.bind('<<ComboboxSelected>>', on_pick)
+        box.bind('<Return>', on_pick)
+    
+    def vehicle_index(self):
+        # vehicles.csv is read once the window is up (or on the first keystroke), not at startup
+        import vehicles
+        return vehicles.load_index()
+    
     def on_transport_change(self, is_comparison=False):
         self.setup_transport_details(is_comparison)
         
@@ -417,6 +558,55 @@ class TrueHourlyWageCalculator:
         # comparison results area
         self.comparison_results_frame = ttk.Frame(main_container)
         self.comparison_results_frame.pack(fill='both', expand=True, pady=20)
+        
+        self.setup_ranking_section(main_container)
+    
+    def setup_ranking_section(self, parent):
+        # rank any number of alternatives at once; the table only ever holds one page
+        ranking_frame = ttk.LabelFrame(parent, text="Rank Many Alternatives", padding=15)
+        ranking_frame.pack(fill='both', expand=True, pady=20)
+        
+        buttons_frame = ttk.Frame(ranking_frame)
+        buttons_frame.pack(fill='x', pady=(0, 10))
+        
+        ttk.Button(buttons_frame, text="Add Alternative to List", 
+                  command=self.add_ranking_scenario).pack(side='left', padx=5)
+        ttk.Button(buttons_frame, text="Load from File...", 
+                  command=self.load_ranking_scenarios).pack(side='left', padx=5)
+        ttk.Button(buttons_frame, text="Clear List", 
+                  command=self.clear_ranking_scenarios).pack(side='left', padx=5)
+        ttk.Button(buttons_frame, text="Rank All", 
+                  command=self.rank_alternatives, style='Accent.TButton').pack(side='right', padx=5)
+        
+        self.ranking_status = ttk.Label(ranking_frame, text="No alternatives in the list", 
+                                      font=self.small_font, foreground='gray')
+        self.ranking_status.pack(anchor='w', pady=5)
+        
+        columns = [
+            ('rank', "Rank", 50),
+            ('name', "Scenario", 200),
+            ('transport', "Transport", 130),
+            ('wfh_days', "WFH Days", 80),
+            ('true_wage', "True Wage", 100),
+            ('commute_hours', "Commute Hrs/Yr", 120),
+            ('commute_costs', "Commute $/Yr", 120),
+            ('net_income', "Net Income", 120)
+        ]
+        self.ranking_tree = ttk.Treeview(ranking_frame, columns=[c[0] for c in columns], 
+                                        show='headings', height=self.RANKING_PAGE_SIZE)
+        for name, heading, width in columns:
+            self.ranking_tree.heading(name, text=heading)
+            self.ranking_tree.column(name, width=width, anchor='w' if name == 'name' else 'e')
+        self.ranking_tree.pack(fill='both', expand=True)
+        
+        nav_frame = ttk.Frame(ranking_frame)
+        nav_frame.pack(fill='x', pady=(10, 0))
+        ttk.Button(nav_frame, text="◀ Previous", 
+                  command=lambda: self.show_ranking_page(self.ranking_page - 1)).pack(side='left')
+        ttk.Button(nav_frame, text="Next ▶", 
+                  command=lambda: self.show_ranking_page(self.ranking_page + 1)).pack(side='right')
+        self.ranking_page_label = ttk.Label(nav_frame, text="", font=self.small_font)
+        self.ranking_page_label.pack()
     
     def sync_comparison_values(self):
         # copy current commute values to comparison
@@ -436,124 +626,52 @@ class TrueHourlyWageCalculator:
         # refresh the transport details frame
         self.setup_transport_details(is_comparison=True)
     
-    def calculate_commute_metrics(self, transport_type, commute_minutes, daily_miles, gas_price, mpg, 
-                                  ev_efficiency, electricity_price, public_daily_cost, public_monthly_cost,
-                                  public_walking_minutes, use_monthly_pass, daily_costs):
-        # calculate costs and time for a given commute scenario
-        work_days = self.work_days_var.get()
-        wfh_days = self.wfh_days_var.get()
-        commute_days = work_days - wfh_days  # only commute on non-WFH days
-        
-        if transport_type == "public":
-            commute_minutes += public_walking_minutes
-        
-        daily_commute_hours = (commute_minutes * 2) / 60
-        daily_commute_cost = daily_costs
-        cost_breakdown = ""
-        
-        if transport_type == "car":
-            round_trip_miles = daily_miles * 2
-            daily_fuel_cost = (round_trip_miles / mpg) * gas_price if mpg > 0 else 0
-            daily_commute_cost += daily_fuel_cost
-            cost_breakdown = f"Fuel: ${daily_fuel_cost:.2f}"
-            
-        elif transport_type == "ev":
-            round_trip_miles = daily_miles * 2
-            daily_electricity_cost = (round_trip_miles / ev_efficiency) * electricity_price if ev_efficiency > 0 else 0
-            daily_commute_cost += daily_electricity_cost
-            cost_breakdown = f"Electricity: ${daily_electricity_cost:.2f}"
-            
-        elif transport_type == "public":
-            if use_monthly_pass:
-                monthly_pass = public_monthly_cost
-                daily_transport_cost = monthly_pass / (commute_days * 4.33)
-            else:
-                daily_transport_cost = public_daily_cost
-            daily_commute_cost += daily_transport_cost
-            cost_breakdown = f"Transport: ${daily_transport_cost:.2f}"
-        
-        elif transport_type in ["biking", "walking"]:
-            cost_breakdown = "No fuel/transportation costs"
-            if daily_costs > 0:
-                cost_breakdown = f"Gear/Maintenance: ${daily_costs:.2f}"
-        
-        # account for WFH days
-        weekly_commute_hours = daily_commute_hours * commute_days
-        weekly_commute_costs = daily_commute_cost * commute_days
-        
-        work_weeks_per_year = 50
-        yearly_commute_hours = weekly_commute_hours * work_weeks_per_year
-        yearly_commute_costs = weekly_commute_costs * work_weeks_per_year
-        
-        return {
-            'daily_commute_hours': daily_commute_hours,
-            'daily_commute_cost': daily_commute_cost,
-            'yearly_commute_hours': yearly_commute_hours,
-            'yearly_commute_costs': yearly_commute_costs,
-            'cost_breakdown': cost_breakdown,
-            'commute_days': commute_days
+    def collect_scenario(self, is_comparison=False):
+        # snapshot of the inputs as a Scenario (comparison uses the comp_* commute vars)
+        prefix = 'comp_' if is_comparison else ''
+        values = {
+            'pay_frequency': self.pay_frequency.get(),
+            'paycheck': self.paycheck_var.get(),
+            'daily_hours': self.daily_hours_var.get(),
+            'work_days': self.work_days_var.get(),
+            'wfh_days': self.wfh_days_var.get(),
+            'transport': getattr(self, prefix + 'transport_type').get(),
+            'use_monthly_pass': getattr(self, prefix + 'use_monthly_pass').get(),
         }
+        for name in ('commute_minutes', 'daily_miles', 'gas_price', 'mpg', 'ev_efficiency',
+                     'electricity_price', 'public_daily_cost', 'public_monthly_cost',
+                     'public_walking_minutes', 'daily_costs'):
+            values[name] = getattr(self, f"{prefix}{name}_var").get()
+        return Scenario(**values)
+    
+    def compute_results(self, scenario):
+        # Result for a Scenario from the vectorized engine - no Tk variable access
+        return scenario.score()
+    
+    def cached_results(self, scenario):
+        # (key, results) for a scenario, computing only on a cache miss
+        key = scenario_key(scenario)
+        results = self.cache.get(key)
+        if results is None:
+            results = self.compute_results(scenario)
+            self.cache.put(key, results)
+        return key, results
     
     def calculate(self):
         try:
-            paycheck = self.paycheck_var.get()
-            daily_hours = self.daily_hours_var.get()
-            work_days = self.work_days_var.get()
-            wfh_days = self.wfh_days_var.get()
+            scenario = self.collect_scenario()
             
-            if wfh_days > work_days:
+            if scenario.wfh_days > scenario.work_days:
                 messagebox.showerror("Input Error", "WFH days cannot exceed work days per week")
                 return
             
-            pay_freq = self.pay_frequency.get()
-            if pay_freq == 'daily':
-                annual_income = paycheck * work_days * 50
-            elif pay_freq == 'weekly':
-                annual_income = paycheck * 50
-            elif pay_freq == 'biweekly':
-                annual_income = paycheck * 26
-            elif pay_freq == 'semi_monthly':
-                annual_income = paycheck * 24
-            else:
-                annual_income = paycheck * 12
-            
-            metrics = self.calculate_commute_metrics(
-                self.transport_type.get(), self.commute_minutes_var.get(), self.daily_miles_var.get(),
-                self.gas_price_var.get(), self.mpg_var.get(), self.ev_efficiency_var.get(),
-                self.electricity_price_var.get(), self.public_daily_cost_var.get(),
-                self.public_monthly_cost_var.get(), self.public_walking_minutes_var.get(),
-                self.use_monthly_pass.get(), self.daily_costs_var.get()
-            )
-            
-            weekly_work_hours = daily_hours * work_days
-            work_weeks_per_year = 50
-            yearly_work_hours = weekly_work_hours * work_weeks_per_year
-            
-            traditional_wage = annual_income / yearly_work_hours if yearly_work_hours > 0 else 0
-            net_yearly_income = annual_income - metrics['yearly_commute_costs']
-            total_committed_hours = yearly_work_hours + metrics['yearly_commute_hours']
-            true_wage = net_yearly_income / total_committed_hours if total_committed_hours > 0 else 0
-            
-            self.results = {
-                'traditional_wage': traditional_wage,
-                'true_wage': true_wage,
-                'annual_income': annual_income,
-                'yearly_commute_costs': metrics['yearly_commute_costs'],
-                'net_yearly_income': net_yearly_income,
-                'yearly_work_hours': yearly_work_hours,
-                'yearly_commute_hours': metrics['yearly_commute_hours'],
-                'total_committed_hours': total_committed_hours,
-                'daily_commute_cost': metrics['daily_commute_cost'],
-                'daily_commute_hours': metrics['daily_commute_hours'],
-                'cost_breakdown': metrics['cost_breakdown'],
-                'transport_type': self.transport_type.get(),
-                'daily_miles': self.daily_miles_var.get(),
-                'commute_days': metrics['commute_days'],
-                'wfh_days': wfh_days
-            }
+            key, self.results = self.cached_results(scenario)
+            self.results_scenario = scenario
             
             self.notebook.select(1)
-            self.display_results()
+            start = time.perf_counter()
+            self.show_results(key)
+            self.report_render_time("results", start)
             
             # auto-sync comparison values
             self.sync_comparison_values()
@@ -561,137 +679,408 @@ class TrueHourlyWageCalculator:
         except Exception as e:
             messagebox.showerror("Calculation Error", f"An error occurred: {str(e)}")
     
+    def report_render_time(self, view, start):
+        # --render-timing: widget updates plus the layout pass they trigger
+        if not self.render_timing:
+            return
+        self.root.update_idletasks()
+        print(f"{view} rendered in {(time.perf_counter() - start) * 1000:.1f} ms")
+    
+    def show_results(self, key, live=False):
+        # same inputs as what is already shown - nothing to do
+        if key == self.displayed_results_key:
+            return
+        self.display_results(live)
+        self.displayed_results_key = key
+    
+    def live_input_vars(self):
+        return [self.paycheck_var, self.daily_hours_var, self.work_days_var, self.wfh_days_var,
+                self.commute_minutes_var, self.daily_miles_var, self.gas_price_var, self.mpg_var,
+                self.daily_costs_var, self.transport_type, self.ev_efficiency_var,
+                self.electricity_price_var, self.public_daily_cost_var, self.public_monthly_cost_var,
+                self.public_walking_minutes_var, self.use_monthly_pass, self.pay_frequency]
+    
+    def on_input_change(self, *args):
+        if not self.live_update_var.get():
+            return
+        if self.live_job is not None:
+            self.root.after_cancel(self.live_job)
+        self.live_job = self.root.after(self.LIVE_DELAY_MS, self.start_live_recompute)
+    
+    def start_live_recompute(self):
+        self.live_job = None
+        try:
+            scenario = self.collect_scenario()
+        except (tk.TclError, ValueError):
+            return  # an entry is half typed
+        if scenario.wfh_days > scenario.work_days:
+            return
+        
+        self.live_generation += 1
+        generation = self.live_generation
+        key = scenario_key(scenario)
+        cached = self.cache.get(key)
+        if cached is not None:
+            self.apply_live_results(key, scenario, cached)
+            return
+        
+        if self.live_executor is None:
+            self.live_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='live-recompute')
+        future = self.live_executor.submit(self.compute_results, scenario)
+        future.add_done_callback(lambda f: self.live_results.put((generation, key, scenario, f)))
+        self.live_pending += 1
+        if self.live_poll_job is None:
+            self.live_poll_job = self.root.after(self.LIVE_POLL_MS, self.poll_live_results)
+    
+    def poll_live_results(self):
+        # Tk is not thread safe, so finished jobs are picked up here on the main thread
+        self.live_poll_job = None
+        while True:
+            try:
+                generation, key, scenario, future = self.live_results.get_nowait()
+            except queue.Empty:
+                break
+            self.live_pending -= 1
+            if future.exception() is not None:
+                continue
+            self.cache.put(key, future.result())
+            if generation == self.live_generation:  # ignore results overtaken by newer input
+                self.apply_live_results(key, scenario, future.result())
+        if self.live_pending > 0:
+            self.live_poll_job = self.root.after(self.LIVE_POLL_MS, self.poll_live_results)
+    
+    def apply_live_results(self, key, scenario, results):
+        self.results = results
+        self.results_scenario = scenario
+        self.show_results(key, live=True)
+    
     def compare_commutes(self):
         try:
             if not hasattr(self, 'results'):
                 messagebox.showinfo("Calculate First", "Please calculate your current commute first in the Calculator tab")
                 return
             
-            # calculate alternative commute
-            alt_metrics = self.calculate_commute_metrics(
-                self.comp_transport_type.get(), self.comp_commute_minutes_var.get(), 
-                self.comp_daily_miles_var.get(), self.comp_gas_price_var.get(), self.comp_mpg_var.get(),
-                self.comp_ev_efficiency_var.get(), self.comp_electricity_price_var.get(),
-                self.comp_public_daily_cost_var.get(), self.comp_public_monthly_cost_var.get(),
-                self.comp_public_walking_minutes_var.get(), self.comp_use_monthly_pass.get(),
-                self.comp_daily_costs_var.get()
-            )
+            # calculate alternative commute (same pay and schedule as the current results)
+            alt_scenario = self.collect_scenario(is_comparison=True).replace(
+                **{name: getattr(self.results_scenario, name) for name in SCHEDULE_FIELDS})
+            alt_key, alt_metrics = self.cached_results(alt_scenario)
             
-            # clear previous results
-            for widget in self.comparison_results_frame.winfo_children():
-                widget.destroy()
-            
-            # display comparison
-            ttk.Label(self.comparison_results_frame, text="Comparison Results", 
-                     font=self.heading_font).pack(pady=20)
-            
-            # create comparison table
-            comparison_frame = ttk.Frame(self.comparison_results_frame)
-            comparison_frame.pack(fill='x', padx=20, pady=10)
+            comparison_key = (self.displayed_results_key, alt_key)
+            if comparison_key == self.displayed_comparison_key:
+                return
+            # cleared while the view is half updated, so a failed render is retried next time
+            self.displayed_comparison_key = None
+            start = time.perf_counter()
             
-            headers = ["Metric", "Current Commute", "Alternative Commute", "Difference"]
-            for col, header in enumerate(headers):
-                ttk.Label(comparison_frame, text=header, font=self.subheading_font).grid(
-                    row=0, column=col, padx=10, pady=10, sticky='w')
+            if not self.comparison_labels:
+                self.build_comparison_view()
             
             # comparison metrics
             current = self.results
-            alt_annual_income = current['annual_income']
-            alt_net_income = alt_annual_income - alt_metrics['yearly_commute_costs']
-            alt_total_hours = current['yearly_work_hours'] + alt_metrics['yearly_commute_hours']
-            alt_true_wage = alt_net_income / alt_total_hours if alt_total_hours > 0 else 0
+            alt_true_wage = alt_metrics.true_wage
             
             comparisons = [
-                ("Daily Commute Time", f"{current['daily_commute_hours']:.1f} hrs", 
-                 f"{alt_metrics['daily_commute_hours']:.1f} hrs",
-                 f"{current['daily_commute_hours'] - alt_metrics['daily_commute_hours']:+.1f} hrs"),
-                ("Daily Commute Cost", f"${current['daily_commute_cost']:.2f}",
-                 f"${alt_metrics['daily_commute_cost']:.2f}",
-                 f"${current['daily_commute_cost'] - alt_metrics['daily_commute_cost']:+.2f}"),
-                ("Yearly Commute Hours", f"{current['yearly_commute_hours']:.0f} hrs",
-                 f"{alt_metrics['yearly_commute_hours']:.0f} hrs",
-                 f"{current['yearly_commute_hours'] - alt_metrics['yearly_commute_hours']:+.0f} hrs"),
-                ("Yearly Commute Costs", f"${current['yearly_commute_costs']:,.2f}",
-                 f"${alt_metrics['yearly_commute_costs']:,.2f}",
-                 f"${current['yearly_commute_costs'] - alt_metrics['yearly_commute_costs']:+,.2f}"),
-                ("True Hourly Wage", f"${current['true_wage']:.2f}",
+                ("Daily Commute Time", f"{current.daily_commute_hours:.1f} hrs", 
+                 f"{alt_metrics.daily_commute_hours:.1f} hrs",
+                 f"{current.daily_commute_hours - alt_metrics.daily_commute_hours:+.1f} hrs"),
+                ("Daily Commute Cost", f"${current.daily_commute_cost:.2f}",
+                 f"${alt_metrics.daily_commute_cost:.2f}",
+                 f"${current.daily_commute_cost - alt_metrics.daily_commute_cost:+.2f}"),
+                ("Yearly Commute Hours", f"{current.yearly_commute_hours:.0f} hrs",
+                 f"{alt_metrics.yearly_commute_hours:.0f} hrs",
+                 f"{current.yearly_commute_hours - alt_metrics.yearly_commute_hours:+.0f} hrs"),
+                ("Yearly Commute Costs", f"${current.yearly_commute_costs:,.2f}",
+                 f"${alt_metrics.yearly_commute_costs:,.2f}",
+                 f"${current.yearly_commute_costs - alt_metrics.yearly_commute_costs:+,.2f}"),
+                ("True Hourly Wage", f"${current.true_wage:.2f}",
                  f"${alt_true_wage:.2f}",
-                 f"${alt_true_wage - current['true_wage']:+.2f}")
+                 f"${alt_true_wage - current.true_wage:+.2f}")
             ]
             
             for row, (metric, curr, alt, diff) in enumerate(comparisons, start=1):
-                ttk.Label(comparison_frame, text=metric, font=self.detail_font).grid(
-                    row=row, column=0, padx=10, pady=5, sticky='w')
-                ttk.Label(comparison_frame, text=curr, font=self.detail_font).grid(
-                    row=row, column=1, padx=10, pady=5, sticky='w')
-                ttk.Label(comparison_frame, text=alt, font=self.detail_font).grid(
-                    row=row, column=2, padx=10, pady=5, sticky='w')
-                
                 # color code difference
                 color = '#27ae60' if '-' not in diff or diff.startswith('$+') or diff.endswith('+.2f}') else '#c0392b'
                 if metric == "True Hourly Wage":
                     color = '#27ae60' if '+' in diff else '#c0392b'
-                ttk.Label(comparison_frame, text=diff, font=self.detail_font, foreground=color).grid(
-                    row=row, column=3, padx=10, pady=5, sticky='w')
+                
+                for col, text in enumerate((metric, curr, alt, diff)):
+                    label = self.comparison_labels[(row, col)]
+                    if label.cget('text') != text:
+                        label.config(text=text)
+                if str(self.comparison_labels[(row, 3)].cget('foreground')) != color:
+                    self.comparison_labels[(row, 3)].config(foreground=color)
             
             # visualization
             self.create_comparison_visualization(current, alt_metrics, alt_true_wage)
+            self.displayed_comparison_key = comparison_key
+            self.report_render_time("comparison", start)
             
         except Exception as e:
             messagebox.showerror("Comparison Error", f"An error occurred: {str(e)}")
     
+    def update_ranking_status(self):
+        count = len(self.ranking_scenarios)
+        text = f"{count} alternative{'s' if count != 1 else ''} in the list" if count else "No alternatives in the list"
+        self.ranking_status.config(text=text)
+    
+    def add_ranking_scenario(self):
+        # commute inputs only - pay and schedule come from the Calculator tab when ranking
+        try:
+            scenario = self.collect_scenario(is_comparison=True).to_dict()
+        except tk.TclError:
+            messagebox.showerror("Input Error", "Please enter valid numbers for the alternative commute")
+            return
+        for name in SCHEDULE_FIELDS:
+            scenario.pop(name)
+        scenario['name'] = f"Alternative {len(self.ranking_scenarios) + 1} ({scenario['transport']})"
+        self.ranking_scenarios.append(scenario)
+        self.update_ranking_status()
+    
+    def load_ranking_scenarios(self):
+        path = filedialog.askopenfilename(
+            title="Load Alternatives",
+            filetypes=[("CSV or JSON lines", "*.csv *.jsonl *.ndjson"), ("All files", "*.*")])
+        if not path:
+            return
+        import ranking
+        try:
+            self.ranking_scenarios.extend(ranking.read_scenarios(path))
+        except Exception as e:
+            messagebox.showerror("Load Error", f"Could not read {path}: {str(e)}")
+            return
+        self.update_ranking_status()
+    
+    def clear_ranking_scenarios(self):
+        self.ranking_scenarios = []
+        self.ranking_order = None
+        self.ranking_results = None
+        self.update_ranking_status()
+        self.show_ranking_page(0)
+    
+    def rank_alternatives(self):
+        if not self.ranking_scenarios:
+            messagebox.showinfo("Nothing to Rank", "Add alternatives to the list or load them from a file first")
+            return
+        try:
+            # numpy is only needed here, so it is not loaded at startup
+            import ranking
+            self.ranking_base = self.collect_scenario().to_dict()
+            self.ranking_order, self.ranking_results = ranking.rank_scenarios(self.ranking_scenarios, 
+                                                                             self.ranking_base)
+        except Exception as e:
+            messagebox.showerror("Ranking Error", f"An error occurred: {str(e)}")
+            return
+        self.show_ranking_page(0)
+    
+    def ranking_row(self, rank, index):
+        import ranking
+        scenario = self.ranking_scenarios[index]
+        r = self.ranking_results
+        base = self.ranking_base
+        transport = scenario.get('transport_type', scenario.get('transport', base['transport']))
+        return (rank, ranking.scenario_label(scenario, index), transport,
+                f"{float(scenario.get('wfh_days', base['wfh_days'])):g}",
+                f"${r['true_wage'][index]:.2f}",
+                f"{r['yearly_commute_hours'][index]:.0f}",
+                f"${r['yearly_commute_costs'][index]:,.2f}",
+                f"${r['net_yearly_income'][index]:,.2f}")
+    
+    def show_ranking_page(self, page):
+        # only the rows of one page exist in the tree; existing items are reused
+        count = len(self.ranking_order) if self.ranking_order is not None else 0
+        pages = max(1, math.ceil(count / self.RANKING_PAGE_SIZE))
+        page = min(max(page, 0), pages - 1)
+        self.ranking_page = page
+        
+        start = page * self.RANKING_PAGE_SIZE
+        indices = self.ranking_order[start:start + self.RANKING_PAGE_SIZE] if count else []
+        rows = [self.ranking_row(start + i + 1, int(index)) for i, index in enumerate(indices)]
+        
+        items = self.ranking_tree.get_children()
+        for item, values in zip(items, rows):
+            self.ranking_tree.item(item, values=values)
+        for values in rows[len(items):]:
+            self.ranking_tree.insert('', 'end', values=values)
+        if len(items) > len(rows):
+            self.ranking_tree.delete(*items[len(rows):])
+        
+        self.ranking_page_label.config(text=f"Page {page + 1} of {pages}" if count else "")
+    
+    def build_comparison_view(self):
+        # the comparison table is created once and then only updated
+        ttk.Label(self.comparison_results_frame, text="Comparison Results", 
+                 font=self.heading_font).pack(pady=20)
+        
+        comparison_frame = ttk.Frame(self.comparison_results_frame)
+        comparison_frame.pack(fill='x', padx=20, pady=10)
+        
+        headers = ["Metric", "Current Commute", "Alternative Commute", "Difference"]
+        for col, header in enumerate(headers):
+            ttk.Label(comparison_frame, text=header, font=self.subheading_font).grid(
+                row=0, column=col, padx=10, pady=10, sticky='w')
+        
+        for row in range(1, 6):
+            for col in range(4):
+                label = ttk.Label(comparison_frame, font=self.detail_font)
+                label.grid(row=row, column=col, padx=10, pady=5, sticky='w')
+                self.comparison_labels[(row, col)] = label
+        
+        self.get_comparison_chart()['vis_frame'].pack(fill='x', padx=20, pady=20)
+    
+    def get_comparison_chart(self):
+        # figure, canvas and artists are created on first use only
+        if self.comparison_chart is None:
+            load_plotting()
+            vis_frame = ttk.LabelFrame(self.comparison_results_frame, text="Visual Comparison", padding=15)
+            
+            fig = Figure(figsize=(12, 5))
+            fig.patch.set_facecolor('#f0f0f0')
+            ax1, ax2 = fig.subplots(1, 2)
+            
+            # wage comparison
+            labels = ['Current\nTrue Wage', 'Alternative\nTrue Wage']
+            wage_bars = ax1.bar(labels, [0, 0], color=['#3498db', '#27ae60'])
+            ax1.set_ylabel('True Hourly Wage ($)', fontsize=11)
+            ax1.set_title('True Wage Comparison', fontsize=12, fontweight='bold')
+            wage_texts = [ax1.text(bar.get_x() + bar.get_width()/2., 0, '', ha='center', va='bottom', fontsize=10)
+                          for bar in wage_bars]
+            
+            # yearly cost comparison
+            x = [0, 1]
+            width = 0.35
+            cost_bars = [ax2.bar(x[0], 0, width, label='Current', color='#e74c3c')[0],
+                         ax2.bar(x[1], 0, width, label='Alternative', color='#2ecc71')[0]]
+            ax2.set_ylabel('Yearly Commute Costs ($)', fontsize=11)
+            ax2.set_title('Annual Commute Cost Comparison', fontsize=12, fontweight='bold')
+            ax2.set_xticks(x)
+            ax2.set_xticklabels(['Current', 'Alternative'])
+            ax2.legend()
+            cost_texts = [ax2.text(i, 0, '', ha='center', va='bottom', fontsize=10) for i in range(2)]
+            
+            canvas = FigureCanvasTkAgg(fig, master=vis_frame)
+            canvas.get_tk_widget().pack(fill='both', expand=True)
+            
+            self.comparison_chart = {
+                'vis_frame': vis_frame, 'figure': fig, 'canvas': canvas,
+                'wage_axes': ax1, 'wage_bars': wage_bars, 'wage_texts': wage_texts,
+                'cost_axes': ax2, 'cost_bars': cost_bars, 'cost_texts': cost_texts
+            }
+        return self.comparison_chart
+    
     def create_comparison_visualization(self, current, alt_metrics, alt_true_wage):
-        vis_frame = ttk.LabelFrame(self.comparison_results_frame, text="Visual Comparison", padding=15)
-        vis_frame.pack(fill='x', padx=20, pady=20)
-        
-        fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(12, 5))
-        fig.patch.set_facecolor('#f0f0f0')
-        
-        # wage comparison
-        labels = ['Current\nTrue Wage', 'Alternative\nTrue Wage']
-        values = [current['true_wage'], alt_true_wage]
-        colors = ['#3498db', '#27ae60']
-        
-        bars = ax1.bar(labels, values, color=colors)
-        ax1.set_ylabel('True Hourly Wage ($)', fontsize=11)
-        ax1.set_title('True Wage Comparison', fontsize=12, fontweight='bold')
-        
-        for bar, value in zip(bars, values):
-            height = bar.get_height()
-            ax1.text(bar.get_x() + bar.get_width()/2., height + 0.5,
-                    f'${value:.2f}', ha='center', va='bottom', fontsize=10)
-        
-        # yearly cost comparison
-        x = np.arange(2)
-        width = 0.35
-        
-        current_costs = current['yearly_commute_costs']
-        alt_costs = alt_metrics['yearly_commute_costs']
-        
-        ax2.bar(x[0], current_costs, width, label='Current', color='#e74c3c')
-        ax2.bar(x[1], alt_costs, width, label='Alternative', color='#2ecc71')
-        
-        ax2.set_ylabel('Yearly Commute Costs ($)', fontsize=11)
-        ax2.set_title('Annual Commute Cost Comparison', fontsize=12, fontweight='bold')
-        ax2.set_xticks(x)
-        ax2.set_xticklabels(['Current', 'Alternative'])
-        ax2.legend()
-        
-        for i, (cost, label) in enumerate([(current_costs, 'Current'), (alt_costs, 'Alternative')]):
-            ax2.text(i, cost + 100, f'${cost:,.0f}', ha='center', va='bottom', fontsize=10)
-        
-        plt.tight_layout()
-        
-        canvas = FigureCanvasTkAgg(fig, master=vis_frame)
-        canvas.draw()
-        canvas.get_tk_widget().pack(fill='both', expand=True)
+        chart = self.get_comparison_chart()
+        
+        values = [current.true_wage, alt_true_wage]
+        for bar, text, value in zip(chart['wage_bars'], chart['wage_texts'], values):
+            bar.set_height(value)
+            text.set_position((bar.get_x() + bar.get_width()/2., value + 0.5))
+            text.set_text(f'${value:.2f}')
+        self.fit_bar_axes(chart['wage_axes'], values, 0.5)
+        
+        costs = [current.yearly_commute_costs, alt_metrics.yearly_commute_costs]
+        for i, (bar, text, cost) in enumerate(zip(chart['cost_bars'], chart['cost_texts'], costs)):
+            bar.set_height(cost)
+            text.set_position((i, cost + 100))
+            text.set_text(f'${cost:,.0f}')
+        self.fit_bar_axes(chart['cost_axes'], costs, 100)
+        
+        chart['figure'].tight_layout()
+        chart['canvas'].draw_idle()
     
-    def display_results(self):
-        for widget in self.scrollable_frame.winfo_children():
-            widget.destroy()
-        
-        r = self.results
+    def fit_bar_axes(self, ax, values, label_offset):
+        # leave room above the tallest bar for its value label
+        low = min(0, min(values))
+        high = max(0, max(values))
+        span = (high - low) or 1
+        ax.set_ylim(low - (0.05 * span if low < 0 else 0), high + label_offset + 0.1 * span)
+    
+    def result_visibility(self, s, r):
+        # optional rows on the results tab and whether they apply to these results
+        return {
+            'reduction': r.traditional_wage - r.true_wage > 0,
+            'round_trip': s.transport in ['car', 'ev', 'biking', 'walking'],
+            'additional_costs': s.daily_costs > 0 and s.transport not in ['biking', 'walking'],
+            'cost_percentage': r.annual_income > 0,
+            'biweekly': s.pay_frequency == 'biweekly'
+        }
+    
+    def cost_breakdown(self, s, r):
+        # what the daily commute cost is made of, on the results tab
+        transport_cost = r.daily_commute_cost - s.daily_costs
+        if s.transport == "car":
+            return f"Fuel: ${transport_cost:.2f}"
+        if s.transport == "ev":
+            return f"Electricity: ${transport_cost:.2f}"
+        if s.transport == "public":
+            return f"Transport: ${transport_cost:.2f}"
+        if s.daily_costs > 0:
+            return f"Gear/Maintenance: ${s.daily_costs:.2f}"
+        return "No fuel/transportation costs"
+    
+    def result_texts(self, s, r):
+        # text of every value label on the results tab, keyed by label name
+        transport_names = {
+            'car': 'Car (Gas)',
+            'ev': 'Electric Vehicle',
+            'public': 'Public Transport',
+            'biking': 'Biking',
+            'walking': 'Walking'
+        }
+        diff = r.traditional_wage - r.true_wage
+        texts = {
+            'traditional_wage': f"${r.traditional_wage:.2f}",
+            'difference': f"${diff:.2f} per hour",
+            'true_wage': f"${r.true_wage:.2f}",
+            'reduction': f"Commute reduces wage by ${diff:.2f}/hr",
+            'daily_work_hours': f"{s.daily_hours:.1f} hrs",
+            'daily_commute_hours': f"{r.daily_commute_hours:.1f} hrs",
+            'commute_days': f"{r.commute_days:.0f} days",
+            'wfh_days': f"{s.wfh_days:.0f} days",
+            'weekly_work_hours': f"{s.daily_hours * s.work_days:.1f} hrs",
+            'weekly_commute_hours': f"{r.daily_commute_hours * r.commute_days:.1f} hrs",
+            'yearly_work_hours': f"{r.yearly_work_hours:.0f} hrs",
+            'yearly_commute_hours': f"{r.yearly_commute_hours:.0f} hrs",
+            'total_committed_hours': f"{r.total_committed_hours:.0f} hrs",
+            'transportation': f"Transportation: {transport_names.get(s.transport, s.transport)}",
+            'round_trip': f"Round Trip Distance: {s.daily_miles * 2:.1f} miles",
+            'cost_breakdown': f"Daily Cost Breakdown: {self.cost_breakdown(s, r)}",
+            'additional_costs': f"+ Additional Costs: ${s.daily_costs:.2f}",
+            'daily_commute_cost': f"Total Daily Commute Cost: ${r.daily_commute_cost:.2f}",
+            'annual_income': f"${r.annual_income:,.2f}",
+            'yearly_commute_costs': f"${r.yearly_commute_costs:,.2f}",
+            'net_yearly_income': f"${r.net_yearly_income:,.2f}",
+        }
+        if r.annual_income > 0:
+            cost_percentage = (r.yearly_commute_costs / r.annual_income) * 100
+            texts['cost_percentage'] = f"Commute costs consume {cost_percentage:.1f}% of your take-home pay"
+        
+        paycheck = s.paycheck
+        biweekly_commute_cost = r.daily_commute_cost * r.commute_days * 2
+        biweekly_commute_hours = r.daily_commute_hours * r.commute_days * 2
+        percentage = (biweekly_commute_cost / paycheck) * 100 if paycheck > 0 else 0
+        texts['biweekly_costs'] = (f"Take-home: ${paycheck:.2f} | Commute costs: ${biweekly_commute_cost:.2f} | "
+                                   f"Effective: ${paycheck - biweekly_commute_cost:.2f}")
+        texts['biweekly_time'] = (f"Commute time: {biweekly_commute_hours:.1f} hours | "
+                                  f"Commute eats {percentage:.1f}% of your paycheck")
+        return texts
+    
+    def set_rows_visible(self, name, visible):
+        # grid_remove() remembers the grid options, so grid() puts the row back in place
+        if self.row_visible.get(name) == visible:
+            return
+        for widget in self.result_rows[name]:
+            if visible:
+                widget.grid()
+            else:
+                widget.grid_remove()
+        self.row_visible[name] = visible
     
+    def build_results_view(self):
+        # every results widget is created once; later calculations only change text and visibility
+        self.result_labels = labels = {}
+        self.result_rows = rows = {}
+        self.row_visible = {}
+        
         header_frame = ttk.Frame(self.scrollable_frame)
         header_frame.pack(fill='x', padx=20, pady=20)
         
@@ -705,171 +1094,213 @@ class TrueHourlyWageCalculator:
 
         ttk.Label(wage_frame, text="Traditional Hourly Wage:", 
                 font=self.heading_font).grid(row=0, column=0, sticky='w', padx=10, pady=5)
-        ttk.Label(wage_frame, text=f"${r['traditional_wage']:.2f}", 
-                font=self.heading_font, foreground='#2c3e50').grid(row=1, column=0, sticky='w', padx=10, pady=5)
+        labels['traditional_wage'] = ttk.Label(wage_frame, font=self.heading_font, foreground='#2c3e50')
+        labels['traditional_wage'].grid(row=1, column=0, sticky='w', padx=10, pady=5)
 
-        diff = r['traditional_wage'] - r['true_wage']
         ttk.Label(wage_frame, text="Difference:", 
                 font=self.heading_font).grid(row=0, column=1, sticky='w', padx=10, pady=5)
-        ttk.Label(wage_frame, text=f"${diff:.2f} per hour", 
-                font=self.heading_font).grid(row=1, column=1, sticky='w', padx=10, pady=5)
+        labels['difference'] = ttk.Label(wage_frame, font=self.heading_font)
+        labels['difference'].grid(row=1, column=1, sticky='w', padx=10, pady=5)
 
         ttk.Label(wage_frame, text="True Hourly Wage:", 
                 font=self.heading_font).grid(row=0, column=2, sticky='w', padx=10, pady=5)
-        ttk.Label(wage_frame, text=f"${r['true_wage']:.2f}", 
-                font=self.heading_font, foreground='#27ae60').grid(row=1, column=2, sticky='w', padx=10, pady=5)
+        labels['true_wage'] = ttk.Label(wage_frame, font=self.heading_font, foreground='#27ae60')
+        labels['true_wage'].grid(row=1, column=2, sticky='w', padx=10, pady=5)
 
-        if diff > 0:
-            ttk.Label(wage_frame, 
-                    text=f"Commute reduces wage by ${diff:.2f}/hr",
-                    font=self.subheading_font, foreground='#c0392b').grid(row=2, column=0, columnspan=3, sticky='w', padx=10, pady=(10, 0))
+        labels['reduction'] = ttk.Label(wage_frame, font=self.subheading_font, foreground='#c0392b')
+        labels['reduction'].grid(row=2, column=0, columnspan=3, sticky='w', padx=10, pady=(10, 0))
+        rows['reduction'] = [labels['reduction']]
         
         # time breakdown
         time_frame = ttk.LabelFrame(self.scrollable_frame, text="Time Breakdown", padding=15)
         time_frame.pack(fill='x', padx=20, pady=10)
         
         metrics = [
-            ("Daily Work Hours", f"{self.daily_hours_var.get():.1f} hrs"),
-            ("Daily Commute Time", f"{r['daily_commute_hours']:.1f} hrs"),
-            ("Commute Days per Week", f"{r['commute_days']:.0f} days"),
-            ("WFH Days per Week", f"{r['wfh_days']:.0f} days"),
-            ("Weekly Work Hours", f"{self.daily_hours_var.get() * self.work_days_var.get():.1f} hrs"),
-            ("Weekly Commute Hours", f"{r['daily_commute_hours'] * r['commute_days']:.1f} hrs"),
-            ("Yearly Work Hours", f"{r['yearly_work_hours']:.0f} hrs"),
-            ("Yearly Commute Hours", f"{r['yearly_commute_hours']:.0f} hrs"),
-            ("Total Committed Hours/Year", f"{r['total_committed_hours']:.0f} hrs")
+            ("Daily Work Hours", 'daily_work_hours'),
+            ("Daily Commute Time", 'daily_commute_hours'),
+            ("Commute Days per Week", 'commute_days'),
+            ("WFH Days per Week", 'wfh_days'),
+            ("Weekly Work Hours", 'weekly_work_hours'),
+            ("Weekly Commute Hours", 'weekly_commute_hours'),
+            ("Yearly Work Hours", 'yearly_work_hours'),
+            ("Yearly Commute Hours", 'yearly_commute_hours'),
+            ("Total Committed Hours/Year", 'total_committed_hours')
         ]
         
-        for i, (label, value) in enumerate(metrics):
+        for i, (label, name) in enumerate(metrics):
             row = i // 2
             col = (i % 2) * 2
             
             ttk.Label(time_frame, text=label, font=self.detail_font).grid(row=row, column=col, 
                                                                       sticky='w', padx=10, pady=5)
-            ttk.Label(time_frame, text=value, font=self.detail_font).grid(row=row, 
-                                                                              column=col+1, 
-                                                                              sticky='w', 
-                                                                              padx=10, pady=5)
+            labels[name] = ttk.Label(time_frame, font=self.detail_font)
+            labels[name].grid(row=row, column=col+1, sticky='w', padx=10, pady=5)
         
-        # cost breakdown
+        # cost breakdown (one grid column, so optional rows keep their place when hidden)
         cost_frame = ttk.LabelFrame(self.scrollable_frame, text="Cost Breakdown", padding=15)
         cost_frame.pack(fill='x', padx=20, pady=10)
+        cost_frame.grid_columnconfigure(0, weight=1)
         
-        transport_names = {
-            'car': 'Car (Gas)',
-            'ev': 'Electric Vehicle',
-            'public': 'Public Transport',
-            'biking': 'Biking',
-            'walking': 'Walking'
-        }
-        
-        ttk.Label(cost_frame, text=f"Transportation: {transport_names.get(r['transport_type'], r['transport_type'])}",
-                 font=self.detail_font).pack(anchor='w', pady=5)
-        
-        if r['transport_type'] in ['car', 'ev', 'biking', 'walking']:
-            ttk.Label(cost_frame, text=f"Round Trip Distance: {r['daily_miles'] * 2:.1f} miles",
-                     font=self.detail_font).pack(anchor='w', pady=2)
-        
-        ttk.Label(cost_frame, text=f"Daily Cost Breakdown: {r['cost_breakdown']}",
-                 font=self.detail_font).pack(anchor='w', pady=2)
-        
-        if self.daily_costs_var.get() > 0 and r['transport_type'] not in ['biking', 'walking']:
-            ttk.Label(cost_frame, text=f"+ Additional Costs: ${self.daily_costs_var.get():.2f}",
-                     font=self.detail_font).pack(anchor='w', pady=2)
-        
-        ttk.Label(cost_frame, text=f"Total Daily Commute Cost: ${r['daily_commute_cost']:.2f}",
-                 font=self.detail_font).pack(anchor='w', pady=5)
+        cost_rows = [('transportation', 5), ('round_trip', 2), ('cost_breakdown', 2),
+                     ('additional_costs', 2), ('daily_commute_cost', 5)]
+        for row, (name, pady) in enumerate(cost_rows):
+            labels[name] = ttk.Label(cost_frame, font=self.detail_font)
+            labels[name].grid(row=row, column=0, sticky='w', pady=pady)
+        rows['round_trip'] = [labels['round_trip']]
+        rows['additional_costs'] = [labels['additional_costs']]
         
         yearly_cost_frame = ttk.Frame(cost_frame)
-        yearly_cost_frame.pack(fill='x', pady=10)
+        yearly_cost_frame.grid(row=len(cost_rows), column=0, sticky='ew', pady=10)
         
         ttk.Label(yearly_cost_frame, text="Yearly Take-home Pay:", 
                  font=self.detail_font).pack(side='left', padx=20)
-        ttk.Label(yearly_cost_frame, text=f"${r['annual_income']:,.2f}", 
-                 font=self.detail_font).pack(side='left', padx=10)
+        labels['annual_income'] = ttk.Label(yearly_cost_frame, font=self.detail_font)
+        labels['annual_income'].pack(side='left', padx=10)
         
         ttk.Label(yearly_cost_frame, text="Yearly Commute Costs:", 
                  font=self.detail_font).pack(side='left', padx=20)
-        ttk.Label(yearly_cost_frame, text=f"${r['yearly_commute_costs']:,.2f}", 
-                 font=self.detail_font, foreground='#c0392b').pack(side='left', padx=10)
+        labels['yearly_commute_costs'] = ttk.Label(yearly_cost_frame, font=self.detail_font, foreground='#c0392b')
+        labels['yearly_commute_costs'].pack(side='left', padx=10)
         
         ttk.Label(yearly_cost_frame, text="Net Yearly Income:", 
                  font=self.detail_font).pack(side='left', padx=20)
-        ttk.Label(yearly_cost_frame, text=f"${r['net_yearly_income']:,.2f}", 
-                 font=self.detail_font, foreground='#27ae60').pack(side='left', padx=10)
+        labels['net_yearly_income'] = ttk.Label(yearly_cost_frame, font=self.detail_font, foreground='#27ae60')
+        labels['net_yearly_income'].pack(side='left', padx=10)
         
-        if r['annual_income'] > 0:
-            cost_percentage = (r['yearly_commute_costs'] / r['annual_income']) * 100
-            ttk.Label(cost_frame, 
-                     text=f"Commute costs consume {cost_percentage:.1f}% of your take-home pay",
-                     font=self.detail_font).pack(anchor='w', pady=5)
+        labels['cost_percentage'] = ttk.Label(cost_frame, font=self.detail_font)
+        labels['cost_percentage'].grid(row=len(cost_rows) + 1, column=0, sticky='w', pady=5)
+        rows['cost_percentage'] = [labels['cost_percentage']]
         
         # paycheck perspective
         paycheck_frame = ttk.LabelFrame(self.scrollable_frame, text="Paycheck Perspective", padding=15)
         paycheck_frame.pack(fill='x', padx=20, pady=10)
         
-        pay_freq = self.pay_frequency.get()
-        paycheck = self.paycheck_var.get()
-        
-        if pay_freq == 'biweekly':
-            biweekly_commute_cost = r['daily_commute_cost'] * r['commute_days'] * 2
-            biweekly_commute_hours = r['daily_commute_hours'] * r['commute_days'] * 2
-            percentage = (biweekly_commute_cost / paycheck) * 100 if paycheck > 0 else 0
-            
-            ttk.Label(paycheck_frame, text="Per Bi-weekly Paycheck:", 
-                     font=self.detail_font).pack(anchor='w', pady=5)
-            
-            ttk.Label(paycheck_frame, 
-                     text=f"Take-home: ${paycheck:.2f} | Commute costs: ${biweekly_commute_cost:.2f} | Effective: ${paycheck - biweekly_commute_cost:.2f}",
-                     font=self.detail_font).pack(anchor='w', pady=2)
-            
-            ttk.Label(paycheck_frame, 
-                     text=f"Commute time: {biweekly_commute_hours:.1f} hours | Commute eats {percentage:.1f}% of your paycheck",
-                     font=self.detail_font).pack(anchor='w', pady=2)
-        
-        self.create_visualization()
+        biweekly_title = ttk.Label(paycheck_frame, text="Per Bi-weekly Paycheck:", font=self.detail_font)
+        biweekly_title.grid(row=0, column=0, sticky='w', pady=5)
+        labels['biweekly_costs'] = ttk.Label(paycheck_frame, font=self.detail_font)
+        labels['biweekly_costs'].grid(row=1, column=0, sticky='w', pady=2)
+        labels['biweekly_time'] = ttk.Label(paycheck_frame, font=self.detail_font)
+        labels['biweekly_time'].grid(row=2, column=0, sticky='w', pady=2)
+        rows['biweekly'] = [biweekly_title, labels['biweekly_costs'], labels['biweekly_time']]
+        
+        # the chart itself goes in on the first draw, which may wait for matplotlib
+        self.results_vis_frame = ttk.LabelFrame(self.scrollable_frame, text="Wage Comparison", padding=15)
+        self.results_vis_frame.pack(fill='x', padx=20, pady=10)
         ttk.Button(self.scrollable_frame, text="← Back to Calculator", 
                   command=lambda: self.notebook.select(0)).pack(pady=20)
     
-    def create_visualization(self):
-        vis_frame = ttk.LabelFrame(self.scrollable_frame, text="Wage Comparison", padding=15)
-        vis_frame.pack(fill='x', padx=20, pady=10)
-        
-        fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(10, 6))
-        fig.patch.set_facecolor('#f0f0f0')
-        
-        labels = ['Traditional Wage', 'True Hourly Wage']
-        values = [self.results['traditional_wage'], self.results['true_wage']]
-        colors = ['#3498db', '#27ae60']
-        
-        bars = ax1.bar(labels, values, color=colors)
-        ax1.set_ylabel('Hourly Wage ($)')
-        ax1.set_title('Wage Comparison')
-        
-        for bar, value in zip(bars, values):
-            height = bar.get_height()
-            ax1.text(bar.get_x() + bar.get_width()/2., height + 0.5,
-                    f'${value:.2f}', ha='center', va='bottom')
-        
-        work_hours = self.results['yearly_work_hours']
-        commute_hours = self.results['yearly_commute_hours']
-        
-        if work_hours + commute_hours > 0:
-            sizes = [work_hours, commute_hours]
-            labels_pie = ['Work Hours', 'Commute Hours']
-            colors_pie = ['#3498db', '#e74c3c']
+    def display_results(self, live=False):
+        if not self.result_labels:
+            self.build_results_view()
+        
+        s, r = self.results_scenario, self.results
+        for name, text in self.result_texts(s, r).items():
+            label = self.result_labels[name]
+            if label.cget('text') != text:
+                label.config(text=text)
+        for name, visible in self.result_visibility(s, r).items():
+            self.set_rows_visible(name, visible)
+        
+        if live and not plotting_loaded():
+            # importing matplotlib here would freeze typing, so the chart catches up once it is loaded
+            warm_plotting()
+            if self.results_chart_job is None:
+                self.results_chart_job = self.root.after(self.PLOTTING_POLL_MS, self.draw_deferred_chart)
+            return
+        self.create_visualization()
+    
+    def draw_deferred_chart(self):
+        self.results_chart_job = None
+        if not plotting_loaded():
+            if _warmup_thread.is_alive():
+                self.results_chart_job = self.root.after(self.PLOTTING_POLL_MS, self.draw_deferred_chart)
+            return  # the import failed; the next Calculate reports it
+        self.create_visualization()  # whatever self.results is by now
+    
+    def get_results_chart(self):
+        # figure, canvas and artists are created on first use only
+        if self.results_chart is None:
+            load_plotting()
+            vis_frame = self.results_vis_frame
+            
+            fig = Figure(figsize=(10, 6))
+            fig.patch.set_facecolor('#f0f0f0')
+            ax1, ax2 = fig.subplots(1, 2)
             
-            ax2.pie(sizes, labels=labels_pie, colors=colors_pie, autopct='%1.1f%%',
-                   startangle=90)
+            labels = ['Traditional Wage', 'True Hourly Wage']
+            bars = ax1.bar(labels, [0, 0], color=['#3498db', '#27ae60'])
+            ax1.set_ylabel('Hourly Wage ($)')
+            ax1.set_title('Wage Comparison')
+            bar_texts = [ax1.text(bar.get_x() + bar.get_width()/2., 0, '', ha='center', va='bottom')
+                         for bar in bars]
+            
+            # start at an even split; wedges are re-angled on every update
+            wedges, pie_labels, pie_pcts = ax2.pie([1, 1], labels=['Work Hours', 'Commute Hours'],
+                                                  colors=['#3498db', '#e74c3c'], autopct='%1.1f%%',
+                                                  startangle=90)
             ax2.set_title('Yearly Time Allocation')
-        
-        plt.tight_layout()
-        
-        canvas = FigureCanvasTkAgg(fig, master=vis_frame)
-        canvas.draw()
-        canvas.get_tk_widget().pack(fill='both', expand=True)
+            
+            canvas = FigureCanvasTkAgg(fig, master=vis_frame)
+            canvas.get_tk_widget().pack(fill='both', expand=True)
+            
+            self.results_chart = {
+                'vis_frame': vis_frame, 'figure': fig, 'canvas': canvas,
+                'bar_axes': ax1, 'bars': bars, 'bar_texts': bar_texts,
+                'pie_axes': ax2, 'wedges': wedges, 'pie_labels': pie_labels, 'pie_pcts': pie_pcts
+            }
+        return self.results_chart
+    
+    def update_pie(self, chart, sizes, start_angle=90):
+        # same geometry as ax.pie(): counter-clockwise from start_angle, labels at 1.1, pcts at 0.6
+        total = sum(sizes)
+        theta1 = start_angle
+        for wedge, label, pct, size in zip(chart['wedges'], chart['pie_labels'], chart['pie_pcts'], sizes):
+            visible = total > 0 and size > 0
+            for artist in (wedge, label, pct):
+                artist.set_visible(visible)
+            if not visible:
+                continue
+            theta2 = theta1 + 360.0 * size / total
+            wedge.set_theta1(theta1)
+            wedge.set_theta2(theta2)
+            mid = math.radians((theta1 + theta2) / 2)
+            x, y = math.cos(mid), math.sin(mid)
+            label.set_position((1.1 * x, 1.1 * y))
+            label.set_horizontalalignment('right' if x < 0 else 'left')
+            pct.set_position((0.6 * x, 0.6 * y))
+            pct.set_text(f'{100.0 * size / total:1.1f}%')
+            theta1 = theta2
+    
+    def create_visualization(self):
+        chart = self.get_results_chart()
+        
+        values = [self.results.traditional_wage, self.results.true_wage]
+        for bar, text, value in zip(chart['bars'], chart['bar_texts'], values):
+            bar.set_height(value)
+            text.set_position((bar.get_x() + bar.get_width()/2., value + 0.5))
+            text.set_text(f'${value:.2f}')
+        self.fit_bar_axes(chart['bar_axes'], values, 0.5)
+        
+        work_hours = self.results.yearly_work_hours
+        commute_hours = self.results.yearly_commute_hours
+        self.update_pie(chart, [work_hours, commute_hours])
+        chart['pie_axes'].title.set_visible(work_hours + commute_hours > 0)
+        
+        chart['figure'].tight_layout()
+        chart['canvas'].draw_idle()
 
-def main():
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="True Hourly Wage Calculator")
+    parser.add_argument('--startup-time', action='store_true',
+                        help="print how long the first window took to appear, then exit")
+    parser.add_argument('--render-timing', action='store_true',
+                        help="print how long the results and comparison views take to update")
+    parser.add_argument('--no-warmup', action='store_true',
+                        help="don't preload the plotting libraries in the background")
+    parser.add_argument('--cache', default=DEFAULT_CACHE_PATH, metavar='PATH',
+                        help="file keeping calculated results between sessions ('' for none)")
+    args = parser.parse_args(argv)
+    
     root = tk.Tk()
     style = ttk.Style()
     style.configure('TFrame', background='#f0f0f0')
@@ -883,8 +1314,24 @@ def main():
     style.configure('Accent.TButton', font=('Segoe UI', 12, 'bold'))  
     style.map('Accent.TButton', background=[('active', '#2980b9'), ('pressed', '#1c638e')])
     
-    app = TrueHourlyWageCalculator(root)
+    app = TrueHourlyWageCalculator(root, render_timing=args.render_timing,
+                                   cache_path=None if args.startup_time else args.cache or None)
+    
+    def window_shown():
+        if args.startup_time:
+            elapsed = (time.perf_counter() - START_TIME) * 1000
+            plotting = 'loaded' if 'matplotlib' in sys.modules else 'not loaded'
+            print(f"First window shown after {elapsed:.0f} ms (matplotlib {plotting})")
+            root.destroy()
+        elif not args.no_warmup:
+            warm_plotting()
+            # so the first keystroke in a Vehicle box doesn't wait for vehicles.csv
+            root.after_idle(app.vehicle_index)
+    
+    # runs once the window has been drawn
+    root.after_idle(lambda: root.after(0, window_shown))
     root.mainloop()
+    app.save_cache()
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
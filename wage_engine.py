@@ -0,0 +1,219 @@
+"""Vectorized true hourly wage engine.
+
+Same math as truecost.calculate_true_hourly_wage() and
+TrueHourlyWageCalculator.calculate_commute_metrics(), but working on whole
+columns (NumPy arrays) at once instead of one prompted scenario.
+"""
+import numpy as np
+
+# transport type codes
+CAR = 0
+EV = 1
+PUBLIC = 2
+BIKING = 3
+WALKING = 4
+
+TRANSPORT_CODES = {
+    'car': CAR,
+    'ev': EV,
+    'public': PUBLIC,
+    'public_transport': PUBLIC,  # name used by the CLI
+    'biking': BIKING,
+    'walking': WALKING,
+}
+TRANSPORT_NAMES = ('car', 'ev', 'public', 'biking', 'walking')
+
+# pay frequency codes
+DAILY = 0
+WEEKLY = 1
+BIWEEKLY = 2
+SEMI_MONTHLY = 3
+MONTHLY = 4
+
+PAY_FREQUENCY_CODES = {
+    'daily': DAILY,
+    'weekly': WEEKLY,
+    'biweekly': BIWEEKLY,
+    'semi_monthly': SEMI_MONTHLY,
+    'monthly': MONTHLY,
+}
+PAY_FREQUENCY_NAMES = ('daily', 'weekly', 'biweekly', 'semi_monthly', 'monthly')
+
+# default annualization; workcalendar.WorkCalendar gives per-row values from
+# real workday counts instead (work_weeks / weeks_per_month / pay_weeks below)
+WORK_WEEKS_PER_YEAR = 50
+WEEKS_PER_MONTH = 4.33
+
+# the GUI's starting values, used for inputs a caller does not supply
+DEFAULT_SCENARIO = {
+    'paycheck': 2000.0,
+    'pay_frequency': BIWEEKLY,
+    'daily_hours': 8.0,
+    'work_days': 5.0,
+    'wfh_days': 0.0,
+    'transport': CAR,
+    'commute_minutes': 30.0,
+    'daily_miles': 10.0,
+    'gas_price': 3.50,
+    'mpg': 25.0,
+    'ev_efficiency': 4.0,
+    'electricity_price': 0.15,
+    'public_daily_cost': 5.50,
+    'public_monthly_cost': 100.0,
+    'public_walking_minutes': 10.0,
+    'use_monthly_pass': False,
+    'daily_costs': 5.0,
+}
+
+RESULT_COLUMNS = (
+    'traditional_wage',
+    'true_wage',
+    'annual_income',
+    'yearly_work_hours',
+    'yearly_commute_hours',
+    'yearly_commute_costs',
+    'net_yearly_income',
+    'total_committed_hours',
+    'daily_commute_hours',
+    'daily_commute_cost',
+    'commute_days',
+)
+
+
+def encode_codes(values, codes, default):
+    """Turn names (or already-numeric codes) into an int8 code array"""
+    values = np.asarray(values)
+    if values.dtype.kind in 'iuf':
+        return values.astype(np.int8)
+    names, inverse = np.unique(values, return_inverse=True)
+    lookup = np.array([codes.get(str(name).strip().lower(), default) for name in names], dtype=np.int8)
+    return lookup[inverse].reshape(values.shape)
+
+
+def encode_transport(values):
+    """Transport names -> codes, unknown names fall back to car like the CLI"""
+    return encode_codes(values, TRANSPORT_CODES, CAR)
+
+
+def encode_pay_frequency(values):
+    """Pay frequency names -> codes, unknown names fall back to biweekly like the CLI"""
+    return encode_codes(values, PAY_FREQUENCY_CODES, BIWEEKLY)
+
+
+def _safe_divide(numerator, denominator):
+    # x / y where y > 0, otherwise 0 (the scalar code's "if y > 0 else 0")
+    numerator, denominator = np.broadcast_arrays(np.asarray(numerator, dtype=np.float64),
+                                                 np.asarray(denominator, dtype=np.float64))
+    out = np.zeros(numerator.shape)
+    np.divide(numerator, denominator, out=out, where=denominator > 0)
+    return out
+
+
+def annual_income(pay_frequency, paycheck, work_days, work_weeks=WORK_WEEKS_PER_YEAR,
+                  pay_weeks=WORK_WEEKS_PER_YEAR):
+    """Yearly take-home pay for each row
+
+    Daily pay is earned on work_days * work_weeks days, weekly pay for
+    pay_weeks weeks.
+    """
+    pay_frequency = np.asarray(pay_frequency)
+    paycheck = np.asarray(paycheck, dtype=np.float64)
+    work_days = np.asarray(work_days, dtype=np.float64)
+
+    paychecks_per_year = np.select(
+        [pay_frequency == DAILY, pay_frequency == WEEKLY, pay_frequency == BIWEEKLY,
+         pay_frequency == SEMI_MONTHLY],
+        [work_days * work_weeks, pay_weeks, 26, 24],
+        default=12,
+    )
+    return paycheck * paychecks_per_year
+
+
+def commute_metrics(transport, commute_minutes, daily_miles, work_days, wfh_days=0.0,
+                    gas_price=0.0, mpg=0.0, ev_efficiency=0.0, electricity_price=0.0,
+                    public_daily_cost=0.0, public_monthly_cost=0.0, public_walking_minutes=0.0,
+                    use_monthly_pass=False, daily_costs=0.0, work_weeks=WORK_WEEKS_PER_YEAR,
+                    weeks_per_month=WEEKS_PER_MONTH):
+    """Daily and yearly commute time/cost for each row
+
+    Arguments broadcast against each other, so scalars and grids work as well
+    as flat columns.
+    """
+    transport = np.asarray(transport)
+    commute_minutes = np.asarray(commute_minutes, dtype=np.float64)
+    daily_miles = np.asarray(daily_miles, dtype=np.float64)
+    daily_costs = np.asarray(daily_costs, dtype=np.float64)
+
+    is_public = transport == PUBLIC
+    # more WFH days than work days means no commuting, not negative commuting
+    commute_days = np.asarray(work_days, dtype=np.float64) - np.asarray(wfh_days, dtype=np.float64)
+    commute_days = np.maximum(commute_days, 0.0)
+
+    commute_minutes = commute_minutes + np.where(is_public, public_walking_minutes, 0.0)
+    daily_commute_hours = (commute_minutes * 2) / 60
+
+    round_trip_miles = daily_miles * 2
+    fuel_cost = _safe_divide(round_trip_miles, mpg) * gas_price
+    electricity_cost = _safe_divide(round_trip_miles, ev_efficiency) * electricity_price
+    pass_cost = _safe_divide(public_monthly_cost, commute_days * weeks_per_month)
+    fare_cost = np.where(use_monthly_pass, pass_cost, public_daily_cost)
+
+    transport_cost = np.select(
+        [transport == CAR, transport == EV, is_public],
+        [fuel_cost, electricity_cost, fare_cost],
+        default=0.0,
+    )
+    daily_commute_cost = daily_costs + transport_cost
+
+    yearly_commute_hours = daily_commute_hours * commute_days * work_weeks
+    yearly_commute_costs = daily_commute_cost * commute_days * work_weeks
+
+    return {
+        'daily_commute_hours': daily_commute_hours,
+        'daily_commute_cost': daily_commute_cost,
+        'yearly_commute_hours': yearly_commute_hours,
+        'yearly_commute_costs': yearly_commute_costs,
+        'commute_days': commute_days,
+    }
+
+
+def calculate_batch(paycheck, daily_hours, work_days, transport, commute_minutes, daily_miles=0.0,
+                    pay_frequency=BIWEEKLY, wfh_days=0.0, gas_price=0.0, mpg=0.0, ev_efficiency=0.0,
+                    electricity_price=0.0, public_daily_cost=0.0, public_monthly_cost=0.0,
+                    public_walking_minutes=0.0, use_monthly_pass=False, daily_costs=0.0,
+                    work_weeks=WORK_WEEKS_PER_YEAR, weeks_per_month=WEEKS_PER_MONTH,
+                    pay_weeks=WORK_WEEKS_PER_YEAR):
+    """Traditional and true hourly wage for every row in one pass
+
+    `transport` and `pay_frequency` take the integer codes defined above (see
+    encode_transport / encode_pay_frequency). work_weeks, weeks_per_month and
+    pay_weeks default to the fixed 50-week year; pass per-row values from
+    workcalendar.WorkCalendar.engine_inputs() for a real calendar. Returns a
+    dict of arrays keyed by RESULT_COLUMNS.
+    """
+    income = annual_income(pay_frequency, paycheck, work_days, work_weeks, pay_weeks)
+    metrics = commute_metrics(
+        transport, commute_minutes, daily_miles, work_days, wfh_days,
+        gas_price, mpg, ev_efficiency, electricity_price,
+        public_daily_cost, public_monthly_cost, public_walking_minutes,
+        use_monthly_pass, daily_costs, work_weeks, weeks_per_month,
+    )
+
+    yearly_work_hours = (np.asarray(daily_hours, dtype=np.float64)
+                         * np.asarray(work_days, dtype=np.float64) * work_weeks)
+    traditional_wage = _safe_divide(income, yearly_work_hours)
+    net_yearly_income = income - metrics['yearly_commute_costs']
+    total_committed_hours = yearly_work_hours + metrics['yearly_commute_hours']
+    true_wage = _safe_divide(net_yearly_income, total_committed_hours)
+
+    results = {
+        'traditional_wage': traditional_wage,
+        'true_wage': true_wage,
+        'annual_income': income,
+        'yearly_work_hours': yearly_work_hours,
+        'net_yearly_income': net_yearly_income,
+        'total_committed_hours': total_committed_hours,
+    }
+    results.update(metrics)
+    shape = np.broadcast_shapes(*(np.shape(value) for value in results.values()))
+    return {name: np.broadcast_to(results[name], shape) for name in RESULT_COLUMNS}
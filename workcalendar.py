@@ -0,0 +1,119 @@
+"""Workdays in a real year, from a local holiday table.
+
+The engine's default year is 50 work weeks with 4.33 weeks in a month. A
+WorkCalendar counts actual workdays instead: weekdays of a given year minus
+that region's public holidays (holidays.csv) minus paid time off. The counts
+for every schedule of 0-7 days a week are worked out once per calendar with
+np.busday_count, so applying it to a batch is a table lookup per row:
+
+    calendar = WorkCalendar(2025, 'US', pto_days=15)
+    results = wage_engine.calculate_batch(**calendar.apply(columns))
+
+A schedule of k days a week is taken to be the first k days from Monday;
+fractional day counts are interpolated between the neighbouring schedules.
+"""
+import csv
+import os
+
+import numpy as np
+
+HOLIDAYS_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'holidays.csv')
+
+# region with no public holidays
+NO_HOLIDAYS = 'none'
+
+MONTHS = 12
+_WEEKDAYS = 7
+
+
+def read_holidays(path=HOLIDAYS_PATH):
+    """{region: sorted array of datetime64[D]} from a region,date,name CSV"""
+    dates = {}
+    with open(path, newline='', encoding='utf-8') as handle:
+        for row in csv.DictReader(handle):
+            dates.setdefault(row['region'].strip().upper(), []).append(row['date'].strip())
+    return {region: np.unique(np.array(values, dtype='datetime64[D]')) for region, values in dates.items()}
+
+
+def regions(path=HOLIDAYS_PATH):
+    return sorted(read_holidays(path)) + [NO_HOLIDAYS]
+
+
+def _weekmask(days):
+    return [1] * days + [0] * (_WEEKDAYS - days)
+
+
+class WorkCalendar:
+    """Workday counts for one year and region, less pto_days of leave
+
+    Plain attributes and arrays only, so it pickles to bulk-mode worker
+    processes.
+    """
+
+    def __init__(self, year, region='US', pto_days=0.0, holidays_path=HOLIDAYS_PATH):
+        self.year = int(year)
+        self.pto_days = float(pto_days)
+        self.region = region.upper() if region.lower() != NO_HOLIDAYS else NO_HOLIDAYS
+        if self.region == NO_HOLIDAYS:
+            holidays = np.zeros(0, dtype='datetime64[D]')
+        else:
+            table = read_holidays(holidays_path)
+            if self.region not in table:
+                raise ValueError(f"no holidays for region {region!r} in {holidays_path}")
+            holidays = table[self.region]
+
+        starts = np.array([f"{self.year}-{month:02d}-01" for month in range(1, MONTHS + 1)]
+                          + [f"{self.year + 1}-01-01"], dtype='datetime64[D]')
+        in_year = (holidays >= starts[0]) & (holidays < starts[-1])
+        if self.region != NO_HOLIDAYS and not in_year.any():
+            raise ValueError(f"no {self.region} holidays listed for {self.year} in {holidays_path}")
+        self.holidays = holidays[in_year]
+
+        # monthly_table[k, m]: workdays in month m on a k-day week; yearly_table sums the months
+        self.monthly_table = np.zeros((_WEEKDAYS + 1, MONTHS))
+        for days in range(1, _WEEKDAYS + 1):
+            self.monthly_table[days] = np.busday_count(starts[:-1], starts[1:], weekmask=_weekmask(days),
+                                                       holidays=self.holidays)
+        self.yearly_table = self.monthly_table.sum(axis=1)
+        # weekly paychecks: one per Friday
+        self.pay_weeks = float(np.busday_count(starts[0], starts[-1], weekmask='0000100'))
+
+    def __repr__(self):
+        return f"WorkCalendar({self.year}, {self.region!r}, pto_days={self.pto_days:g})"
+
+    def _lookup(self, table, work_days):
+        days = np.clip(np.asarray(work_days, dtype=np.float64), 0, _WEEKDAYS)
+        return np.interp(days, np.arange(_WEEKDAYS + 1), table)
+
+    def annual_workdays(self, work_days, pto_days=None):
+        """Days actually worked in the year for each row's days per week"""
+        pto_days = self.pto_days if pto_days is None else np.asarray(pto_days, dtype=np.float64)
+        return np.maximum(self._lookup(self.yearly_table, work_days) - pto_days, 0.0)
+
+    def monthly_workdays(self, work_days):
+        """(rows, 12) workdays per month before PTO"""
+        days = np.atleast_1d(np.asarray(work_days, dtype=np.float64))
+        return np.stack([self._lookup(self.monthly_table[:, month], days) for month in range(MONTHS)],
+                        axis=-1)
+
+    def engine_inputs(self, work_days, pto_days=None):
+        """work_weeks, weeks_per_month and pay_weeks for wage_engine.calculate_batch()
+
+        work_weeks is annual workdays / days per week, so yearly hours and
+        costs count actual workdays; weeks_per_month is work_weeks / 12 so a
+        monthly pass is paid twelve times a year.
+        """
+        work_days = np.asarray(work_days, dtype=np.float64)
+        workdays = self.annual_workdays(work_days, pto_days)
+        work_weeks = np.where(work_days > 0, workdays / np.where(work_days > 0, work_days, 1.0), 0.0)
+        return {
+            'work_weeks': work_weeks,
+            'weeks_per_month': work_weeks / MONTHS,
+            'pay_weeks': self.pay_weeks,
+        }
+
+    def apply(self, columns):
+        """Engine columns with this calendar's work_weeks/weeks_per_month/pay_weeks added"""
+        columns = dict(columns)
+        columns.update(self.engine_inputs(columns['work_days']))
+        return columns